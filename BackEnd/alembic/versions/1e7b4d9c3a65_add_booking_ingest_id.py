@@ -0,0 +1,31 @@
+"""add_booking_ingest_id
+
+Revision ID: 1e7b4d9c3a65
+Revises: 6c2e9a4d1b87
+Create Date: 2026-10-17 17:26:44.913027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1e7b4d9c3a65'
+down_revision: Union[str, Sequence[str], None] = '6c2e9a4d1b87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bookings', sa.Column('ingest_id', sa.String(length=32), nullable=True))
+    # 与 create_all 生成的约束同名 (PostgreSQL 默认命名)
+    op.create_unique_constraint('bookings_ingest_id_key', 'bookings', ['ingest_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('bookings_ingest_id_key', 'bookings', type_='unique')
+    op.drop_column('bookings', 'ingest_id')
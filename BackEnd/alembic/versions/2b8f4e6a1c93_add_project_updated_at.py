@@ -0,0 +1,28 @@
+"""add_project_updated_at
+
+Revision ID: 2b8f4e6a1c93
+Revises: 7c1e5a9d2f40
+Create Date: 2026-10-17 11:02:41.287305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b8f4e6a1c93'
+down_revision: Union[str, Sequence[str], None] = '7c1e5a9d2f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('projects', 'updated_at')
@@ -0,0 +1,39 @@
+"""add_rate_limit_counters
+
+Revision ID: 3d6b9f1e4a72
+Revises: 8a4c2f9e6b51
+Create Date: 2026-10-17 15:02:37.418265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d6b9f1e4a72'
+down_revision: Union[str, Sequence[str], None] = '8a4c2f9e6b51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'rate_limit_counters',
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('window_start', sa.BigInteger(), nullable=False),
+        sa.Column('prev_count', sa.Integer(), nullable=False),
+        sa.Column('curr_count', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+        prefixes=['UNLOGGED'],
+    )
+    op.create_index('ix_rate_limit_counters_expires_at', 'rate_limit_counters', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rate_limit_counters_expires_at', table_name='rate_limit_counters')
+    op.drop_table('rate_limit_counters')
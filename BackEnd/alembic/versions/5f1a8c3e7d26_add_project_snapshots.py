@@ -0,0 +1,35 @@
+"""add_project_snapshots
+
+Revision ID: 5f1a8c3e7d26
+Revises: 9e3d7b2c5a18
+Create Date: 2026-10-17 13:05:52.610384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f1a8c3e7d26'
+down_revision: Union[str, Sequence[str], None] = '9e3d7b2c5a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 快照按需生成：首次读取或执行 src/scripts/check_project_snapshots.py --fix 时写入
+    op.create_table('project_snapshots',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('document', sa.Text(), nullable=False),
+    sa.Column('version', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('project_snapshots')
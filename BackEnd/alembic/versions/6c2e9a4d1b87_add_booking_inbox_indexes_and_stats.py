@@ -0,0 +1,49 @@
+"""add_booking_inbox_indexes_and_stats
+
+Revision ID: 6c2e9a4d1b87
+Revises: 3d6b9f1e4a72
+Create Date: 2026-10-17 16:41:09.205813
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c2e9a4d1b87'
+down_revision: Union[str, Sequence[str], None] = '3d6b9f1e4a72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_bookings_created_at_id', 'bookings', ['created_at', 'id'], unique=False)
+    op.create_index('ix_bookings_status_created_at_id', 'bookings', ['status', 'created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_bookings_unread_created_at_id', 'bookings', ['created_at', 'id'], unique=False,
+        postgresql_where=sa.text('is_read = false'),
+    )
+
+    op.create_table(
+        'booking_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('unread_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # 以现有数据初始化计数行 (8 个分槽，与 services/booking_stats._SLOTS 一致；总数记在第 1 槽)
+    op.execute(
+        "INSERT INTO booking_stats (id, unread_count) "
+        "SELECT slot, CASE WHEN slot = 1 THEN (SELECT count(*) FROM bookings WHERE is_read = false) ELSE 0 END "
+        "FROM generate_series(1, 8) AS slot"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('booking_stats')
+    op.drop_index('ix_bookings_unread_created_at_id', table_name='bookings')
+    op.drop_index('ix_bookings_status_created_at_id', table_name='bookings')
+    op.drop_index('ix_bookings_created_at_id', table_name='bookings')
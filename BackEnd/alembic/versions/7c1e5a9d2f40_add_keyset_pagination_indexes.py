@@ -0,0 +1,30 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: 7c1e5a9d2f40
+Revises: 4d8ed9d5fdf1
+Create Date: 2026-10-17 10:12:03.418220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e5a9d2f40'
+down_revision: Union[str, Sequence[str], None] = '4d8ed9d5fdf1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_cases_created_at_id', 'cases', ['created_at', 'id'], unique=False)
+    op.create_index('ix_products_active_created_at_id', 'products', ['is_active', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_active_created_at_id', table_name='products')
+    op.drop_index('ix_cases_created_at_id', table_name='cases')
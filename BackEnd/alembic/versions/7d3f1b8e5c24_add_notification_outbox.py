@@ -0,0 +1,47 @@
+"""add_notification_outbox
+
+Revision ID: 7d3f1b8e5c24
+Revises: 1e7b4d9c3a65
+Create Date: 2026-10-17 18:12:05.671390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3f1b8e5c24'
+down_revision: Union[str, Sequence[str], None] = '1e7b4d9c3a65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notification_outbox',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('recipient', sa.String(length=255), nullable=False),
+        sa.Column('subject', sa.String(length=255), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_notification_outbox_due', 'notification_outbox', ['next_attempt_at', 'id'], unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notification_outbox_due', table_name='notification_outbox')
+    op.drop_table('notification_outbox')
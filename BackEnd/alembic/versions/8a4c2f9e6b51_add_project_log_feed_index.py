@@ -0,0 +1,31 @@
+"""add_project_log_feed_index
+
+Revision ID: 8a4c2f9e6b51
+Revises: 5f1a8c3e7d26
+Create Date: 2026-10-17 14:21:08.774902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4c2f9e6b51'
+down_revision: Union[str, Sequence[str], None] = '5f1a8c3e7d26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_project_logs_project_created_at_id', 'project_logs',
+        ['project_id', 'created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_project_logs_project_created_at_id', table_name='project_logs')
@@ -0,0 +1,38 @@
+"""add_case_filter_indexes
+
+Revision ID: 9e3d7b2c5a18
+Revises: 2b8f4e6a1c93
+Create Date: 2026-10-17 11:40:17.905512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e3d7b2c5a18'
+down_revision: Union[str, Sequence[str], None] = '2b8f4e6a1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_cases_categories_gin', 'cases', ['categories'], unique=False,
+        postgresql_using='gin', postgresql_ops={'categories': 'jsonb_path_ops'}
+    )
+    op.create_index(
+        'ix_cases_styles_gin', 'cases', ['styles'], unique=False,
+        postgresql_using='gin', postgresql_ops={'styles': 'jsonb_path_ops'}
+    )
+    op.create_index('ix_cases_year', 'cases', ['year'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cases_year', table_name='cases')
+    op.drop_index('ix_cases_styles_gin', table_name='cases')
+    op.drop_index('ix_cases_categories_gin', table_name='cases')
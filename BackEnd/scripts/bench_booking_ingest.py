@@ -0,0 +1,149 @@
+# BackEnd/scripts/bench_booking_ingest.py
+"""
+预约提交洪峰基准：直接写库 vs 本机预写缓冲 (BOOKING_INGEST_MODE=buffered)
+
+在进程内驱动真实的 POST /api/bookings/ 路由 (使用 DATABASE_URL 与默认连接池配置)，
+--clients 个并发客户端各自循环提交 --seconds 秒，统计：
+- 每秒受理的提交数、p50/p99 延迟、非 2xx 次数 (连接池耗尽时为 500)；
+- 缓冲模式：洪峰期间后台入库同时运行，洪峰结束后统计剩余积压与排空耗时，并核对入库行数。
+
+基准写入的预约以 user_name = "bench-<随机串>" 标记，结束后删除并校准未读计数。
+
+用法：python scripts/bench_booking_ingest.py [--seconds 10] [--clients 200] [--modes direct,buffered]
+"""
+import argparse
+import asyncio
+import json
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from fastapi import FastAPI
+
+backend_dir = Path(__file__).resolve().parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.append(str(backend_dir))
+
+from sqlalchemy import delete, func, select
+
+from src.config import settings
+from src.database import AsyncSessionLocal, DBBooking, engine
+from src.routers.bookings import router as bookings_router
+from src.services.booking_ingest import booking_buffer
+from src.services.booking_stats import recount_unread
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(bookings_router, prefix="/api/bookings")
+    return app
+
+
+async def post(app, body: bytes) -> int:
+    scope = {
+        "type": "http", "method": "POST", "path": "/api/bookings/", "root_path": "", "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("10.0.0.1", 50000),
+    }
+    result = {"status": 0}
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+
+    await app(scope, receive, send)
+    return result["status"]
+
+
+async def run_storm(app, seconds: float, clients: int, tag: str):
+    deadline = time.perf_counter() + seconds
+    latencies, statuses = [], {}
+
+    async def client(n: int):
+        i = 0
+        while time.perf_counter() < deadline:
+            body = json.dumps({
+                "user_name": tag, "contact_info": f"138{n:04d}{i:04d}", "project_type": "住宅",
+                "budget": "50-80万", "message": "基准测试", "source_url": "/bench",
+            }).encode()
+            started = time.perf_counter()
+            status = await post(app, body)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+            i += 1
+
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    latencies.sort()
+    accepted = statuses.get(201, 0) + statuses.get(202, 0)
+    return {
+        "accepted": accepted,
+        "errors": sum(statuses.values()) - accepted,
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)],
+    }
+
+
+async def count_rows(tag: str) -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(DBBooking).where(DBBooking.user_name == tag))
+
+
+async def cleanup(tag: str) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(DBBooking).where(DBBooking.user_name == tag))
+        await recount_unread(db)
+        await db.commit()
+
+
+async def main(args) -> None:
+    tmpdir = tempfile.mkdtemp(prefix="booking-ingest-bench-")
+    booking_buffer.path = Path(tmpdir) / "booking_buffer.db"
+    app = build_app()
+    print(f"📨 {args.clients} 个并发客户端 × {args.seconds:.0f} 秒；连接池 pool_size + max_overflow = "
+          f"{engine.pool.size()} + {engine.pool._max_overflow}")
+    print(f"\n{'模式':<10} | {'受理/秒':>8} | {'p50(ms)':>8} | {'p99(ms)':>8} | {'失败':>6} | 入库核对")
+    print("-" * 80)
+
+    for mode in args.modes.split(","):
+        settings.BOOKING_INGEST_MODE = mode
+        tag = f"bench-{uuid.uuid4().hex[:8]}"
+        if mode == "buffered":
+            booking_buffer.start()
+        result = await run_storm(app, args.seconds, args.clients, tag)
+
+        note = ""
+        try:
+            if mode == "buffered":
+                pending, _ = await booking_buffer.backlog()
+                drain_started = time.perf_counter()
+                await booking_buffer.drain()
+                note = f"洪峰结束时积压 {pending} 条，排空 {time.perf_counter() - drain_started:.1f}s；"
+            stored = await count_rows(tag)
+            note += f"入库 {stored} / 受理 {result['accepted']}"
+            await cleanup(tag)
+        except Exception as e:
+            note += f"无法核对 (数据库不可用: {type(e).__name__})"
+        finally:
+            if mode == "buffered":
+                await booking_buffer.stop()
+
+        print(f"{mode:<10} | {result['accepted'] / args.seconds:>8.0f} | {result['p50']:>8.1f} | "
+              f"{result['p99']:>8.1f} | {result['errors']:>6} | {note}")
+
+    await engine.dispose()
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="预约提交洪峰基准")
+    parser.add_argument("--seconds", type=float, default=10, help="每种模式的持续时间")
+    parser.add_argument("--clients", type=int, default=200, help="并发客户端数")
+    parser.add_argument("--modes", default="direct,buffered", help="逗号分隔：direct / buffered")
+    asyncio.run(main(parser.parse_args()))
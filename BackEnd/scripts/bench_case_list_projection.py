@@ -0,0 +1,110 @@
+# BackEnd/scripts/bench_case_list_projection.py
+"""
+案例列表列裁剪基准：整行查询 vs 列表投影 (不取 description / detailed_description)
+在一个事务内灌入带数 KB 描述的模拟案例，结束时回滚，不在数据库中留下数据。
+
+对比指标：
+1. 每页从 PostgreSQL 取回的数据量 (按行文本表示的字节数估算)
+2. 处理耗时：查询 + ORM 装载 + Pydantic 序列化 (与 list_cases 未命中缓存时的工作一致)
+
+用法：python scripts/bench_case_list_projection.py [--rows 5000] [--size 50] [--iterations 200] [--desc-kb 6]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import desc, select, text
+
+backend_dir = Path(__file__).resolve().parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.append(str(backend_dir))
+
+from src.database import AsyncSessionLocal, engine, DBCase
+from src.models import CaseResponse, PaginatedResponse
+from src.services.case_query import case_list_query
+from src.services.response_cache import dump_json
+
+# md5 串拼接：近似真实长文本，避免 TOAST 压缩把差距抹平
+SEED_SQL = text("""
+    INSERT INTO cases (slug, title, chinese_title, description, detailed_description,
+                       location, area, year, categories, styles, images, featured, status, created_at)
+    SELECT
+        'bench-projection-' || g,
+        'Projection Bench ' || g,
+        '列裁剪基准 ' || g,
+        (SELECT string_agg(md5(random()::text || g), '') FROM generate_series(1, :short_blocks)),
+        (SELECT string_agg(md5(random()::text || g), '') FROM generate_series(1, :blocks)),
+        '上海', 120.5, 2024,
+        '["residential"]'::jsonb,
+        '["modern"]'::jsonb,
+        jsonb_build_array(jsonb_build_object(
+            'url', '/uploads/' || md5(g::text) || '.webp',
+            'thumbnail_url', '/uploads/' || md5(g::text) || '_thumb.webp',
+            'alt', 'Yisan Design', 'is_primary', true, 'order', 0
+        )),
+        false, 'completed',
+        now() + interval '1 day' - g * interval '1 second'
+    FROM generate_series(1, :rows) AS g
+""")
+
+
+async def page_bytes(session, statement) -> int:
+    """按行文本表示统计一页结果的字节数 (近似驱动实际接收的数据量)"""
+    sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    result = await session.execute(text(f"SELECT sum(octet_length(t::text)) FROM ({sql}) AS t"))
+    return int(result.scalar() or 0)
+
+
+async def render_page(session, statement, size: int) -> bytes:
+    result = await session.execute(statement)
+    items = result.scalars().all()
+    return dump_json(PaginatedResponse[CaseResponse], {
+        "items": items, "total": len(items), "page": 1, "pages": 1, "size": size,
+    })
+
+
+async def main(rows: int, size: int, iterations: int, desc_kb: int):
+    variants = {
+        "整行 select(DBCase)": select(DBCase),
+        "列表投影": case_list_query(),
+    }
+    async with AsyncSessionLocal() as session:
+        try:
+            print(f"🌱 灌入 {rows} 条模拟案例 (描述约 {desc_kb * 1.25:.1f} KB/行，事务内，结束后回滚)...")
+            blocks = desc_kb * 1024 // 32
+            await session.execute(SEED_SQL, {"rows": rows, "blocks": blocks, "short_blocks": max(blocks // 4, 1)})
+            await session.execute(text("ANALYZE cases"))
+
+            print(f"\n{'查询':<20} | {'每页字节':>12} | {'p50(ms)':>8} | {'p95(ms)':>8} | {'响应字节':>9}")
+            print("-" * 72)
+            for label, base in variants.items():
+                statement = base.order_by(desc(DBCase.created_at), desc(DBCase.id)).limit(size)
+                transferred = await page_bytes(session, statement)
+
+                timings = []
+                body = b""
+                for _ in range(iterations):
+                    session.expunge_all()  # 每轮重新装载，避免身份映射复用上一轮对象
+                    started = time.perf_counter()
+                    body = await render_page(session, statement, size)
+                    timings.append((time.perf_counter() - started) * 1000)
+
+                timings.sort()
+                p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) >= 20 else timings[-1]
+                print(f"{label:<20} | {transferred:>12,} | {statistics.median(timings):>8.2f} | {p95:>8.2f} | {len(body):>9,}")
+        finally:
+            await session.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="案例列表列裁剪基准")
+    parser.add_argument("--rows", type=int, default=5000, help="模拟案例数量")
+    parser.add_argument("--size", type=int, default=50, help="每页条数")
+    parser.add_argument("--iterations", type=int, default=200, help="每种查询的执行次数")
+    parser.add_argument("--desc-kb", type=int, default=6, help="detailed_description 大小 (KB)")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.size, args.iterations, args.desc_kb))
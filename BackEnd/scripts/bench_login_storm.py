@@ -0,0 +1,127 @@
+# BackEnd/scripts/bench_login_storm.py
+"""
+登录洪峰基准：bcrypt 同步执行 vs 专用线程池 (password_hasher)
+在进程内驱动一个最小 ASGI 应用，排除数据库与网络差异，只观察事件循环是否被 bcrypt 阻塞：
+
+- /public：模拟公开页面 (缓存命中的案例列表，纯内存序列化)，按固定速率持续请求；
+- /login：校验一个 BCRYPT_ROUNDS 成本的真实哈希，洪峰期间以 --logins 个并发循环请求。
+
+对比两种登录实现下 /public 的 p50/p99 延迟，以及登录吞吐与 503 (排队上限) 次数。
+
+用法：python scripts/bench_login_storm.py [--seconds 10] [--logins 32] [--public-rps 200]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+backend_dir = Path(__file__).resolve().parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.append(str(backend_dir))
+
+from src.auth import get_password_hash, verify_password, verify_password_async
+from src.config import settings
+from src.services.password_hasher import password_hasher
+
+PASSWORD = "yisan-bench-password"
+PUBLIC_BODY = b'{"items":[' + b",".join(b'{"id":%d,"title":"case"}' % i for i in range(20)) + b'],"total":20}'
+
+
+def build_app(hashed: str, offloaded: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/public")
+    async def public():
+        return Response(PUBLIC_BODY, media_type="application/json")
+
+    @app.post("/login")
+    async def login():
+        if offloaded:
+            ok = await verify_password_async(PASSWORD, hashed)
+        else:
+            ok = verify_password(PASSWORD, hashed)
+        return {"ok": ok}
+
+    return app
+
+
+async def call(app, method: str, path: str) -> int:
+    scope = {
+        "type": "http", "method": method, "path": path, "root_path": "",
+        "query_string": b"", "headers": [],
+    }
+    result = {"status": 0}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+
+    await app(scope, receive, send)
+    return result["status"]
+
+
+async def run_scenario(app, seconds: float, logins: int, public_rps: int):
+    deadline = time.perf_counter() + seconds
+    public_latencies, login_status = [], {}
+
+    async def login_worker():
+        while time.perf_counter() < deadline:
+            status = await call(app, "POST", "/login")
+            login_status[status] = login_status.get(status, 0) + 1
+            if status == 503:
+                await asyncio.sleep(0.05)
+
+    async def one_public(scheduled: float):
+        await call(app, "GET", "/public")
+        public_latencies.append((time.perf_counter() - scheduled) * 1000)
+
+    async def public_driver():
+        # 按固定节奏发起请求，延迟从计划发起时刻算起：事件循环被阻塞期间到达的请求如实计入等待
+        interval, tasks, next_at = 1.0 / public_rps, [], time.perf_counter()
+        while next_at < deadline:
+            tasks.append(asyncio.create_task(one_public(next_at)))
+            next_at += interval
+            await asyncio.sleep(max(next_at - time.perf_counter(), 0))
+        await asyncio.gather(*tasks)
+
+    await asyncio.gather(public_driver(), *(login_worker() for _ in range(logins)))
+    public_latencies.sort()
+    pick = lambda q: public_latencies[min(int(len(public_latencies) * q), len(public_latencies) - 1)]
+    return {
+        "public_p50": statistics.median(public_latencies),
+        "public_p99": pick(0.99),
+        "public_max": public_latencies[-1],
+        "logins_ok": login_status.get(200, 0),
+        "logins_503": login_status.get(503, 0),
+    }
+
+
+async def main(seconds: float, logins: int, public_rps: int) -> None:
+    hashed = get_password_hash(PASSWORD)
+    print(f"🔐 bcrypt 成本 {settings.BCRYPT_ROUNDS}，线程池 {password_hasher.max_workers} 线程，"
+          f"排队上限 {password_hasher.max_pending}；{logins} 个并发登录循环，/public {public_rps} 次/秒，各 {seconds:.0f} 秒")
+
+    print(f"\n{'登录实现':<18} | {'public p50':>10} | {'public p99':>10} | {'public max':>10} | {'登录/秒':>8} | {'503':>6}")
+    print("-" * 78)
+    for label, offloaded in (("同步 (阻塞事件循环)", False), ("专用线程池", True)):
+        result = await run_scenario(build_app(hashed, offloaded), seconds, logins, public_rps)
+        print(f"{label:<18} | {result['public_p50']:>8.1f}ms | {result['public_p99']:>8.1f}ms | "
+              f"{result['public_max']:>8.1f}ms | {result['logins_ok'] / seconds:>8.1f} | {result['logins_503']:>6}")
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="登录洪峰下公开接口延迟基准")
+    parser.add_argument("--seconds", type=float, default=10, help="每个场景的持续时间")
+    parser.add_argument("--logins", type=int, default=32, help="并发登录循环数")
+    parser.add_argument("--public-rps", type=int, default=200, help="公开接口请求速率")
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds, args.logins, args.public_rps))
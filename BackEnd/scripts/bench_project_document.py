@@ -0,0 +1,141 @@
+# BackEnd/scripts/bench_project_document.py
+"""
+业主端项目详情基准：ORM (selectinload + ProjectResponse) vs PostgreSQL 直出 JSON
+在一个事务内创建带数千条日志的模拟项目，结束时回滚，不在数据库中留下数据。
+
+1. 先校验两条路径的输出逐字节一致 (不一致时打印首个差异位置并退出)；
+2. 再分别计时 (查询 + 装载/拼接 + 序列化)。
+
+模拟数据覆盖：引号/反斜杠/换行/控制字符/中文、微秒为 0 的时间戳、空图片数组与 NULL 字段、
+同一时间创建的多条 VR 资源 (latest_vr 取值规则)。
+
+用法：python scripts/bench_project_document.py [--logs 3000] [--nodes 12] [--iterations 50]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+backend_dir = Path(__file__).resolve().parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.append(str(backend_dir))
+
+from src.database import AsyncSessionLocal, engine
+from src.services.project_document import load_project_orm, render_project_document, render_project_orm
+
+
+async def seed(session, nodes: int, logs: int) -> int:
+    project_id = (await session.execute(text("""
+        INSERT INTO projects (project_no, access_code, client_name, address, current_progress, status)
+        VALUES ('BENCH-DOC-0001', '123456', '张三 "测试"', E'上海市\\n徐汇区', 35, '進行中')
+        RETURNING id
+    """))).scalar_one()
+
+    await session.execute(text("""
+        INSERT INTO project_nodes (project_id, node_name, target_percent, status, completed_at)
+        SELECT :project_id, '节点 ' || g, g * 8,
+               CASE WHEN g < 4 THEN 'completed' WHEN g = 4 THEN 'ongoing' ELSE 'pending' END,
+               CASE WHEN g < 3 THEN date_trunc('second', now()) - g * interval '1 day'
+                    WHEN g = 3 THEN now() - interval '3 day' END
+        FROM generate_series(1, :nodes) AS g
+    """), {"project_id": project_id, "nodes": nodes})
+
+    await session.execute(text("""
+        INSERT INTO project_logs (project_id, node_id, content, images, sender_type, operator, created_at)
+        SELECT :project_id,
+               CASE WHEN g % 3 = 0 THEN NULL ELSE (
+                   SELECT id FROM project_nodes WHERE project_id = :project_id ORDER BY id
+                   OFFSET (g % :nodes) LIMIT 1
+               ) END,
+               CASE g % 4
+                   WHEN 0 THEN '现场已完成水电验收，业主确认无误。' || repeat('细节说明；', 20)
+                   WHEN 1 THEN E'引号 "quoted" 与反斜杠 \\\\ 以及换行\\n制表\\t'
+                   WHEN 2 THEN 'control ' || chr(1) || chr(31) || ' / slash'
+                   ELSE 'plain log ' || g
+               END,
+               CASE WHEN g % 5 = 0 THEN '[]'::jsonb
+                    ELSE jsonb_build_array('/uploads/' || md5(g::text) || '.webp', '/uploads/' || md5((g + 1)::text) || '.webp')
+               END,
+               CASE WHEN g % 3 = 0 THEN 'client' ELSE 'admin' END,
+               CASE WHEN g % 7 = 0 THEN NULL ELSE '工长李四' END,
+               CASE WHEN g % 10 = 0 THEN date_trunc('second', now()) ELSE now() END - g * interval '1 minute'
+        FROM generate_series(1, :logs) AS g
+    """), {"project_id": project_id, "nodes": nodes, "logs": logs})
+
+    await session.execute(text("""
+        INSERT INTO project_resources (project_id, resource_type, title, url, created_at)
+        VALUES (:project_id, 'vr', 'VR 全景 A', 'https://vr.example.com/a', date_trunc('second', now())),
+               (:project_id, 'vr', 'VR 全景 B', 'https://vr.example.com/b', date_trunc('second', now())),
+               (:project_id, 'report', '第 1 周周报', '/uploads/report-1.pdf', now() - interval '7 day'),
+               (:project_id, 'report', '第 2 周周报', '/uploads/report-2.pdf', now())
+    """), {"project_id": project_id})
+    return project_id
+
+
+def first_difference(a: bytes, b: bytes) -> int:
+    for index, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return index
+    return min(len(a), len(b))
+
+
+async def timed(fn, iterations: int):
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[max(int(len(timings) * 0.95) - 1, 0)]
+
+
+async def main(nodes: int, logs: int, iterations: int) -> int:
+    async with AsyncSessionLocal() as session:
+        try:
+            print(f"🌱 创建模拟项目：{nodes} 个节点，{logs} 条日志 (事务内，结束后回滚)...")
+            project_id = await seed(session, nodes, logs)
+
+            async def orm_path():
+                session.expunge_all()  # 每轮重新装载，避免身份映射复用
+                return render_project_orm(await load_project_orm(session, project_id))
+
+            async def sql_path():
+                return await render_project_document(session, project_id)
+
+            orm_body, sql_body = await orm_path(), await sql_path()
+            if orm_body != sql_body:
+                index = first_difference(orm_body, sql_body)
+                print(f"❌ 输出不一致：首个差异位于字节 {index}")
+                print(f"   ORM: {orm_body[max(index - 80, 0):index + 80]!r}")
+                print(f"   SQL: {sql_body[max(index - 80, 0):index + 80]!r}")
+                return 1
+            print(f"✅ 两条路径输出逐字节一致 ({len(sql_body):,} 字节)")
+
+            print(f"\n{'路径':<28} | {'p50(ms)':>8} | {'p95(ms)':>8}")
+            print("-" * 52)
+            for label, fn in (("ORM + ProjectResponse", orm_path), ("PostgreSQL 直出 JSON", sql_path)):
+                p50, p95 = await timed(fn, iterations)
+                print(f"{label:<28} | {p50:>8.2f} | {p95:>8.2f}")
+            return 0
+        finally:
+            await session.rollback()
+
+
+async def run(nodes: int, logs: int, iterations: int) -> int:
+    try:
+        return await main(nodes, logs, iterations)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="业主端项目详情基准")
+    parser.add_argument("--nodes", type=int, default=12, help="施工节点数")
+    parser.add_argument("--logs", type=int, default=3000, help="日志条数")
+    parser.add_argument("--iterations", type=int, default=50, help="每条路径的执行次数")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.nodes, args.logs, args.iterations)))
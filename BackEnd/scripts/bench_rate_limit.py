@@ -0,0 +1,181 @@
+# BackEnd/scripts/bench_rate_limit.py
+"""
+接口限频基准：每次检查的开销与多进程共享效果
+
+1. 单次检查耗时：memory:// / sqlite (临时文件) / postgresql (需 --postgres，使用 DATABASE_URL)；
+2. 每个请求增加的开销：进程内驱动最小 ASGI 应用，对比带/不带 @limiter.limit 的同一接口；
+3. 多进程共享：--processes 个子进程同时对同一个键各请求 --attempts 次，
+   统计总放行次数 (共享存储应约等于 limit，本进程内存模式则为 processes × limit)。
+
+用法：python scripts/bench_rate_limit.py [--checks 5000] [--processes 4] [--postgres]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+backend_dir = Path(__file__).resolve().parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.append(str(backend_dir))
+
+from src.services.rate_limit import RateLimiter
+
+
+def summarize(samples_us):
+    samples_us.sort()
+    return statistics.median(samples_us), samples_us[min(int(len(samples_us) * 0.99), len(samples_us) - 1)]
+
+
+# ==========================================
+# 1. 单次检查耗时
+# ==========================================
+
+async def bench_checks(limiter: RateLimiter, checks: int):
+    samples = []
+    # 1000 个不同 IP 轮流访问，接近真实的键分布
+    for i in range(checks):
+        started = time.perf_counter()
+        await limiter.hit(f"bench:10.0.{i % 1000 // 250}.{i % 250}", 1_000_000, 60)
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    return summarize(samples)
+
+
+# ==========================================
+# 2. 每个请求增加的开销 (ASGI 进程内)
+# ==========================================
+
+def build_app(limiter: RateLimiter) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/plain")
+    async def plain(request: Request):
+        return Response(b"{}", media_type="application/json")
+
+    @app.get("/limited")
+    @limiter.limit("1000000/minute")
+    async def limited(request: Request):
+        return Response(b"{}", media_type="application/json")
+
+    return app
+
+
+async def call(app, path: str) -> int:
+    scope = {
+        "type": "http", "method": "GET", "path": path, "root_path": "", "query_string": b"",
+        "headers": [], "client": ("10.0.0.1", 50000),
+    }
+    result = {"status": 0}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+
+    await app(scope, receive, send)
+    return result["status"]
+
+
+async def bench_requests(limiter: RateLimiter, requests: int):
+    app = build_app(limiter)
+    results = {}
+    for path in ("/plain", "/limited"):
+        samples = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            assert await call(app, path) == 200
+            samples.append((time.perf_counter() - started) * 1_000_000)
+        results[path] = summarize(samples)
+    return results
+
+
+# ==========================================
+# 3. 多进程共享
+# ==========================================
+
+def _worker(storage_uri: str, key: str, limit: int, attempts: int, start_at: float, queue) -> None:
+    async def run():
+        limiter = RateLimiter(storage_uri)
+        allowed = 0
+        for _ in range(attempts):
+            ok, _ = await limiter.hit(key, limit, 60)
+            allowed += ok
+        return allowed
+
+    time.sleep(max(start_at - time.time(), 0))
+    queue.put(asyncio.run(run()))
+
+
+def bench_processes(storage_uri: str, processes: int, limit: int, attempts: int) -> int:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    key = f"bench-shared:{uuid.uuid4().hex}"
+    start_at = time.time() + 1.0
+    workers = [
+        ctx.Process(target=_worker, args=(storage_uri, key, limit, attempts, start_at, queue))
+        for _ in range(processes)
+    ]
+    for w in workers:
+        w.start()
+    total = sum(queue.get() for _ in workers)
+    for w in workers:
+        w.join()
+    return total
+
+
+async def main(args) -> None:
+    tmpdir = tempfile.mkdtemp(prefix="ratelimit-bench-")
+    storages = {
+        "memory://": "memory://",
+        "sqlite (临时文件)": f"sqlite:///{os.path.join(tmpdir, 'ratelimit.db')}",
+    }
+    if args.postgres:
+        storages["postgresql"] = "postgresql"
+
+    print(f"⏱️  单次检查 ({args.checks} 次，1000 个不同键)")
+    print(f"{'存储':<20} | {'p50(µs)':>9} | {'p99(µs)':>9}")
+    print("-" * 45)
+    for label, uri in storages.items():
+        p50, p99 = await bench_checks(RateLimiter(uri), args.checks)
+        print(f"{label:<20} | {p50:>9.1f} | {p99:>9.1f}")
+
+    print(f"\n🌐 每个请求增加的开销 (ASGI 进程内，{args.requests} 次)")
+    print(f"{'存储':<20} | {'无限频 p50':>10} | {'限频 p50':>10} | {'增加(µs)':>9} | {'限频 p99':>10}")
+    print("-" * 72)
+    for label, uri in storages.items():
+        results = await bench_requests(RateLimiter(uri), args.requests)
+        (plain_p50, _), (limited_p50, limited_p99) = results["/plain"], results["/limited"]
+        print(f"{label:<20} | {plain_p50:>10.1f} | {limited_p50:>10.1f} | "
+              f"{limited_p50 - plain_p50:>9.1f} | {limited_p99:>10.1f}")
+
+    if args.postgres:
+        from src.database import engine
+        await engine.dispose()
+
+    print(f"\n👥 多进程共享 ({args.processes} 个进程 × {args.attempts} 次，同一键，limit={args.limit}/分钟)")
+    for label, uri in storages.items():
+        allowed = bench_processes(uri, args.processes, args.limit, args.attempts)
+        print(f"{label:<20} | 放行 {allowed:>5} 次 (期望 {args.limit})")
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="接口限频基准")
+    parser.add_argument("--checks", type=int, default=5000, help="单次检查计时的次数")
+    parser.add_argument("--requests", type=int, default=3000, help="ASGI 请求次数")
+    parser.add_argument("--processes", type=int, default=4, help="多进程共享测试的进程数")
+    parser.add_argument("--attempts", type=int, default=50, help="每个进程的请求次数")
+    parser.add_argument("--limit", type=int, default=20, help="多进程共享测试的限频次数")
+    parser.add_argument("--postgres", action="store_true", help="同时测试 postgresql 存储 (需可连接的数据库)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,87 @@
+# BackEnd/scripts/bench_upload_memory.py
+"""
+上传接收阶段的峰值内存对比
+旧方案：await file.read() + io.BytesIO (整文件进内存)
+新方案：spool_upload_to_disk 分块落盘 (1MB 一块)
+
+用法：python scripts/bench_upload_memory.py [--sizes 5,10,20,40]
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from starlette.datastructures import UploadFile
+
+backend_dir = Path(__file__).resolve().parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.append(str(backend_dir))
+
+from src.utils.upload_stream import spool_upload_to_disk
+
+
+def make_upload(size_mb: int) -> UploadFile:
+    """构造与 Starlette 表单解析结果一致的 UploadFile (SpooledTemporaryFile，超过 1MB 落盘)"""
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    block = os.urandom(1024 * 1024)
+    for _ in range(size_mb):
+        spooled.write(block)
+    spooled.seek(0)
+    return UploadFile(file=spooled, filename="bench.jpg")
+
+
+async def legacy_ingest(upload: UploadFile) -> int:
+    content = await upload.read()
+    buffer = io.BytesIO(content)
+    return len(buffer.getbuffer())
+
+
+async def streaming_ingest(upload: UploadFile, workdir: Path) -> int:
+    path, size, _ = await spool_upload_to_disk(upload, workdir, max_bytes=1 << 40)
+    path.unlink(missing_ok=True)
+    return size
+
+
+async def measure(coro_factory) -> tuple:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    await coro_factory()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+async def main(sizes):
+    workdir = Path(tempfile.mkdtemp(prefix="bench-upload-"))
+    print(f"{'大小':>6} | {'旧方案峰值':>12} | {'新方案峰值':>12} | {'旧耗时':>8} | {'新耗时':>8}")
+    print("-" * 62)
+    for size_mb in sizes:
+        legacy_upload = make_upload(size_mb)
+        legacy_peak, legacy_time = await measure(lambda: legacy_ingest(legacy_upload))
+        await legacy_upload.close()
+
+        stream_upload = make_upload(size_mb)
+        stream_peak, stream_time = await measure(
+            lambda: streaming_ingest(stream_upload, workdir)
+        )
+        await stream_upload.close()
+
+        print(
+            f"{size_mb:>4}MB | {legacy_peak / 1024 / 1024:>10.1f}MB | {stream_peak / 1024 / 1024:>10.1f}MB"
+            f" | {legacy_time * 1000:>6.0f}ms | {stream_time * 1000:>6.0f}ms"
+        )
+    workdir.rmdir()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="上传接收阶段峰值内存基准")
+    parser.add_argument("--sizes", default="5,10,20,40", help="文件大小 (MB)，逗号分隔")
+    args = parser.parse_args()
+    asyncio.run(main([int(s) for s in args.sizes.split(",") if s.strip()]))
@@ -0,0 +1,117 @@
+# BackEnd/scripts/bench_uploads_static.py
+"""
+/uploads 静态服务基准：原 StaticFiles 挂载 vs UploadFiles
+直接在进程内驱动 ASGI 应用，排除网络与服务器差异，只比较处理吞吐与传输字节数。
+
+场景：
+1. 首次访问：完整 GET 图片
+2. 再次访问：浏览器带 If-None-Match 复验 (UploadFiles 的 immutable 图片在有效期内根本不会发请求)
+3. 视频拖动：Range 请求 1MB 片段
+
+用法：python scripts/bench_uploads_static.py [--requests 500]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.staticfiles import StaticFiles
+
+backend_dir = Path(__file__).resolve().parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.append(str(backend_dir))
+
+from src.utils.static_files import UploadFiles
+
+IMAGE_NAME = "0123456789abcdef0123456789abcdef.webp"
+VIDEO_NAME = "site-walkthrough.mp4"
+
+
+async def call(app, path: str, headers=None):
+    """执行一次 ASGI 请求，返回 (状态码, 响应头字节数 + 响应体字节数, 响应头)"""
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    result = {"status": 0, "bytes": 0, "headers": {}}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+            for k, v in message["headers"]:
+                result["bytes"] += len(k) + len(v) + 4
+                result["headers"][k.decode()] = v.decode()
+        elif message["type"] == "http.response.body":
+            result["bytes"] += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return result["status"], result["bytes"], result["headers"]
+
+
+async def run_scenario(app, path: str, count: int, headers=None):
+    total_bytes = 0
+    statuses = set()
+    started = time.perf_counter()
+    for _ in range(count):
+        status, size, _ = await call(app, path, headers)
+        total_bytes += size
+        statuses.add(status)
+    elapsed = time.perf_counter() - started
+    return count / elapsed, total_bytes / count, statuses
+
+
+async def main(count: int):
+    workdir = Path(tempfile.mkdtemp(prefix="bench-uploads-"))
+    (workdir / IMAGE_NAME).write_bytes(os.urandom(300 * 1024))
+    (workdir / VIDEO_NAME).write_bytes(os.urandom(50 * 1024 * 1024))
+
+    apps = {
+        "StaticFiles": StaticFiles(directory=str(workdir)),
+        "UploadFiles": UploadFiles(directory=str(workdir)),
+    }
+
+    print(f"{'场景':<12} | {'实现':<12} | {'请求/秒':>10} | {'字节/请求':>12} | 状态码")
+    print("-" * 70)
+    for label, app in apps.items():
+        _, _, headers = await call(app, f"/{IMAGE_NAME}")
+        print(f"{'响应头':<12} | {label:<12} | cache-control={headers.get('cache-control', '-')}")
+
+    for label, app in apps.items():
+        rps, avg, statuses = await run_scenario(app, f"/{IMAGE_NAME}", count)
+        print(f"{'首次访问':<12} | {label:<12} | {rps:>10.0f} | {avg:>12.0f} | {sorted(statuses)}")
+
+    for label, app in apps.items():
+        _, _, headers = await call(app, f"/{IMAGE_NAME}")
+        if "immutable" in headers.get("cache-control", ""):
+            print(f"{'再次访问':<12} | {label:<12} | {'免请求':>10} | {0:>12} | immutable 有效期内不发请求")
+            continue
+        rps, avg, statuses = await run_scenario(
+            app, f"/{IMAGE_NAME}", count, {"If-None-Match": headers.get("etag", "")}
+        )
+        print(f"{'再次访问':<12} | {label:<12} | {rps:>10.0f} | {avg:>12.0f} | {sorted(statuses)}")
+
+    range_headers = {"Range": "bytes=10485760-11534335"}
+    for label, app in apps.items():
+        rps, avg, statuses = await run_scenario(app, f"/{VIDEO_NAME}", max(count // 50, 5), range_headers)
+        print(f"{'视频拖动':<12} | {label:<12} | {rps:>10.1f} | {avg:>12.0f} | {sorted(statuses)}")
+
+    for path in workdir.iterdir():
+        path.unlink()
+    workdir.rmdir()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="/uploads 静态服务基准")
+    parser.add_argument("--requests", type=int, default=500, help="每个场景的请求次数")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
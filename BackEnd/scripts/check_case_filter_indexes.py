@@ -0,0 +1,164 @@
+# BackEnd/scripts/check_case_filter_indexes.py
+"""
+案例筛选索引检查 (EXPLAIN)
+在一个事务内灌入 10 万条模拟案例并 ANALYZE，
+对 /api/cases 实际使用的筛选查询执行 EXPLAIN ANALYZE，确认命中 GIN / 年份索引。
+结束时回滚，不会在数据库中留下任何数据。
+
+前置：已执行 alembic upgrade head (需要 ix_cases_categories_gin 等索引)
+用法：python scripts/check_case_filter_indexes.py [--rows 100000] [--verbose]
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from sqlalchemy import desc, func, select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+backend_dir = Path(__file__).resolve().parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.append(str(backend_dir))
+
+from src.database import engine, DBCase
+from src.services.case_query import apply_case_filters
+
+EXPECTED_INDEXES = ("ix_cases_categories_gin", "ix_cases_styles_gin", "ix_cases_year")
+
+# 分类分布刻意不均匀，贴近真实作品集 (住宅多、展厅少)
+SEED_SQL = text("""
+    INSERT INTO cases (slug, title, chinese_title, categories, styles, images, featured, status, year, created_at)
+    SELECT
+        'explain-check-' || g,
+        'Explain Check ' || g,
+        '索引检查 ' || g,
+        jsonb_build_array(CASE
+            WHEN r < 0.40 THEN 'residential'
+            WHEN r < 0.60 THEN 'office'
+            WHEN r < 0.75 THEN 'commercial'
+            WHEN r < 0.87 THEN 'renovation'
+            WHEN r < 0.96 THEN 'hospitality'
+            ELSE 'cultural'
+        END),
+        jsonb_build_array('style-' || (g % 20), 'style-' || ((g * 7 + 3) % 20)),
+        '[]'::jsonb,
+        g % 50 = 0,
+        'completed',
+        2000 + (g % 26),
+        now() - g * interval '1 minute'
+    FROM (SELECT g, random() AS r FROM generate_series(1, :rows) AS g) AS seed
+""")
+
+
+# ==========================================
+# 1. EXPLAIN 语句 (复用 SQLAlchemy 编译，参数绑定与线上完全一致)
+# ==========================================
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def collect_plan(node, found):
+    """递归收集计划节点类型与使用到的索引"""
+    found["nodes"].add(node["Node Type"])
+    if "Index Name" in node:
+        found["indexes"].add(node["Index Name"])
+    for child in node.get("Plans", []):
+        collect_plan(child, found)
+    return found
+
+
+# ==========================================
+# 2. 检查场景 (与 list_cases 的两条 SQL 一致：总数 + 首页)
+# ==========================================
+
+SCENARIOS = [
+    # (说明, 筛选参数, 期望命中的索引)
+    ("单分类 (展厅, ~4%)", {"categories": ["exhibition-hall"]}, "ix_cases_categories_gin"),
+    ("多分类任选 (酒店 / 展厅)", {"categories": ["hotel-vacation", "exhibition-hall"]}, "ix_cases_categories_gin"),
+    ("风格", {"styles": ["style-3"]}, "ix_cases_styles_gin"),
+    ("年份", {"year": 2012}, "ix_cases_year"),
+    ("分类 + 风格 + 年份", {"categories": ["residential"], "styles": ["style-5"], "year": 2020}, None),
+]
+
+
+async def explain(conn, statement, verbose: bool):
+    result = await conn.execute(Explain(statement))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    root = plan[0]
+    found = collect_plan(root["Plan"], {"nodes": set(), "indexes": set()})
+    if verbose:
+        print(json.dumps(root["Plan"], ensure_ascii=False, indent=2))
+    return found, root.get("Execution Time", 0.0)
+
+
+async def main(rows: int, verbose: bool):
+    async with engine.connect() as conn:
+        existing = set((await conn.execute(
+            text("SELECT indexname FROM pg_indexes WHERE tablename = 'cases'")
+        )).scalars())
+        missing = [name for name in EXPECTED_INDEXES if name not in existing]
+        if missing:
+            print(f"❌ 缺少索引: {', '.join(missing)}，请先执行 alembic upgrade head")
+            return 1
+
+        # 连接首次执行时已自动开启事务：此后所有写入都在该事务内，finally 中回滚
+        try:
+            print(f"🌱 灌入 {rows} 条模拟案例 (事务内，结束后回滚)...")
+            await conn.execute(SEED_SQL, {"rows": rows})
+            await conn.execute(text("ANALYZE cases"))
+
+            failures = 0
+            print(f"\n{'场景':<22} | {'查询':<4} | {'耗时(ms)':>9} | 计划")
+            print("-" * 90)
+            for label, filters, expected in SCENARIOS:
+                base, _ = apply_case_filters(select(DBCase), **filters)
+                statements = {
+                    "总数": select(func.count()).select_from(base.subquery()),
+                    "首页": base.order_by(desc(DBCase.created_at), desc(DBCase.id)).limit(9),
+                }
+                for kind, statement in statements.items():
+                    found, elapsed = await explain(conn, statement, verbose)
+                    used = ", ".join(sorted(found["indexes"])) or "无索引"
+                    mark = "  "
+                    if expected and kind == "总数":
+                        ok = expected in found["indexes"]
+                        mark = "✅" if ok else "⚠️"
+                        failures += 0 if ok else 1
+                    print(f"{mark}{label:<20} | {kind:<4} | {elapsed:>9.2f} | {'/'.join(sorted(found['nodes']))} [{used}]")
+
+            print("-" * 90)
+            if failures:
+                print(f"⚠️  {failures} 个场景的总数查询未使用期望索引")
+            else:
+                print("✅ 所有筛选场景均命中索引")
+            return 1 if failures else 0
+        finally:
+            await conn.rollback()
+
+
+async def run(rows: int, verbose: bool):
+    try:
+        return await main(rows, verbose)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="案例筛选索引 EXPLAIN 检查")
+    parser.add_argument("--rows", type=int, default=100_000, help="模拟案例数量")
+    parser.add_argument("--verbose", action="store_true", help="输出完整执行计划")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.rows, args.verbose)))
@@ -0,0 +1,215 @@
+# BackEnd/scripts/soak_project_events.py
+"""
+项目动态推送 (SSE) 浸泡测试：单个 worker 能稳定承载多少并发订阅
+
+针对一个正在运行的 uvicorn worker (建议 --workers 1，便于读取该进程的内存)：
+1. 以管理员身份登录，按档位逐步增加 /api/admin/projects/{id}/events 长连接；
+2. 每档通过 /reply 发布若干条日志，统计送达率与端到端延迟 (日志内容携带发送时间戳)；
+3. 读取 /api/admin/metrics 中的 project_events 指标与 worker 进程 RSS (同机运行时)；
+4. 连接失败、送达不完整或 p95 超过阈值时停止加压，最后一个通过的档位即为容量估计。
+
+注意：测试日志会真实写入指定项目，请使用测试项目。
+
+用法：
+    python scripts/soak_project_events.py --project 1 --username admin --password ****
+        [--base-url http://127.0.0.1:8000] [--steps 500,1000,2000,4000] [--messages 5] [--p95-ms 500]
+"""
+import argparse
+import asyncio
+import json
+import resource
+import statistics
+import sys
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+
+# ==========================================
+# 1. 极简 SSE 客户端 (asyncio 原生连接，单连接开销最小)
+# ==========================================
+
+class Subscriber:
+    def __init__(self, host: str, port: int, path: str, token: str, latencies: dict):
+        self.host, self.port, self.path, self.token = host, port, path, token
+        self.latencies = latencies
+        self.ready = asyncio.get_running_loop().create_future()
+        self.task = None
+        self.writer = None
+
+    async def _read_chunks(self, reader):
+        """解析 chunked 响应体 (StreamingResponse 不带 Content-Length)"""
+        while True:
+            size = int((await reader.readline()).strip() or b"0", 16)
+            if size == 0:
+                return
+            yield await reader.readexactly(size)
+            await reader.readexactly(2)
+
+    async def run(self):
+        try:
+            reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            self.writer.write(
+                f"GET {self.path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Authorization: Bearer {self.token}\r\nAccept: text/event-stream\r\n\r\n".encode()
+            )
+            status = await reader.readline()
+            if b" 200 " not in status:
+                raise RuntimeError(status.decode(errors="replace").strip())
+            while (await reader.readline()) not in (b"\r\n", b""):
+                pass
+
+            buffer = b""
+            async for chunk in self._read_chunks(reader):
+                buffer += chunk
+                while b"\n\n" in buffer:
+                    block, buffer = buffer.split(b"\n\n", 1)
+                    self._on_event(block.decode("utf-8"))
+        except Exception as e:
+            if not self.ready.done():
+                self.ready.set_exception(e)
+
+    def _on_event(self, block: str):
+        fields = dict(line.split(": ", 1) for line in block.split("\n") if ": " in line and not line.startswith(":"))
+        event_type = fields.get("event")
+        if event_type == "ready" and not self.ready.done():
+            self.ready.set_result(True)
+        elif event_type == "log":
+            content = json.loads(fields["data"]).get("content", "")
+            if content.startswith("soak "):
+                _, seq, sent = content.split(" ")
+                self.latencies.setdefault(int(seq), []).append((time.time() - float(sent)) * 1000)
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        if self.task is not None:
+            self.task.cancel()
+
+
+# ==========================================
+# 2. 辅助：登录、发布、读取指标
+# ==========================================
+
+def login(base_url: str, username: str, password: str) -> str:
+    response = requests.post(f"{base_url}/api/auth/login", data={"username": username, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def publish(base_url: str, token: str, project_id: int, seq: int) -> None:
+    response = requests.post(
+        f"{base_url}/api/admin/projects/{project_id}/reply",
+        json={"content": f"soak {seq} {time.time():.6f}"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    response.raise_for_status()
+
+
+def read_metrics(base_url: str, token: str) -> dict:
+    response = requests.get(f"{base_url}/api/admin/metrics", headers={"Authorization": f"Bearer {token}"})
+    response.raise_for_status()
+    return response.json()
+
+
+def read_rss_mb(pid: int):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)] if values else float("nan")
+
+
+# ==========================================
+# 3. 分档加压
+# ==========================================
+
+async def main(args) -> int:
+    # 每个订阅占用一个文件描述符，尽量调高软限制
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    url = urlsplit(args.base_url)
+    host, port = url.hostname, url.port or 80
+    path = f"/api/admin/projects/{args.project}/events"
+    token = login(args.base_url, args.username, args.password)
+    base_metrics = read_metrics(args.base_url, token)
+    pid, base_rss = base_metrics["pid"], read_rss_mb(base_metrics["pid"])
+    print(f"🎯 worker pid={pid} 初始 RSS={base_rss or 0:.1f}MB，事件后端={base_metrics['project_events']['backend']}")
+
+    subscribers, latencies, seq, capacity = [], {}, 0, 0
+    print(f"\n{'订阅数':>7} | {'建连(s)':>7} | {'送达率':>7} | {'p50(ms)':>8} | {'p95(ms)':>8} | {'RSS(MB)':>8} | {'每连接(KB)':>10}")
+    print("-" * 78)
+    try:
+        for target in args.steps:
+            started = time.perf_counter()
+            batch = [Subscriber(host, port, path, token, latencies) for _ in range(target - len(subscribers))]
+            for index, sub in enumerate(batch):
+                sub.start()
+                if index % 200 == 199:
+                    await asyncio.sleep(0.05)  # 分批建连，避免 accept 队列溢出
+            subscribers.extend(batch)
+            results = await asyncio.gather(
+                *(asyncio.wait_for(sub.ready, args.connect_timeout) for sub in batch), return_exceptions=True
+            )
+            failures = [r for r in results if isinstance(r, BaseException)]
+            connect_s = time.perf_counter() - started
+            if failures:
+                print(f"{target:>7} | ❌ {len(failures)} 个连接失败: {failures[0]!r}")
+                break
+
+            step_seqs = []
+            for _ in range(args.messages):
+                seq += 1
+                step_seqs.append(seq)
+                await asyncio.to_thread(publish, args.base_url, token, args.project, seq)
+                await asyncio.sleep(args.interval)
+            await asyncio.sleep(args.settle)
+
+            samples = [v for s in step_seqs for v in latencies.get(s, [])]
+            ratio = len(samples) / (target * args.messages)
+            p50, p95 = statistics.median(samples) if samples else float("nan"), percentile(samples, 0.95)
+            rss = read_rss_mb(pid)
+            per_conn = ((rss - base_rss) * 1024 / target) if rss and base_rss else float("nan")
+            print(f"{target:>7} | {connect_s:>7.1f} | {ratio:>6.1%} | {p50:>8.1f} | {p95:>8.1f} | "
+                  f"{rss or float('nan'):>8.1f} | {per_conn:>10.1f}")
+
+            if ratio < 1.0 or p95 > args.p95_ms:
+                print(f"⚠️  {target} 个订阅未达标 (送达率 {ratio:.1%}，p95 {p95:.0f}ms)")
+                break
+            capacity = target
+
+        stats = read_metrics(args.base_url, token)["project_events"]
+        print(f"\n📊 服务端指标: {stats}")
+        print(f"✅ 单 worker 稳定承载订阅数 ≥ {capacity}" if capacity else "❌ 首档即未达标")
+        return 0 if capacity else 1
+    finally:
+        await asyncio.gather(*(sub.close() for sub in subscribers), return_exceptions=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="项目动态推送浸泡测试")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", required=True, help="管理员账号")
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--project", type=int, required=True, help="测试项目 ID (会写入测试日志)")
+    parser.add_argument("--steps", default="500,1000,2000,4000", help="逐档订阅数，逗号分隔")
+    parser.add_argument("--messages", type=int, default=5, help="每档发布的日志条数")
+    parser.add_argument("--interval", type=float, default=0.2, help="发布间隔 (秒)")
+    parser.add_argument("--settle", type=float, default=2.0, help="每档发布后等待送达的时间 (秒)")
+    parser.add_argument("--connect-timeout", type=float, default=30.0)
+    parser.add_argument("--p95-ms", type=float, default=500.0, help="p95 延迟阈值 (毫秒)")
+    args = parser.parse_args()
+    args.steps = sorted(int(s) for s in args.steps.split(","))
+    sys.exit(asyncio.run(main(args)))
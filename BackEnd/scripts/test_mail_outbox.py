@@ -0,0 +1,239 @@
+# BackEnd/scripts/test_mail_outbox.py
+"""
+通知投递测试：在本机启动一个最小 SMTP 替身服务器，验证 SMTPPool 与发件箱投递
+
+替身服务器行为 (按收件人地址)：
+- bounce@...  RCPT 返回 550 (永久失败)；
+- flaky@...   每个地址第一次 RCPT 返回 451 (临时失败)，之后正常；
+- 其它地址    正常接收，记录连接数与收到的邮件。
+
+检查项：连接复用、服务器断开空闲连接后自动重连、空闲超时重建、失败分类与拒收后连接继续可用；
+--postgres 时额外对 DATABASE_URL 中的 notification_outbox 跑一遍领取/发送/重试/写回 (测试行结束后删除)。
+
+用法：python scripts/test_mail_outbox.py [--postgres]
+"""
+import argparse
+import asyncio
+import base64
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.append(str(backend_dir))
+
+import aiosmtplib
+
+from src.utils.mailer import SMTPPool, build_message, is_permanent_failure
+
+
+# ==========================================
+# 1. SMTP 替身服务器
+# ==========================================
+
+class StandInSMTPServer:
+    def __init__(self):
+        self.connections = 0
+        self.messages = []
+        self.auth_users = []
+        self._seen_flaky = set()
+        self._writers = set()
+        self._server = None
+        self.port = 0
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.drop_connections()
+        self._server.close()
+        await self._server.wait_closed()
+
+    def drop_connections(self) -> None:
+        """模拟服务器主动断开所有 (空闲) 连接"""
+        for writer in list(self._writers):
+            writer.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        reply = lambda line: writer.write(line.encode() + b"\r\n")
+        sender, recipients = None, []
+        try:
+            reply("220 stand-in ESMTP")
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                line = raw.decode().rstrip("\r\n")
+                verb = line.split(" ", 1)[0].upper()
+                if verb in ("EHLO", "HELO"):
+                    reply("250-stand-in")
+                    reply("250 AUTH PLAIN")
+                elif verb == "AUTH":
+                    parts = line.split(" ")
+                    if len(parts) < 3:
+                        reply("334 ")
+                        await writer.drain()
+                        parts.append((await reader.readline()).decode().strip())
+                    self.auth_users.append(base64.b64decode(parts[2]).split(b"\0")[1].decode())
+                    reply("235 authenticated")
+                elif verb == "MAIL":
+                    sender, recipients = line[10:].strip("<> "), []
+                    reply("250 ok")
+                elif verb == "RCPT":
+                    address = line[8:].split(">")[0].strip("<> ")
+                    if address.startswith("bounce"):
+                        reply("550 no such user")
+                    elif address.startswith("flaky") and address not in self._seen_flaky:
+                        self._seen_flaky.add(address)
+                        reply("451 try again later")
+                    else:
+                        recipients.append(address)
+                        reply("250 ok")
+                elif verb == "DATA":
+                    reply("354 end with .")
+                    await writer.drain()
+                    data = []
+                    while True:
+                        chunk = await reader.readline()
+                        if chunk in (b".\r\n", b""):
+                            break
+                        data.append(chunk)
+                    self.messages.append((sender, recipients, b"".join(data)))
+                    reply("250 queued")
+                elif verb in ("RSET", "NOOP"):
+                    sender, recipients = None, []
+                    reply("250 ok")
+                elif verb == "QUIT":
+                    reply("221 bye")
+                    await writer.drain()
+                    break
+                else:
+                    reply("502 not implemented")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+def message(recipient: str, n: int = 0):
+    return build_message("noreply@yisan.test", "一三设计项目部", recipient, f"测试邮件 {n}", f"正文 {n}")
+
+
+def check(condition: bool, label: str) -> None:
+    print(f"{'✅' if condition else '❌'} {label}")
+    if not condition:
+        raise SystemExit(1)
+
+
+# ==========================================
+# 2. 连接池
+# ==========================================
+
+async def check_pool(server: StandInSMTPServer) -> None:
+    pool = SMTPPool("127.0.0.1", server.port, username="mailer", password="secret", size=2, idle_timeout=30)
+
+    await asyncio.gather(*(pool.send(message(f"user{i}@example.com", i)) for i in range(20)))
+    check(len(server.messages) == 20, "20 封邮件全部送达")
+    check(server.connections == 2, f"并发发送只建立 {pool.size} 条连接 (实际 {server.connections})")
+    check(pool.reuses == 18 and server.auth_users == ["mailer", "mailer"], "其余发送复用已登录的连接")
+
+    server.drop_connections()
+    await asyncio.sleep(0.05)
+    await pool.send(message("after-drop@example.com"))
+    check(server.messages[-1][1] == ["after-drop@example.com"], "服务器断开空闲连接后自动重连发送")
+
+    connections = server.connections
+    try:
+        await pool.send(message("bounce@example.com"))
+        check(False, "550 应抛出异常")
+    except aiosmtplib.SMTPRecipientsRefused as e:
+        check(is_permanent_failure(e), "550 拒收判定为永久失败")
+    try:
+        await pool.send(message("flaky@example.com"))
+        check(False, "451 应抛出异常")
+    except aiosmtplib.SMTPRecipientsRefused as e:
+        check(not is_permanent_failure(e), "451 判定为可重试")
+    await pool.send(message("flaky@example.com"))
+    check(server.connections == connections, "拒收后连接复位并继续复用，未新建连接")
+
+    pool.idle_timeout = 0.1
+    await asyncio.sleep(0.2)
+    await pool.send(message("late@example.com"))
+    check(server.connections == connections + 1, "空闲超时的连接被关闭重建")
+    await pool.close()
+
+
+# ==========================================
+# 3. 发件箱投递 (需 PostgreSQL)
+# ==========================================
+
+async def check_dispatcher(server: StandInSMTPServer) -> None:
+    from sqlalchemy import delete, select, update
+
+    from src.config import settings
+    from src.database import AsyncSessionLocal, DBNotification, engine
+    from src.services.notifications import NotificationDispatcher, enqueue_email
+
+    settings.MAIL_SERVER, settings.MAIL_FROM = "127.0.0.1", "noreply@yisan.test"
+    dispatcher = NotificationDispatcher(
+        pool=SMTPPool("127.0.0.1", server.port, size=2),
+        interval=0.1, batch_size=50, max_attempts=3, retry_base=30,
+    )
+    kind = "outbox_test"
+    try:
+        async with AsyncSessionLocal() as db:
+            enqueue_email(db, kind, [f"ok{i}@example.com" for i in range(5)], "测试", "正文")
+            enqueue_email(db, kind, ["bounce@example.com", "flaky2@example.com"], "测试", "正文")
+            await db.commit()
+
+        before = len(server.messages)
+        await dispatcher.dispatch_once()
+        async with AsyncSessionLocal() as db:
+            rows = {r.recipient: r for r in (await db.execute(
+                select(DBNotification).where(DBNotification.kind == kind)
+            )).scalars()}
+        check(len(server.messages) - before == 5, "到期通知经连接池批量发送")
+        check(all(rows[f"ok{i}@example.com"].status == "sent" for i in range(5)), "发送成功的标记为 sent")
+        check(rows["bounce@example.com"].status == "failed", "永久失败的标记为 failed")
+        flaky = rows["flaky2@example.com"]
+        check(flaky.status == "pending" and flaky.attempts == 1 and flaky.last_error, "临时失败的保留待重试并记录错误")
+
+        check(await dispatcher.dispatch_once() == 0, "退避期内不会重复领取")
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(DBNotification).where(DBNotification.id == flaky.id).values(next_attempt_at=flaky.created_at)
+            )
+            await db.commit()
+        await dispatcher.dispatch_once()
+        async with AsyncSessionLocal() as db:
+            status = await db.scalar(select(DBNotification.status).where(DBNotification.id == flaky.id))
+        check(status == "sent", "到期后重试成功")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(DBNotification).where(DBNotification.kind == kind))
+            await db.commit()
+        await dispatcher.stop()
+        await engine.dispose()
+
+
+async def main(args) -> None:
+    server = StandInSMTPServer()
+    await server.start()
+    print(f"📮 SMTP 替身服务器：127.0.0.1:{server.port}")
+    try:
+        await check_pool(server)
+        if args.postgres:
+            await check_dispatcher(server)
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="通知投递测试 (本机 SMTP 替身服务器)")
+    parser.add_argument("--postgres", action="store_true", help="同时测试发件箱投递 (需可连接的数据库)")
+    asyncio.run(main(parser.parse_args()))
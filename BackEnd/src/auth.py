@@ -10,6 +10,9 @@ import bcrypt
 
 from .database import get_db, DBUser, DBProject
 from .config import settings  # 统一引用配置对象
+from .services.password_hasher import password_hasher
+from .services.presence import presence
+from .services.principal_cache import admin_key, client_key, principal_cache
 
 # ==========================================
 # 1. 配置初始化
@@ -21,9 +24,10 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 # ==========================================
 # 2. 密码哈希处理 (Bcrypt)
 # ==========================================
+# 同步版本供脚本使用；请求处理中请使用下方的 *_async 版本 (单次约 250ms，不可阻塞事件循环)
 def get_password_hash(password: str) -> str:
-    """生成密码哈希 - 务实建议：使用 12 轮加盐平衡性能与安全"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(12)).decode('utf-8')
+    """生成密码哈希 - 成本由 BCRYPT_ROUNDS 配置 (默认 12 轮)"""
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(settings.BCRYPT_ROUNDS)).decode('utf-8')
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -34,6 +38,22 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """哈希成本与当前配置不一致 ($2b$<cost>$...)"""
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
 # ==========================================
 # 3. JWT 核心逻辑
 # ==========================================
@@ -79,19 +99,30 @@ async def get_current_user(
             raise credentials_exception
 
         # --- 分支 A：管理员端 (Admin/Super) ---
+        # 行数据经主体缓存读取 (短 TTL，改密/删除/项目写入时立即失效)，is_active 每次仍校验
         if token_type == "admin":
-            result = await db.execute(select(DBUser).where(DBUser.username == subject))
-            user = result.scalar_one_or_none()
+            async def load_user():
+                result = await db.execute(select(DBUser).where(DBUser.username == subject))
+                return result.scalar_one_or_none()
+
+            user = await principal_cache.get(db, admin_key(subject), load_user)
 
             if user is None or not user.is_active:
                 raise credentials_exception
+            # 只记入内存，由 presence 后台批量写回 last_active / is_online
+            presence.touch(user.id)
             return user
 
         # --- 分支 B：业主端 (Client Portal) ---
         elif token_type == "client":
             # 业主 Token 的 sub 存储的是关联的项目 ID
-            result = await db.execute(select(DBProject).where(DBProject.id == int(subject)))
-            project = result.scalar_one_or_none()
+            project_id = int(subject)
+
+            async def load_project():
+                result = await db.execute(select(DBProject).where(DBProject.id == project_id))
+                return result.scalar_one_or_none()
+
+            project = await principal_cache.get(db, client_key(project_id), load_project)
 
             if not project:
                 raise credentials_exception
@@ -40,17 +40,24 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 720  # 默认 12 小时
 
-    # --- 4. 频率限制配置 (基于内存) ---
+    # --- 4. 频率限制配置 (滑动窗口) ---
     # 敏感接口限制（登录等）
     RATE_LIMIT_LOGIN: str = "5/minute"
     # 普通接口限制
     RATE_LIMIT_DEFAULT: str = "60/minute"
+    # 计数存储：sqlite:///路径 (默认，同机多 worker 共享，放在内存盘；目录不存在时退回系统临时目录)
+    #           postgresql (业务库，多机共享；每次检查额外占用一个连接池连接，启用前先用 scripts/bench_rate_limit.py 测量)
+    #           memory:// (仅本进程)
+    RATE_LIMIT_STORAGE: str = "sqlite:////dev/shm/yisan_rate_limit.db"
+    # 计数存储不可用时是否放行：普通接口默认放行；登录等防爆破接口默认拒绝 (返回 503)
+    RATE_LIMIT_FAIL_OPEN: bool = True
+    RATE_LIMIT_LOGIN_FAIL_OPEN: bool = False
 
     # --- 5. 跨域配置 (CORS) ---
     # 支持从 .env 以逗号分隔读取: http://localhost:3000,http://localhost:5173
     ALLOWED_ORIGINS: Union[List[str], str] = []
 
-    @field_validator("ALLOWED_ORIGINS", mode="before")
+    @field_validator("ALLOWED_ORIGINS", "MAIL_ADMIN_RECIPIENTS", mode="before")
     @classmethod
     def parse_allowed_origins(cls, v: Union[str, List[str]]) -> List[str]:
         if isinstance(v, list):
@@ -73,8 +80,101 @@ class Settings(BaseSettings):
     MAIL_PORT: int = 465
     MAIL_SERVER: str = "smtp.163.com"
     MAIL_FROM_NAME: str = "一三设计项目部"
+    # 465 端口为隐式 TLS；使用 587 端口时设置 MAIL_SSL_TLS=false、MAIL_STARTTLS=true
+    MAIL_SSL_TLS: bool = True
+    MAIL_STARTTLS: bool = False
+    # 管理端提醒 (新预约、业主验收) 的收件人，格式同 ALLOWED_ORIGINS；为空则不发送管理端提醒
+    MAIL_ADMIN_RECIPIENTS: Union[List[str], str] = []
 
-    # --- 7. 配置加载逻辑 ---
+    @property
+    def MAIL_ENABLED(self) -> bool:
+        return bool(self.MAIL_SERVER and self.MAIL_FROM)
+
+    # --- 7. 图片处理进程池 ---
+    # 0 表示按 CPU 核数启动子进程
+    IMAGE_WORKERS: int = 0
+    # 排队 + 处理中的任务上限，超出后直接返回 503，避免上传洪峰堆积
+    IMAGE_QUEUE_MAX: int = 16
+    # 响应式衍生图：允许的宽度档位与磁盘缓存上限
+    IMAGE_VARIANT_WIDTHS: List[int] = [320, 640, 1280, 1920]
+    IMAGE_VARIANT_CACHE_MAX_MB: int = 2048
+    # 单次上传的请求体上限 (MB)，超出直接 413
+    UPLOAD_MAX_MB: int = 50
+
+    # --- 8. 列表总数策略 ---
+    # exact: 精确 COUNT 并缓存；estimate: 无过滤的大表改用 pg_class 统计估算
+    COUNT_STRATEGY: str = "exact"
+    COUNT_ESTIMATE_MIN_ROWS: int = 100_000
+    # 精确总数缓存有效期 (秒)，写入时本进程立即失效，其他 worker 依赖此 TTL
+    COUNT_CACHE_TTL: int = 300
+
+    # --- 9. 公开接口响应缓存 ---
+    # 新鲜期 (秒)：期内直接返回缓存字节
+    RESPONSE_CACHE_TTL: int = 60
+    # 过期后仍可先返回旧内容并后台刷新的时长 (秒)
+    RESPONSE_CACHE_STALE_TTL: int = 600
+    # 缓存字节上限 (MB)，超出按 LRU 淘汰
+    RESPONSE_CACHE_MAX_MB: int = 64
+
+    # --- 10. 业主端项目详情 ---
+    # True：读取写入时维护的详情快照 (JSON 由 PostgreSQL 生成)；False：回退到 ORM + Pydantic 路径
+    PROJECT_DOCUMENT_SQL: bool = True
+
+    # --- 11. 项目动态推送 (SSE) ---
+    # postgres：LISTEN/NOTIFY 跨 worker 广播；local：仅本进程内分发 (单 worker / 开发环境)
+    PROJECT_EVENTS_BACKEND: str = "postgres"
+    # 空闲时的心跳间隔 (秒)，防止代理/负载均衡断开长连接
+    PROJECT_EVENTS_KEEPALIVE: int = 15
+    # 单个订阅者的待发送事件上限，积压超出后清空并通知前端重新拉取
+    PROJECT_EVENTS_QUEUE_MAX: int = 100
+    # 单个 worker 的订阅连接上限，超出返回 503
+    PROJECT_EVENTS_MAX_SUBSCRIBERS: int = 5000
+
+    # --- 12. 登录主体缓存 ---
+    # get_current_user 查到的用户/项目行缓存时长 (秒)，0 表示关闭
+    PRINCIPAL_CACHE_TTL: int = 30
+    PRINCIPAL_CACHE_MAX: int = 10_000
+
+    # --- 13. 密码哈希 (bcrypt) ---
+    # 新哈希使用的成本，登录成功时旧成本的哈希会自动升级/降级到此值
+    BCRYPT_ROUNDS: int = 12
+    # 专用线程数 (即同时计算的 bcrypt 上限) 与排队上限，超出返回 503
+    BCRYPT_WORKERS: int = 2
+    BCRYPT_QUEUE_MAX: int = 32
+
+    # --- 14. 管理员在线状态 ---
+    # 内存中的活动记录批量写回 users 的周期 (秒)
+    PRESENCE_FLUSH_INTERVAL: int = 5
+    # 超过该时长 (秒) 无活动视为离线
+    PRESENCE_ONLINE_WINDOW: int = 300
+
+    # --- 15. 数据导出 ---
+    # 服务端游标每次取回的行数 (也是响应的分块大小)；内存占用只与该值有关，与表大小无关
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # --- 16. 预约写入模式 ---
+    # direct：每次提交直接写库；buffered：先追加到本机 SQLite 预写缓冲 (fsync 后即返回 202)，后台批量入库
+    BOOKING_INGEST_MODE: str = "direct"
+    # 预写缓冲文件 (同机多 worker 共用一个文件)；留空则使用 data/booking_buffer.db
+    BOOKING_BUFFER_PATH: str = ""
+    # 后台入库周期 (秒) 与每批行数
+    BOOKING_FLUSH_INTERVAL: float = 1.0
+    BOOKING_FLUSH_BATCH: int = 500
+    # 等待写入缓冲的提交数上限，超过时直接 503
+    BOOKING_BUFFER_QUEUE_MAX: int = 2000
+
+    # --- 17. 通知发件箱 ---
+    # 后台投递周期 (秒) 与每批领取条数
+    MAIL_DISPATCH_INTERVAL: float = 2.0
+    MAIL_BATCH_SIZE: int = 50
+    # SMTP 连接池大小 (即并发发送数) 与连接最长空闲秒数 (服务器通常几分钟后断开空闲连接)
+    MAIL_POOL_SIZE: int = 2
+    MAIL_POOL_IDLE: int = 60
+    # 最多尝试次数；重试间隔 = MAIL_RETRY_BASE × 2^(已尝试次数-1)，上限 1 小时
+    MAIL_MAX_ATTEMPTS: int = 6
+    MAIL_RETRY_BASE: int = 30
+
+    # --- 配置加载逻辑 ---
     # 自动加载当前目录上级文件夹下的 .env 文件
     model_config = SettingsConfigDict(
         env_file=os.path.join(BASE_DIR, ".env"),
@@ -2,7 +2,7 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base, relationship
 from sqlalchemy.sql import func
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import BigInteger, Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 
 from .config import settings  # 统一引用已校验的配置
@@ -64,6 +64,11 @@ class DBProduct(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # 前台列表只查 active，游标分页按 (created_at, id) 倒序扫描
+    __table_args__ = (
+        Index("ix_products_active_created_at_id", "is_active", "created_at", "id"),
+    )
+
 
 class DBProject(Base):
     """业主项目表 (Client Portal 核心)"""
@@ -77,12 +82,15 @@ class DBProject(Base):
     current_progress = Column(Integer, default=0)
     status = Column(String(20), default="進行中")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # 项目数据版本：项目及其节点/日志/资源/媒体的任何写入都会刷新 (见 touch_project)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # 关联
-    nodes = relationship("DBNode", back_populates="project", cascade="all, delete-orphan")
-    logs = relationship("DBProjectLog", back_populates="project", cascade="all, delete-orphan")
+    # 列表按 id 升序输出，保证详情 JSON 稳定 (与 services/project_document 的 SQL 路径一致)
+    nodes = relationship("DBNode", back_populates="project", cascade="all, delete-orphan", order_by="DBNode.id")
+    logs = relationship("DBProjectLog", back_populates="project", cascade="all, delete-orphan", order_by="DBProjectLog.id")
     medias = relationship("DBProjectMedia", back_populates="project", cascade="all, delete-orphan")
-    resources = relationship("DBProjectResource", back_populates="project", cascade="all, delete-orphan")
+    resources = relationship("DBProjectResource", back_populates="project", cascade="all, delete-orphan", order_by="DBProjectResource.id")
 
 
 class DBNode(Base):
@@ -96,6 +104,8 @@ class DBNode(Base):
     completed_at = Column(DateTime(timezone=True))
 
     project = relationship("DBProject", back_populates="nodes")
+    # 节点下的施工记录 (只读：日志归属由 project_logs.node_id 决定，删除节点时数据库置空)
+    logs = relationship("DBProjectLog", order_by="DBProjectLog.id", viewonly=True)
 
 
 class DBProjectLog(Base):
@@ -112,6 +122,11 @@ class DBProjectLog(Base):
 
     project = relationship("DBProject", back_populates="logs")
 
+    # 日志流按 (created_at, id) 倒序游标分页，项目内扫描
+    __table_args__ = (
+        Index("ix_project_logs_project_created_at_id", "project_id", "created_at", "id"),
+    )
+
 
 class DBProjectMedia(Base):
     """项目现场媒体库 (图片/视频)"""
@@ -139,6 +154,16 @@ class DBProjectResource(Base):
     project = relationship("DBProject", back_populates="resources")
 
 
+class DBProjectSnapshot(Base):
+    """业主端项目详情快照 (写入时维护，读取只需一次主键查询)"""
+    __tablename__ = "project_snapshots"
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    # 与 ProjectResponse 响应逐字节一致的 JSON 文本 (用 Text 而非 JSONB，避免重排键序和空白)
+    document = Column(Text, nullable=False)
+    # 快照版本，每次维护都会刷新，用作 ETag
+    version = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
 class DBCase(Base):
     """官方案例展示表"""
     __tablename__ = "cases"
@@ -159,6 +184,17 @@ class DBCase(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # 列表排序与游标分页：(created_at, id) 复合索引，倒序扫描同样可用
+    # 分类/风格筛选使用 @> 包含查询：jsonb_path_ops GIN 索引体积更小、查找更快
+    __table_args__ = (
+        Index("ix_cases_created_at_id", "created_at", "id"),
+        Index("ix_cases_categories_gin", "categories", postgresql_using="gin",
+              postgresql_ops={"categories": "jsonb_path_ops"}),
+        Index("ix_cases_styles_gin", "styles", postgresql_using="gin",
+              postgresql_ops={"styles": "jsonb_path_ops"}),
+        Index("ix_cases_year", "year"),
+    )
+
 
 class DBBooking(Base):
     """客户预约/咨询表"""
@@ -173,6 +209,70 @@ class DBBooking(Base):
     status = Column(String(20), default="pending")
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # 缓冲写入模式下的提交编号：重复入库 (重启、多 worker 重试) 时按唯一约束去重；直接写入时为空
+    ingest_id = Column(String(32), unique=True)
+
+    # 收件箱游标分页：(created_at, id) 倒序；按状态筛选走 (status, created_at, id)；
+    # 未读筛选走部分索引 (只含未读行，体积随处理进度自然收缩)
+    __table_args__ = (
+        Index("ix_bookings_created_at_id", "created_at", "id"),
+        Index("ix_bookings_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_bookings_unread_created_at_id", "created_at", "id",
+              postgresql_where=text("is_read = false")),
+    )
+
+
+class DBBookingStats(Base):
+    """
+    预约统计 (分槽计数表，id 为 1..N，读取时求和，见 services/booking_stats.py)
+    未读数由创建/更新/删除预约的事务同步增减，角标轮询不再 COUNT(*)
+    """
+    __tablename__ = "booking_stats"
+    id = Column(Integer, primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0)
+
+
+class DBNotification(Base):
+    """
+    通知发件箱 (见 services/notifications.py)
+    与业务数据在同一事务中写入，由后台任务通过 SMTP 投递；每个收件人一行
+    """
+    __tablename__ = "notification_outbox"
+    id = Column(BigInteger, primary_key=True)
+    kind = Column(String(50), nullable=False)  # booking_created, project_reply, node_confirmed
+    recipient = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True))
+
+    # 投递任务只扫描待发送的行：部分索引随发送完成自然收缩
+    __table_args__ = (
+        Index("ix_notification_outbox_due", "next_attempt_at", "id",
+              postgresql_where=text("status = 'pending'")),
+    )
+
+
+class DBRateLimitCounter(Base):
+    """
+    接口限频计数 (滑动窗口，见 services/rate_limit.py，RATE_LIMIT_STORAGE=postgresql 时使用)
+    UNLOGGED：不写 WAL，崩溃后清空可以接受
+    """
+    __tablename__ = "rate_limit_counters"
+    key = Column(String(255), primary_key=True)
+    window_start = Column(BigInteger, nullable=False)  # 当前窗口起点 (Unix 秒)
+    prev_count = Column(Integer, nullable=False, default=0)
+    curr_count = Column(Integer, nullable=False, default=0)
+    expires_at = Column(BigInteger, nullable=False)  # 超过该时间 (Unix 秒) 的计数可清理
+
+    __table_args__ = (
+        Index("ix_rate_limit_counters_expires_at", "expires_at"),
+        {"prefixes": ["UNLOGGED"]},
+    )
 
 
 # ==========================================
@@ -5,14 +5,8 @@ from pathlib import Path
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 
-# --- 1. 引入频率限制组件 ---
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-
 # 1. 路径与环境初始化
 BASE_DIR = Path(__file__).resolve().parent.parent
 if str(BASE_DIR) not in sys.path:
@@ -21,17 +15,27 @@ if str(BASE_DIR) not in sys.path:
 load_dotenv()
 from .config import settings
 from .middleware.error_handler import error_handler_middleware
+from .middleware.upload_limit import UploadSizeLimitMiddleware
+from .utils.static_files import UploadFiles
+# --- 1. 引入频率限制组件 ---
+from .services.rate_limit import limiter
 
 IS_PROD = os.getenv("ENV") == "production"
 
-# --- 2. 初始化限频器 (内存模式) ---
-# key_func=get_remote_address 表示根据客户端 IP 进行限制
-limiter = Limiter(key_func=get_remote_address)
+# --- 2. 限频器 ---
+# 按 (接口, 客户端 IP) 滑动窗口计数；存储由 RATE_LIMIT_STORAGE 决定，多 worker 共享同一份计数
+# 超限时直接抛出 429 (带 Retry-After)，无需额外注册异常处理器
 
 # --- 3. 异步生命周期管理 ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     from .database import engine, Base
+    from .services.booking_ingest import booking_buffer
+    from .services.image_processor import image_processor
+    from .services.notifications import notification_dispatcher
+    from .services.password_hasher import password_hasher
+    from .services.presence import presence
+    from .services.project_events import project_events
     try:
         # 确保物理上传目录在启动前存在
         upload_path = BASE_DIR / "public" / "uploads"
@@ -42,27 +46,52 @@ async def lifespan(app: FastAPI):
             await conn.run_sync(Base.metadata.create_all)
         print("🚀 [Backend] Database connected & Schema verified")
 
+        # 图片处理进程池 (上传时的 Pillow 重计算不再阻塞事件循环)
+        image_processor.start()
+
+        # 项目动态推送：每个 worker 一条 LISTEN 连接 (断线自动重连，不阻塞启动)
+        await project_events.start()
+
+        # 管理员在线状态：后台批量写回
+        presence.start()
+
+        # 预约缓冲入库：缓冲模式下启动；切回直接写入后，若缓冲文件仍在也继续入库剩余记录
+        if settings.BOOKING_INGEST_MODE == "buffered" or booking_buffer.path.exists():
+            booking_buffer.start()
+
+        # 通知发件箱投递 (配置了 MAIL_SERVER / MAIL_FROM 时启动)
+        if settings.MAIL_ENABLED:
+            notification_dispatcher.start()
+
         yield
     finally:
+        await notification_dispatcher.stop()
+        await booking_buffer.stop()
+        await presence.stop()
+        await project_events.stop()
+        image_processor.shutdown()
+        password_hasher.shutdown()
         # 优雅关闭连接池
         await engine.dispose()
         print("🛑 [Backend] Database connection closed")
 
-# --- 4. 实例化应用并挂载限频器 ---
+# --- 4. 实例化应用 ---
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     lifespan=lifespan
 )
 
-# 将限频器状态绑定到 app
-app.state.limiter = limiter
-# 注册限频触发时的异常处理器 (自动返回 429 Too Many Requests)
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # --- 5. 中间件配置 ---
 app.middleware("http")(error_handler_middleware)
 
+# 上传接口的请求体上限：在读取请求体之前/过程中拦截超大文件 (需在 CORS 之前注册，413 才带跨域头)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_bytes=settings.UPLOAD_MAX_MB * 1024 * 1024,
+    paths=["/api/cases/upload"],
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS if IS_PROD else ["*"],
@@ -72,7 +101,7 @@ app.add_middleware(
 )
 
 # --- 6. 业务路由挂载 ---
-from .routers import cases, users, auth, products, client, admin_projects
+from .routers import cases, users, auth, products, client, admin_projects, metrics, media, exports
 from .routers.bookings import router as bookings_router
 
 # 注意：具体的接口限频将在各路由文件中通过 @limiter.limit 装饰器实现
@@ -83,14 +112,19 @@ app.include_router(cases.router, prefix="/api/cases", tags=["Cases"])
 app.include_router(users.router, prefix="/api/users", tags=["Users"])
 app.include_router(products.router, prefix="/api/products", tags=["Products"])
 app.include_router(bookings_router, prefix="/api/bookings", tags=["Bookings"])
+app.include_router(metrics.router, prefix="/api/admin/metrics", tags=["Admin Metrics"])
+app.include_router(exports.router, prefix="/api/admin/exports", tags=["Admin Exports"])
 
 # --- 7. 静态文件挂载 ---
+# 衍生图路由需先于 /uploads 静态挂载注册，否则会被 StaticFiles 截获
+app.include_router(media.router, prefix="/uploads", tags=["Media"])
 upload_dir = str(BASE_DIR / "public" / "uploads")
-app.mount("/uploads", StaticFiles(directory=upload_dir), name="uploads")
+# UploadFiles：immutable 缓存头 + 强 ETag/304 + Range (项目视频) + 预压缩副本
+app.mount("/uploads", UploadFiles(directory=upload_dir), name="uploads")
 
 # --- 8. 基础接口与限频示例 ---
 @app.get("/api/health")
-@limiter.limit("20/minute")  # 内存限频示例：每分钟允许 20 次访问
+@limiter.limit("20/minute")  # 限频示例：每个 IP 每分钟允许 20 次访问
 async def health_check(request: Request):
     return {
         "status": "healthy",
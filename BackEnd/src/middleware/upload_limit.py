@@ -0,0 +1,66 @@
+# BackEnd/src/middleware/upload_limit.py
+import json
+from typing import Iterable
+
+from fastapi import HTTPException, status
+
+
+class UploadSizeLimitMiddleware:
+    """
+    上传请求体大小限制 (纯 ASGI 中间件)
+    务实逻辑：
+    1. 声明了 Content-Length 且超限：不读取请求体，直接返回 413；
+    2. 分块传输或声明不实：边接收边计数，超限立即中断解析并返回 413。
+    仅作用于配置的上传路径，不影响普通 JSON 接口。
+    """
+
+    def __init__(self, app, max_bytes: int, paths: Iterable[str]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = tuple(paths)
+
+    def _too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"文件过大，最大允许 {self.max_bytes // (1024 * 1024)}MB / Payload too large",
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    declared = 0
+                if declared > self.max_bytes:
+                    body = json.dumps({"detail": self._too_large().detail}, ensure_ascii=False).encode("utf-8")
+                    await send({
+                        "type": "http.response.start",
+                        "status": status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        "headers": [
+                            (b"content-type", b"application/json"),
+                            (b"content-length", str(len(body)).encode()),
+                            (b"connection", b"close"),
+                        ],
+                    })
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # FastAPI 解析表单时会原样抛出 HTTPException，最终由异常处理器返回 413
+                    raise self._too_large()
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -5,6 +5,8 @@ from datetime import datetime
 from typing import Optional, List, Any, TypeVar, Generic
 from enum import Enum
 
+from .services.image_variants import build_srcset
+
 T = TypeVar("T")
 
 # ==========================================
@@ -46,6 +48,14 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int
     pages: int
     size: int
+    total_is_exact: bool = True  # False 表示 total 来自数据库统计信息估算
+
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    """游标分页：按 (created_at, id) 翻页，next_cursor 为空表示已到末页"""
+    items: List[T]
+    size: int
+    next_cursor: Optional[str] = None
+    has_more: bool = False
 
 # ==========================================
 # 3. 用户与认模型
@@ -100,6 +110,19 @@ class CaseImageSchema(BaseModel):
             return {"url": data, "alt": "Yisan Design", "is_primary": True}
         return data
 
+class CaseImageResponse(CaseImageSchema):
+    """输出模型：附带响应式衍生图 srcset (仅输出，不写回 JSONB)"""
+
+    @computed_field
+    @property
+    def srcset(self) -> Optional[str]:
+        return build_srcset(self.url, "webp")
+
+    @computed_field
+    @property
+    def srcset_avif(self) -> Optional[str]:
+        return build_srcset(self.url, "avif")
+
 class CaseBase(BaseModel):
     slug: str = Field(..., pattern="^[a-z0-9-]+$")
     title: str
@@ -119,10 +142,16 @@ class CaseCreate(CaseBase):
 
 class CaseResponse(CaseBase):
     id: int
+    images: List[CaseImageResponse] = []
     created_at: datetime
     updated_at: Optional[datetime] = None
     model_config = ConfigDict(from_attributes=True)
 
+class CaseDetailResponse(CaseResponse):
+    """详情输出：列表卡片之外再带上长文本描述 (列表查询不加载这两列)"""
+    description: Optional[str] = None
+    detailed_description: Optional[str] = None
+
 class CategoryInfo(BaseModel):
     """分类基础信息"""
     slug: str
@@ -219,12 +248,13 @@ class AdminProjectResponse(ProjectResponse):
 # ==========================================
 
 class BookingCreate(BaseModel):
-    user_name: str = Field(..., min_length=1)
-    contact_info: str = Field(..., min_length=1)
-    project_type: str
-    budget: Optional[str] = None
+    # 长度上限与 bookings 表一致：超长内容在受理时即返回 422 (缓冲模式下不会在入库阶段才失败)
+    user_name: str = Field(..., min_length=1, max_length=100)
+    contact_info: str = Field(..., min_length=1, max_length=100)
+    project_type: str = Field(..., max_length=50)
+    budget: Optional[str] = Field(None, max_length=50)
     message: Optional[str] = None
-    source_url: Optional[str] = None
+    source_url: Optional[str] = Field(None, max_length=255)
 
 class BookingResponse(BookingCreate):
     id: int
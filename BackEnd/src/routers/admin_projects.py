@@ -4,16 +4,26 @@ import uuid
 import shutil
 from pathlib import Path
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status, Body
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, status as http_status, Body
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, update, delete
+from sqlalchemy import select, func, update
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel, Field
 
-from ..database import get_db, DBProject, DBNode, DBProjectMedia, DBProjectLog, DBUser, DBProjectResource
+from ..database import get_db, DBProject, DBProjectMedia, DBProjectLog, DBUser, DBProjectResource
 from ..dependencies.permissions import admin_required
+from ..services.principal_cache import client_key, invalidate_principal
+from ..services.node_sync import sync_nodes
+from ..services.notifications import notify_project_reply
+from ..services.project_events import dump_model, project_event_stream, publish_event
+from ..services.project_logs import fetch_log_feed
+from ..services.project_snapshot import rebuild_snapshot, update_snapshot
+from ..services.project_version import touch_project
 from ..models import (
     AdminProjectResponse,
+    CursorPaginatedResponse,
+    NodeStatus,
+    ProjectLogResponse,
     ProjectResponse,
     ProjectResourceResponse
 )
@@ -48,8 +58,15 @@ class ProjectResourceCreate(BaseModel):
     url: str
 
 
+class NodeSyncItem(BaseModel):
+    id: Optional[int] = None  # 已有节点的 id；缺省时按节点名称配对
+    node_name: str = Field(..., min_length=1, max_length=100)
+    target_percent: int = 0
+    status: NodeStatus = NodeStatus.PENDING
+
+
 class SyncProgressRequest(BaseModel):
-    nodes: List[dict]
+    nodes: List[NodeSyncItem]
     current_progress: int
 
 
@@ -111,6 +128,39 @@ async def get_project_detail(
     return project
 
 
+@router.get("/{project_id}/logs", response_model=CursorPaginatedResponse[ProjectLogResponse])
+async def get_project_logs(
+        project_id: int,
+        cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor，首页不传"),
+        since_id: Optional[int] = Query(None, ge=0, description="增量轮询：返回 id 更大的日志及近期迟提交的日志，前端按 id 去重"),
+        node_id: Optional[int] = None,
+        sender_type: Optional[str] = Query(None, pattern="^(admin|client)$"),
+        size: int = Query(20, ge=1, le=100),
+        db: AsyncSession = Depends(get_db),
+        _: DBUser = Depends(admin_required)
+):
+    """管理端项目日志流 (游标分页 / since_id 增量轮询)"""
+    if not await db.scalar(select(DBProject.id).where(DBProject.id == project_id)):
+        raise HTTPException(status_code=404, detail="项目不存在")
+
+    return await fetch_log_feed(
+        db, project_id,
+        cursor=cursor, since_id=since_id, node_id=node_id, sender_type=sender_type, size=size
+    )
+
+
+@router.get("/{project_id}/events")
+async def subscribe_project_events(
+        project_id: int,
+        db: AsyncSession = Depends(get_db),
+        _: DBUser = Depends(admin_required)
+):
+    """管理端项目动态推送 (SSE)：新日志、节点状态、进度、新资源"""
+    if not await db.scalar(select(DBProject.id).where(DBProject.id == project_id)):
+        raise HTTPException(status_code=404, detail="项目不存在")
+    return project_event_stream(project_id)
+
+
 # ==========================================
 # 3. 施工节点管理 (数字化工地核心)
 # ==========================================
@@ -122,28 +172,37 @@ async def sync_project_nodes(
         db: AsyncSession = Depends(get_db),
         _: DBUser = Depends(admin_required)
 ):
-    """同步施工节点进度"""
-    # 1. 更新主进度
-    await db.execute(
-        update(DBProject)
-        .where(DBProject.id == project_id)
-        .values(current_progress=data.current_progress)
-    )
-
-    # 2. 处理节点更新（由于逻辑较重，这里采用删除重建或按 ID 更新，务实选择全量同步）
-    await db.execute(delete(DBNode).where(DBNode.project_id == project_id))
-
-    for node_data in data.nodes:
-        new_node = DBNode(
-            project_id=project_id,
-            node_name=node_data.get("node_name"),
-            target_percent=node_data.get("target_percent"),
-            status=node_data.get("status", "pending")
-        )
-        db.add(new_node)
+    """
+    同步施工节点进度。
+    务实：与现有节点按 id / 名称做差异，只对变化的行批量 INSERT/UPDATE/DELETE，
+    节点 id 与施工日志的关联保持不变；没有任何变化时不产生写入。
+    """
+    # 1. 锁住项目行：同一项目的并发同步串行执行，差异基于最新数据计算
+    project = (await db.execute(
+        select(DBProject.current_progress).where(DBProject.id == project_id).with_for_update()
+    )).first()
+    if project is None:
+        raise HTTPException(status_code=404, detail="项目不存在")
 
+    # 2. 节点差异同步
+    changes = await sync_nodes(db, project_id, [node.model_dump(mode="json") for node in data.nodes])
+    nodes_changed = bool(changes["created"] or changes["updated"] or changes["deleted"])
+    progress_changed = project.current_progress != data.current_progress
+
+    if nodes_changed or progress_changed:
+        if progress_changed:
+            await db.execute(
+                update(DBProject)
+                .where(DBProject.id == project_id)
+                .values(current_progress=data.current_progress)
+            )
+        await touch_project(db, project_id)
+        # 节点增删涉及多处嵌套文档：快照直接按源表重建
+        await rebuild_snapshot(db, project_id)
+        # 结构性变化不逐条推送，前端收到后重新拉取详情
+        await publish_event(db, project_id, "nodes", {"current_progress": data.current_progress, **changes})
     await db.commit()
-    return {"status": "success"}
+    return {"status": "success", "progress_changed": progress_changed, **changes}
 
 
 # ==========================================
@@ -160,6 +219,9 @@ async def add_project_resource(
     """关联 VR 全景或施工周报链接"""
     new_res = DBProjectResource(project_id=project_id, **res.model_dump())
     db.add(new_res)
+    await touch_project(db, project_id)
+    await update_snapshot(db, project_id, resource=new_res)
+    await publish_event(db, project_id, "resource", await dump_model(db, ProjectResourceResponse, new_res))
     await db.commit()
     await db.refresh(new_res)
     return new_res
@@ -181,6 +243,11 @@ async def admin_reply(
         node_id=req.node_id
     )
     db.add(new_log)
+    await touch_project(db, project_id)
+    await update_snapshot(db, project_id, log=new_log)
+    await publish_event(db, project_id, "log", await dump_model(db, ProjectLogResponse, new_log))
+    # 业主邮件提醒写入发件箱，随日志一起提交，由后台投递
+    await notify_project_reply(db, project_id, req.content, current_user.username)
     await db.commit()
     return {"status": "success"}
 
@@ -198,5 +265,6 @@ async def delete_project(
         raise HTTPException(status_code=404, detail="项目不存在")
 
     await db.delete(project)
+    await invalidate_principal(db, client_key(project_id))
     await db.commit()
     return {"status": "success"}
\ No newline at end of file
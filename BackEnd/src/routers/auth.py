@@ -14,7 +14,14 @@ from ..models import (
     ClientLoginRequest,
     Token  # 引用我们新定义的 Token 统一模型
 )
-from ..auth import verify_password, create_access_token, get_current_user, get_password_hash
+from ..auth import (
+    create_access_token,
+    get_current_user,
+    get_password_hash_async,
+    password_needs_rehash,
+    verify_password_async
+)
+from ..services.principal_cache import admin_key, invalidate_principal
 # 从 main 导入限频实例
 from ..main import limiter
 
@@ -25,7 +32,7 @@ router = APIRouter(tags=["Authentication"])
 # 1. 管理端登录 (适配 LoginPage.tsx)
 # ==========================================
 @router.post("/login", response_model=Token)
-@limiter.limit(settings.RATE_LIMIT_LOGIN)  # 🛡️ IP 频率限制：5次/分钟
+@limiter.limit(settings.RATE_LIMIT_LOGIN, fail_open=settings.RATE_LIMIT_LOGIN_FAIL_OPEN)  # 🛡️ IP 频率限制：5次/分钟
 async def login_for_access_token(
         request: Request,  # limiter 必须接收 request
         form_data: OAuth2PasswordRequestForm = Depends(),
@@ -40,7 +47,7 @@ async def login_for_access_token(
     user = result.scalar_one_or_none()
 
     # 务实安全：不区分“用户名不存在”还是“密码错误”，统一返回凭证无效
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="用户名或密码不正确 / Invalid credentials"
@@ -49,6 +56,12 @@ async def login_for_access_token(
     if not user.is_active:
         raise HTTPException(status_code=403, detail="账号已被禁用")
 
+    # 透明升级：旧成本的哈希在密码校验通过时按当前 BCRYPT_ROUNDS 重算
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await get_password_hash_async(form_data.password)
+        await invalidate_principal(db, admin_key(user.username))
+        await db.commit()
+
     # 签发 Token
     access_token = create_access_token(data={"sub": user.username, "type": "admin"})
 
@@ -63,7 +76,7 @@ async def login_for_access_token(
 # 2. 业主端登录 (适配 ClientLoginPage.tsx)
 # ==========================================
 @router.post("/client/login")
-@limiter.limit(settings.RATE_LIMIT_LOGIN)  # 🛡️ 核心：防止 6 位访问码被爆破
+@limiter.limit(settings.RATE_LIMIT_LOGIN, fail_open=settings.RATE_LIMIT_LOGIN_FAIL_OPEN)  # 🛡️ 核心：防止 6 位访问码被爆破
 async def client_login(
         request: Request,
         data: ClientLoginRequest,
@@ -112,7 +125,7 @@ async def read_users_me(current_user: DBUser = Depends(get_current_user)):
 
 
 @router.post("/change-password")
-@limiter.limit("3/hour")  # 修改密码操作给予极高的保护限制
+@limiter.limit("3/hour", fail_open=settings.RATE_LIMIT_LOGIN_FAIL_OPEN)  # 修改密码操作给予极高的保护限制
 async def change_password(
         request: Request,
         data: ChangePasswordRequest,
@@ -122,10 +135,11 @@ async def change_password(
     """
     管理端用户修改密码逻辑
     """
-    if not verify_password(data.old_password, current_user.hashed_password):
+    if not await verify_password_async(data.old_password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="原密码错误")
 
-    current_user.hashed_password = get_password_hash(data.new_password)
+    current_user.hashed_password = await get_password_hash_async(data.new_password)
+    await invalidate_principal(db, admin_key(current_user.username))
     await db.commit()
 
     return {"status": "success", "message": "密码修改成功"}
\ No newline at end of file
@@ -1,14 +1,21 @@
 # BackEnd/src/routers/bookings.py
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Body
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import desc
-from typing import List, Optional
+from typing import List, Optional, Union
 from pydantic import BaseModel
 
+from ..config import settings
 from ..database import get_db, DBBooking, DBUser
 from ..dependencies.permissions import admin_required
-from ..models import BookingCreate, BookingResponse
+from ..models import BookingCreate, BookingResponse, CursorPaginatedResponse
+from ..services.booking_ingest import booking_buffer
+from ..services.booking_stats import adjust_unread, get_unread_count, recount_unread
+from ..services.notifications import notify_booking_created
+from ..services.pagination import fetch_cursor_page
 
 router = APIRouter(tags=["Bookings"])
 
@@ -35,7 +42,21 @@ async def create_booking(
     """
     提交预约申请。
     适配前端：BookingForm.tsx
+    缓冲模式 (BOOKING_INGEST_MODE=buffered)：写入本机预写缓冲后立即返回 202，后台批量入库，
+    受理过程不占用数据库连接；记录 id 入库后才分配，响应中返回 ingest_id。
     """
+    if settings.BOOKING_INGEST_MODE == "buffered":
+        try:
+            ingest_id = await booking_buffer.submit(booking_in.model_dump())
+        except HTTPException:
+            raise
+        except Exception:
+            raise HTTPException(status_code=500, detail="提交失败，请稍后重试")
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"status": "accepted", "ingest_id": ingest_id},
+        )
+
     db_booking = DBBooking(**booking_in.model_dump())
 
     # 强制初始化初始状态
@@ -44,6 +65,11 @@ async def create_booking(
 
     db.add(db_booking)
     try:
+        # 未读计数、管理端提醒 (发件箱) 与预约记录在同一事务中提交；
+        # 计数最后调整，行锁只持有到紧随其后的提交
+        notify_booking_created(db, booking_in.model_dump())
+        await db.flush()
+        await adjust_unread(db, 1)
         await db.commit()
         await db.refresh(db_booking)
         return db_booking
@@ -56,18 +82,62 @@ async def create_booking(
 # 3. 管理端：查询与状态维护
 # ==========================================
 
-@router.get("/", response_model=List[BookingResponse])
+@router.get("/", response_model=Union[List[BookingResponse], CursorPaginatedResponse[BookingResponse]])
 async def list_bookings(
+        status_filter: Optional[str] = Query(None, alias="status", max_length=20),
+        is_read: Optional[bool] = None,
+        created_from: Optional[date] = Query(None, description="提交日期起 (含)"),
+        created_to: Optional[date] = Query(None, description="提交日期止 (含)"),
+        cursor: Optional[str] = Query(None, description="传入即启用游标分页，首页传空字符串"),
+        size: int = Query(20, ge=1, le=100),
         db: AsyncSession = Depends(get_db),
         _: DBUser = Depends(admin_required)
 ):
-    """获取所有预约记录 (按时间倒序)"""
-    result = await db.execute(
-        select(DBBooking).order_by(desc(DBBooking.created_at))
-    )
+    """
+    预约收件箱 (按时间倒序)
+    务实逻辑：传入 cursor 时按 (created_at, id) 游标分页，每页只扫描 size + 1 行；
+    不传 cursor 时保持旧行为 (返回全部匹配记录)，兼容现有管理端。
+    """
+    if created_from and created_to and created_from > created_to:
+        raise HTTPException(status_code=400, detail="日期范围无效：created_from 晚于 created_to")
+
+    query = select(DBBooking)
+    if status_filter:
+        query = query.where(DBBooking.status == status_filter)
+    if is_read is not None:
+        query = query.where(DBBooking.is_read == is_read)
+    if created_from:
+        query = query.where(DBBooking.created_at >= created_from)
+    if created_to:
+        query = query.where(DBBooking.created_at < created_to + timedelta(days=1))
+
+    if cursor is not None:
+        return await fetch_cursor_page(db, query, DBBooking.created_at, DBBooking.id, cursor, size)
+
+    result = await db.execute(query.order_by(desc(DBBooking.created_at), desc(DBBooking.id)))
     return result.scalars().all()
 
 
+@router.get("/unread-count")
+async def get_bookings_unread_count(
+        db: AsyncSession = Depends(get_db),
+        _: DBUser = Depends(admin_required)
+):
+    """未读预约数 (管理端角标轮询)：读取计数行，不做 COUNT(*)"""
+    return {"unread": await get_unread_count(db)}
+
+
+@router.post("/unread-count/recount")
+async def recount_bookings_unread(
+        db: AsyncSession = Depends(get_db),
+        _: DBUser = Depends(admin_required)
+):
+    """按预约表重新统计未读数 (计数与实际不符时人工校准)"""
+    unread = await recount_unread(db)
+    await db.commit()
+    return {"unread": unread}
+
+
 @router.put("/{booking_id}")
 async def update_booking_status(
         booking_id: int,
@@ -79,12 +149,15 @@ async def update_booking_status(
     更新预约状态或标记已读。
     务实联动：如果状态设为 completed，自动标记为已读。
     """
-    result = await db.execute(select(DBBooking).where(DBBooking.id == booking_id))
+    # 行锁：并发修改同一条预约时，未读数的增减不会重复计算
+    result = await db.execute(select(DBBooking).where(DBBooking.id == booking_id).with_for_update())
     booking = result.scalar_one_or_none()
 
     if not booking:
         raise HTTPException(status_code=404, detail="记录不存在")
 
+    was_unread = not booking.is_read
+
     # 更新字段
     booking.status = data.status
     if data.is_read is not None:
@@ -94,6 +167,7 @@ async def update_booking_status(
     if data.status == "completed":
         booking.is_read = True
 
+    await adjust_unread(db, int(not booking.is_read) - int(was_unread))
     await db.commit()
     return {"status": "success", "current_status": booking.status}
 
@@ -105,12 +179,14 @@ async def delete_booking(
         _: DBUser = Depends(admin_required)
 ):
     """删除无效或垃圾预约记录"""
-    result = await db.execute(select(DBBooking).where(DBBooking.id == booking_id))
+    result = await db.execute(select(DBBooking).where(DBBooking.id == booking_id).with_for_update())
     booking = result.scalar_one_or_none()
 
     if not booking:
         raise HTTPException(status_code=404, detail="记录不存在")
 
+    if not booking.is_read:
+        await adjust_unread(db, -1)
     await db.delete(booking)
     await db.commit()
     return None
\ No newline at end of file
@@ -1,116 +1,156 @@
 # BackEnd/src/routers/cases.py
-import io
-import uuid
 import math
 from pathlib import Path
-from typing import List, Optional
-from PIL import Image
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Query
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, desc
+from sqlalchemy import desc
 
 from ..database import get_db, DBCase, DBUser
 from ..config import settings
 from ..dependencies.permissions import admin_required
 from ..services.category_service import CategoryService # 必须引入
+from ..services.image_processor import image_processor, process_case_image
+from ..services.case_query import apply_case_filters, case_list_query
+from ..services.pagination import fetch_cursor_page
+from ..services.count_cache import count_cache
+from ..services.response_cache import response_cache, cache_key, dump_json
+from ..utils.http_cache import conditional_json_response
+from ..utils.upload_stream import spool_upload_to_disk
 from ..models import (
     CaseCreate,
     CaseResponse,
+    CaseDetailResponse,
     CaseCategoryResponse,
     PaginatedResponse,
+    CursorPaginatedResponse,
     CaseImageSchema
 )
 
-# 安全配置：防御像素洪流攻击
-Image.MAX_IMAGE_PIXELS = 100_000_000
-
 router = APIRouter(tags=["Cases"])
 
 # 定位上传目录
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 UPLOAD_DIR = BASE_DIR / "public" / "uploads"
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+# 上传临时文件目录：与 uploads 同盘，避免跨设备拷贝
+UPLOAD_TMP_DIR = BASE_DIR / "public" / ".upload_tmp"
 
 
 # ==========================================
 # 1. 静态查询接口
 # ==========================================
 
+async def _render_categories(_: AsyncSession) -> bytes:
+    return dump_json(CaseCategoryResponse, {"categories": CategoryService.get_all_categories()})
+
+
 @router.get("/categories", response_model=CaseCategoryResponse)
-async def get_categories():
+async def get_categories(request: Request, db: AsyncSession = Depends(get_db)):
     """
     获取作品分类列表
     务实：直接调用 CategoryService，确保前后端 Slug 对应
     """
-    return {"categories": CategoryService.get_all_categories()}
+    entry = await response_cache.get_or_render(cache_key(request), "cases", _render_categories, db)
+    return conditional_json_response(request.headers, entry.body, entry.etag, entry.last_modified)
 
 
 # ==========================================
 # 2. 公开查询接口 (支持分页与分类过滤)
 # ==========================================
 
-@router.get("/", response_model=PaginatedResponse[CaseResponse])
-@router.get("", response_model=PaginatedResponse[CaseResponse])
-async def list_cases(
-        page: int = Query(1, ge=1),
-        size: int = Query(9, ge=1, le=100),
-        category: Optional[str] = None,
-        featured: Optional[bool] = None,
-        db: AsyncSession = Depends(get_db)
-):
-    """获取作品列表 (支持分页、分类、精选过滤)"""
-    query = select(DBCase)
-
-    if category:
-        # 核心逻辑：自动将前端 Slug 转换为后端 Label
-        backend_val = CategoryService.frontend_to_backend(category) or category
-        query = query.where(DBCase.categories.contains([backend_val]))
-
-    if featured is not None:
-        query = query.where(DBCase.featured == featured)
-
-    # 计算总数
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+async def _render_case_list(
+        db: AsyncSession,
+        page: int,
+        size: int,
+        categories: Optional[List[str]],
+        styles: Optional[List[str]],
+        year: Optional[int],
+        featured: Optional[bool],
+        cursor: Optional[str]
+) -> bytes:
+    """查询并序列化作品列表 (供响应缓存调用，也用于后台刷新)"""
+    # 分类/风格走 jsonb_path_ops GIN 索引，年份走 btree 索引
+    query, filter_key = apply_case_filters(case_list_query(), categories, styles, year, featured)
+
+    # 游标模式：无限滚动/爬虫深翻页不再随 OFFSET 变慢，也不需要总数
+    if cursor is not None:
+        data = await fetch_cursor_page(db, query, DBCase.created_at, DBCase.id, cursor, size)
+        return dump_json(CursorPaginatedResponse[CaseResponse], data)
+
+    # 计算总数 (按过滤条件缓存；无过滤时可用统计估算)
+    total, total_is_exact = await count_cache.count(
+        db, "cases", filter_key, query,
+        allow_estimate=filter_key == ((), (), None, None)
+    )
 
     # 分页查询
-    query = query.order_by(desc(DBCase.created_at)).offset((page - 1) * size).limit(size)
+    query = query.order_by(desc(DBCase.created_at), desc(DBCase.id)).offset((page - 1) * size).limit(size)
     result = await db.execute(query)
     items = result.scalars().all()
 
     pages = math.ceil(total / size) if total > 0 else 1
 
-    return {
+    return dump_json(PaginatedResponse[CaseResponse], {
         "items": items,
         "total": total,
         "page": page,
         "pages": pages,
-        "size": size
-    }
+        "size": size,
+        "total_is_exact": total_is_exact
+    })
+
+
+@router.get("/", response_model=Union[PaginatedResponse[CaseResponse], CursorPaginatedResponse[CaseResponse]])
+@router.get("", response_model=Union[PaginatedResponse[CaseResponse], CursorPaginatedResponse[CaseResponse]])
+async def list_cases(
+        request: Request,
+        page: int = Query(1, ge=1),
+        size: int = Query(9, ge=1, le=100),
+        category: Optional[List[str]] = Query(None, description="分类 Slug，可重复传入，命中任一即可"),
+        style: Optional[List[str]] = Query(None, description="风格标签，可重复传入，命中任一即可"),
+        year: Optional[int] = Query(None, ge=1900, le=2100),
+        featured: Optional[bool] = None,
+        cursor: Optional[str] = Query(None, description="传入即启用游标分页，首页传空字符串"),
+        db: AsyncSession = Depends(get_db)
+):
+    """获取作品列表 (支持分页、分类、风格、年份、精选过滤；可选游标分页)，命中缓存时不查库"""
+    entry = await response_cache.get_or_render(
+        cache_key(request), "cases",
+        lambda session: _render_case_list(session, page, size, category, style, year, featured, cursor),
+        db
+    )
+    return conditional_json_response(request.headers, entry.body, entry.etag, entry.last_modified)
 
 
 # ==========================================
 # 3. 详情查询 (动态路由)
 # ==========================================
 
-@router.get("/{slug}", response_model=CaseResponse)
-async def get_case_detail(slug: str, db: AsyncSession = Depends(get_db)):
-    """获取单个案例详情"""
+async def _render_case_detail(db: AsyncSession, slug: str) -> bytes:
     result = await db.execute(select(DBCase).where(DBCase.slug == slug))
     case = result.scalar_one_or_none()
     if not case:
         raise HTTPException(status_code=404, detail="案例未找到")
-    return case
+    return dump_json(CaseDetailResponse, case)
+
+
+@router.get("/{slug}", response_model=CaseDetailResponse)
+async def get_case_detail(slug: str, request: Request, db: AsyncSession = Depends(get_db)):
+    """获取单个案例详情 (404 不缓存)"""
+    entry = await response_cache.get_or_render(
+        cache_key(request), "cases", lambda session: _render_case_detail(session, slug), db
+    )
+    return conditional_json_response(request.headers, entry.body, entry.etag, entry.last_modified)
 
 
 # ==========================================
 # 4. 管理端：增删改
 # ==========================================
 
-@router.post("/", response_model=CaseResponse)
+@router.post("/", response_model=CaseDetailResponse)
 async def create_case(
         case_in: CaseCreate,
         db: AsyncSession = Depends(get_db),
@@ -125,6 +165,8 @@ async def create_case(
     db.add(db_case)
     await db.commit()
     await db.refresh(db_case)
+    count_cache.invalidate("cases")
+    response_cache.invalidate("cases")
     return db_case
 
 
@@ -142,6 +184,8 @@ async def delete_case(
 
     await db.delete(case)
     await db.commit()
+    count_cache.invalidate("cases")
+    response_cache.invalidate("cases")
     return None
 
 
@@ -159,27 +203,33 @@ async def upload_case_image(
     if ext not in [".jpg", ".jpeg", ".png", ".webp"]:
         raise HTTPException(status_code=400, detail="仅支持 JPG/PNG/WebP 格式")
 
-    file_uuid = uuid.uuid4().hex
+    # 分块落盘：峰值内存与文件大小无关，超限立即 413；同时计算原始字节的内容哈希
+    tmp_path, _, digest = await spool_upload_to_disk(
+        file, UPLOAD_TMP_DIR, settings.UPLOAD_MAX_MB * 1024 * 1024
+    )
+    # 内容寻址：同一原图始终对应同一文件名 (128 位，与原 uuid 长度一致)
+    file_key = digest[:32]
+    hd_filename = f"{file_key}.webp"
+    thumb_filename = f"{file_key}_thumb.webp"
 
     try:
-        content = await file.read()
-        img = Image.open(io.BytesIO(content))
-        if img.mode in ("RGBA", "P"):
-            img = img.convert("RGB")
-
-        # 保存高清图与缩略图
-        hd_filename = f"{file_uuid}.webp"
-        img.save(UPLOAD_DIR / hd_filename, "WEBP", quality=85, optimize=True)
-
-        thumb_img = img.copy()
-        thumb_img.thumbnail((600, 600), Image.Resampling.LANCZOS)
-        thumb_filename = f"{file_uuid}_thumb.webp"
-        thumb_img.save(UPLOAD_DIR / thumb_filename, "WEBP", quality=75)
-
-        return {
-            "url": f"/uploads/{hd_filename}",
-            "thumbnail_url": f"/uploads/{thumb_filename}",
-            "status": "success"
-        }
+        if (UPLOAD_DIR / hd_filename).exists() and (UPLOAD_DIR / thumb_filename).exists():
+            # 重复上传：直接复用已有文件，不再经过 Pillow
+            result = {"hd_filename": hd_filename, "thumb_filename": thumb_filename}
+        else:
+            # 解码/编码交给独立进程池，避免大图冻结整个 worker
+            result = await image_processor.submit(
+                process_case_image, str(tmp_path), str(UPLOAD_DIR), file_key
+            )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"图片处理失败: {str(e)}")
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    return {
+        "url": f"/uploads/{result['hd_filename']}",
+        "thumbnail_url": f"/uploads/{result['thumb_filename']}",
+        "status": "success"
+    }
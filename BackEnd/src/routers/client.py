@@ -1,13 +1,32 @@
 # backend/src/routers/client.py
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, update
-from sqlalchemy.orm import selectinload
-from typing import Any, List
+import json
+from typing import Any, List, Optional
 
+from ..config import settings
 from ..database import get_db, DBProject, DBNode, DBProjectLog
 from ..dependencies.permissions import client_required
-from ..models import ProjectResponse
+from ..models import CursorPaginatedResponse, ProjectLogResponse, ProjectResponse
+from ..services.project_document import load_project_orm, trim_document_logs
+from ..services.notifications import notify_node_confirmed
+from ..services.project_events import dump_model, dump_node_status, project_event_stream, publish_event
+from ..services.project_logs import fetch_log_feed
+from ..services.project_snapshot import (
+    dump_document,
+    read_snapshot,
+    read_snapshot_version,
+    rebuild_snapshot,
+    update_snapshot
+)
+from ..services.project_version import touch_project, project_etag
+from ..utils.http_cache import (
+    PRIVATE_REVALIDATE_CACHE,
+    is_not_modified,
+    not_modified_response,
+    validator_headers
+)
 
 router = APIRouter(tags=["Client Portal"])
 
@@ -19,36 +38,120 @@ router = APIRouter(tags=["Client Portal"])
 @router.get("/project/{project_id}", response_model=ProjectResponse)
 async def get_client_project_detail(
         project_id: int,
+        request: Request,
+        response: Response,
+        recent_logs: Optional[int] = Query(
+            None, ge=0, le=500, description="只返回最近 N 条日志，完整历史使用 /logs 分页接口"
+        ),
         db: AsyncSession = Depends(get_db),
         current_project: DBProject = Depends(client_required)
 ):
     """
     业主获取项目全量数据。
-    务实逻辑：深度加载所有关联资源，以便前端计算属性（如最新 VR）生效。
+    务实逻辑：返回全部关联资源及计算属性（如最新 VR）。
+    默认读取写入时维护的快照：一次主键查询，无需 ORM 装载与 Pydantic 校验；
+    前端轮询带 If-None-Match 时只查版本号，未变化直接返回 304。
     """
     # 权限校验：业主只能访问 Token 绑定的项目
     if project_id != current_project.id:
         raise HTTPException(status_code=403, detail="无权访问此项目数据 / Unauthorized")
 
-    # 使用 selectinload 解决 N+1 问题
-    result = await db.execute(
-        select(DBProject)
-        .options(
-            selectinload(DBProject.nodes).selectinload(DBNode.logs),
-            selectinload(DBProject.resources),
-            selectinload(DBProject.logs),
-            selectinload(DBProject.medias)
+    variant = f"-recent{recent_logs}" if recent_logs is not None else ""
+
+    if settings.PROJECT_DOCUMENT_SQL:
+        if "if-none-match" in request.headers or "if-modified-since" in request.headers:
+            version = await read_snapshot_version(db, project_id)
+            if version is not None:
+                etag = project_etag(project_id, version, variant)
+                if is_not_modified(request.headers, etag, version):
+                    return not_modified_response(etag, version, PRIVATE_REVALIDATE_CACHE)
+
+        snapshot = await read_snapshot(db, project_id)
+        if snapshot is None:
+            # 新项目或历史数据尚无快照：按源表生成一次
+            snapshot = await rebuild_snapshot(db, project_id)
+            if snapshot is None:
+                raise HTTPException(status_code=404, detail="项目信息不存在")
+            await db.commit()
+
+        document, version = snapshot
+        body = document.encode("utf-8")
+        if recent_logs is not None:
+            body = dump_document(trim_document_logs(json.loads(document), recent_logs)).encode("utf-8")
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers=validator_headers(project_etag(project_id, version, variant), version, PRIVATE_REVALIDATE_CACHE)
         )
-        .where(DBProject.id == project_id)
-    )
-    project = result.scalar_one_or_none()
+
+    # 回退路径：版本取自 projects.updated_at。先读版本再读数据：
+    # 期间若有新写入，下发的数据只会比 ETag 新，下次轮询仍会拿到完整响应
+    version = await db.scalar(select(DBProject.updated_at).where(DBProject.id == project_id))
+    if version is None:
+        raise HTTPException(status_code=404, detail="项目信息不存在")
+
+    etag = project_etag(project_id, version, variant)
+    if is_not_modified(request.headers, etag, version):
+        return not_modified_response(etag, version, PRIVATE_REVALIDATE_CACHE)
+
+    # 使用 selectinload 解决 N+1 问题
+    project = await load_project_orm(db, project_id)
 
     if not project:
         raise HTTPException(status_code=404, detail="项目信息不存在")
 
+    if recent_logs is not None:
+        # 截取后的文档直接输出 (与快照路径一致)：若再经 response_model 校验，
+        # chat_logs 这一计算字段会按截取后的 logs 重新计算，结果与快照路径不同
+        document = trim_document_logs(ProjectResponse.model_validate(project).model_dump(mode="json"), recent_logs)
+        return Response(
+            content=dump_document(document).encode("utf-8"),
+            media_type="application/json",
+            headers=validator_headers(etag, version, PRIVATE_REVALIDATE_CACHE)
+        )
+    response.headers.update(validator_headers(etag, version, PRIVATE_REVALIDATE_CACHE))
     return project
 
 
+@router.get("/project/{project_id}/logs", response_model=CursorPaginatedResponse[ProjectLogResponse])
+async def get_client_project_logs(
+        project_id: int,
+        cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor，首页不传"),
+        since_id: Optional[int] = Query(None, ge=0, description="增量轮询：返回 id 更大的日志及近期迟提交的日志，前端按 id 去重"),
+        node_id: Optional[int] = None,
+        sender_type: Optional[str] = Query(None, pattern="^(admin|client)$"),
+        size: int = Query(20, ge=1, le=100),
+        db: AsyncSession = Depends(get_db),
+        current_project: DBProject = Depends(client_required)
+):
+    """
+    业主端项目日志流。
+    务实：详情只带最近几条日志，历史记录按 (created_at, id) 倒序分页加载。
+    """
+    if project_id != current_project.id:
+        raise HTTPException(status_code=403, detail="无权访问此项目数据 / Unauthorized")
+
+    return await fetch_log_feed(
+        db, project_id,
+        cursor=cursor, since_id=since_id, node_id=node_id, sender_type=sender_type, size=size
+    )
+
+
+@router.get("/project/{project_id}/events")
+async def subscribe_client_project_events(
+        project_id: int,
+        current_project: DBProject = Depends(client_required)
+):
+    """
+    业主端项目动态推送 (SSE)，替代轮询全量详情。
+    事件：log / node / progress / resource / nodes；收到 ready 或 resync 时拉取一次详情即可。
+    """
+    if project_id != current_project.id:
+        raise HTTPException(status_code=403, detail="无权访问此项目数据 / Unauthorized")
+
+    return project_event_stream(project_id)
+
+
 # ==========================================
 # 2. 业主确认验收 (核心交互)
 # ==========================================
@@ -99,6 +202,15 @@ async def confirm_node_acceptance(
     if node.target_percent > current_project.current_progress:
         current_project.current_progress = node.target_percent
 
+    await touch_project(db, current_project.id)
+    await update_snapshot(
+        db, current_project.id,
+        log=new_log, node=node, current_progress=current_project.current_progress
+    )
+    await publish_event(db, current_project.id, "log", await dump_model(db, ProjectLogResponse, new_log))
+    await publish_event(db, current_project.id, "node", await dump_node_status(db, node))
+    await publish_event(db, current_project.id, "progress", {"current_progress": current_project.current_progress})
+    notify_node_confirmed(db, current_project, node.node_name, feedback_text)
     await db.commit()
     return {
         "status": "success",
@@ -132,6 +244,9 @@ async def send_client_message(
         node_id=None
     )
     db.add(new_log)
+    await touch_project(db, current_project.id)
+    await update_snapshot(db, current_project.id, log=new_log)
+    await publish_event(db, current_project.id, "log", await dump_model(db, ProjectLogResponse, new_log))
     await db.commit()
 
     return {"status": "success", "message": "留言已发送"}
\ No newline at end of file
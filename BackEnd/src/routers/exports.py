@@ -0,0 +1,110 @@
+# BackEnd/src/routers/exports.py
+from datetime import date, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+
+from ..database import DBBooking, DBCase, DBProduct, DBProject, DBUser
+from ..dependencies.permissions import admin_required
+from ..services.case_query import apply_case_filters
+from ..services.data_export import stream_export
+
+router = APIRouter(tags=["Admin Exports"])
+
+
+# ==========================================
+# 1. 公共参数：格式与创建日期范围
+# ==========================================
+
+class ExportParams:
+    def __init__(
+            self,
+            format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson 或 csv"),
+            created_from: Optional[date] = Query(None, description="创建日期起 (含)"),
+            created_to: Optional[date] = Query(None, description="创建日期止 (含)"),
+    ):
+        if created_from and created_to and created_from > created_to:
+            raise HTTPException(status_code=400, detail="日期范围无效：created_from 晚于 created_to")
+        self.format = format
+        self.created_from = created_from
+        self.created_to = created_to
+
+    def apply(self, query, model):
+        """附加日期范围并按主键排序 (同一筛选条件多次导出结果顺序一致)"""
+        if self.created_from:
+            query = query.where(model.created_at >= self.created_from)
+        if self.created_to:
+            query = query.where(model.created_at < self.created_to + timedelta(days=1))
+        return query.order_by(model.id)
+
+    def respond(self, query, name: str):
+        return stream_export(query, self.format, f"{name}-{date.today():%Y%m%d}")
+
+
+def _table_columns(model):
+    return select(*model.__table__.columns)
+
+
+# ==========================================
+# 2. 各表导出 (仅限管理员，全部列)
+# ==========================================
+
+@router.get("/cases")
+async def export_cases(
+        params: ExportParams = Depends(),
+        category: Optional[List[str]] = Query(None, description="分类 Slug，可重复传入，命中任一即可"),
+        status: Optional[str] = Query(None, max_length=20),
+        featured: Optional[bool] = None,
+        _: DBUser = Depends(admin_required)
+):
+    query, _key = apply_case_filters(_table_columns(DBCase), categories=category, featured=featured)
+    if status:
+        query = query.where(DBCase.status == status)
+    return params.respond(params.apply(query, DBCase), "cases")
+
+
+@router.get("/products")
+async def export_products(
+        params: ExportParams = Depends(),
+        category: Optional[str] = Query(None, max_length=50),
+        is_active: Optional[bool] = None,
+        _: DBUser = Depends(admin_required)
+):
+    query = _table_columns(DBProduct)
+    if category:
+        query = query.where(DBProduct.category == category)
+    if is_active is not None:
+        query = query.where(DBProduct.is_active == is_active)
+    return params.respond(params.apply(query, DBProduct), "products")
+
+
+@router.get("/projects")
+async def export_projects(
+        params: ExportParams = Depends(),
+        status: Optional[str] = Query(None, max_length=20),
+        _: DBUser = Depends(admin_required)
+):
+    """项目主表 (含访问码，与管理端详情一致)；节点与日志不展开"""
+    query = _table_columns(DBProject)
+    if status:
+        query = query.where(DBProject.status == status)
+    return params.respond(params.apply(query, DBProject), "projects")
+
+
+@router.get("/bookings")
+async def export_bookings(
+        params: ExportParams = Depends(),
+        status: Optional[str] = Query(None, max_length=20),
+        category: Optional[str] = Query(None, max_length=50, description="项目类型 (project_type)"),
+        is_read: Optional[bool] = None,
+        _: DBUser = Depends(admin_required)
+):
+    query = _table_columns(DBBooking)
+    if status:
+        query = query.where(DBBooking.status == status)
+    if category:
+        query = query.where(DBBooking.project_type == category)
+    if is_read is not None:
+        query = query.where(DBBooking.is_read == is_read)
+    return params.respond(params.apply(query, DBBooking), "bookings")
@@ -0,0 +1,41 @@
+# BackEnd/src/routers/media.py
+import os
+
+from fastapi import APIRouter, HTTPException, Request
+
+from ..config import settings
+from ..services.image_processor import image_processor
+from ..services.image_variants import variant_cache, supported_formats, is_valid_stem
+from ..utils.static_files import UploadFileResponse
+
+router = APIRouter(tags=["Media"])
+
+
+# ==========================================
+# 1. 响应式衍生图 (按需生成 + 磁盘缓存)
+# ==========================================
+
+@router.get("/variants/{width}/{filename}")
+async def get_image_variant(width: int, filename: str, request: Request):
+    """
+    获取指定宽度/格式的衍生图，例如 /uploads/variants/640/<uuid>.webp
+    务实：首次访问时生成并缓存，之后直接返回磁盘文件，不再解码。
+    """
+    stem, _, fmt = filename.rpartition(".")
+    formats = supported_formats()
+    if width not in settings.IMAGE_VARIANT_WIDTHS or fmt not in formats or not is_valid_stem(stem):
+        raise HTTPException(status_code=404, detail="图片规格不存在")
+
+    try:
+        path = await variant_cache.get_or_create(stem, width, fmt, image_processor.submit)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="原图不存在")
+
+    # 与 /uploads 静态文件一致：immutable 缓存 + ETag/304
+    return UploadFileResponse(
+        str(path),
+        os.stat(path),
+        request.headers,
+        media_type=formats[fmt],
+        method=request.method,
+    )
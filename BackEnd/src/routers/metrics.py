@@ -0,0 +1,46 @@
+# BackEnd/src/routers/metrics.py
+import os
+
+from fastapi import APIRouter, Depends
+
+from ..database import DBUser
+from ..services.booking_ingest import booking_buffer
+from ..dependencies.permissions import admin_required
+from ..services.count_cache import count_cache
+from ..services.image_processor import image_processor
+from ..services.image_variants import variant_cache
+from ..services.notifications import notification_dispatcher
+from ..services.password_hasher import password_hasher
+from ..services.presence import presence
+from ..services.principal_cache import principal_cache
+from ..services.rate_limit import limiter
+from ..services.project_events import project_events
+from ..services.response_cache import response_cache
+
+router = APIRouter(tags=["Admin Metrics"])
+
+
+# ==========================================
+# 1. 运行时指标 (仅限管理员)
+# ==========================================
+
+@router.get("")
+async def get_runtime_metrics(_: DBUser = Depends(admin_required)):
+    """
+    当前 worker 进程内的运行指标。
+    务实：多 worker 部署时每个进程各自统计，用于容量评估而非精确计费。
+    """
+    return {
+        "pid": os.getpid(),
+        "image_processor": image_processor.stats(),
+        "image_variants": variant_cache.stats(),
+        "count_cache": count_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "project_events": project_events.stats(),
+        "principal_cache": principal_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "presence": presence.stats(),
+        "rate_limit": limiter.stats(),
+        "booking_ingest": booking_buffer.stats(),
+        "notifications": notification_dispatcher.stats(),
+    }
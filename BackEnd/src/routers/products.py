@@ -1,18 +1,23 @@
 # BackEnd/src/routers/products.py
 import math
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, desc
+from sqlalchemy import desc
 from pydantic import BaseModel
 
 from ..database import get_db, DBProduct, DBUser
 from ..dependencies.permissions import admin_required
+from ..services.pagination import fetch_cursor_page
+from ..services.count_cache import count_cache
+from ..services.response_cache import response_cache, cache_key, dump_json
+from ..utils.http_cache import conditional_json_response
 from ..models import (
     ProductResponse,
     ProductBase,
-    PaginatedResponse  # 引用分页泛型
+    PaginatedResponse,  # 引用分页泛型
+    CursorPaginatedResponse
 )
 
 router = APIRouter(tags=["Products"])
@@ -31,55 +36,84 @@ class ProductCreate(ProductBase):
 # 2. 获取产品列表 (支持分页与分类过滤)
 # ==========================================
 
-@router.get("/", response_model=PaginatedResponse[ProductResponse])
-async def list_products(
-        page: int = Query(1, ge=1),
-        size: int = Query(12, ge=1, le=100),
-        category: Optional[str] = None,
-        db: AsyncSession = Depends(get_db)
-):
-    """
-    获取产品列表
-    务实逻辑：前台展示仅显示 active，后台分页支持
-    """
+async def _render_product_list(
+        db: AsyncSession,
+        page: int,
+        size: int,
+        category: Optional[str],
+        cursor: Optional[str]
+) -> bytes:
+    """查询并序列化产品列表 (供响应缓存调用，也用于后台刷新)"""
     query = select(DBProduct).where(DBProduct.is_active == True)
 
     if category:
         query = query.where(DBProduct.category == category)
 
-    # 计算总数
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+    # 游标模式：按 (created_at, id) 翻页，深翻页成本恒定
+    if cursor is not None:
+        data = await fetch_cursor_page(db, query, DBProduct.created_at, DBProduct.id, cursor, size)
+        return dump_json(CursorPaginatedResponse[ProductResponse], data)
+
+    # 计算总数 (按分类缓存；含 is_active 过滤，统计估算不适用)
+    total, total_is_exact = await count_cache.count(db, "products", (category,), query)
 
     # 分页查询
-    query = query.order_by(desc(DBProduct.created_at)).offset((page - 1) * size).limit(size)
+    query = query.order_by(desc(DBProduct.created_at), desc(DBProduct.id)).offset((page - 1) * size).limit(size)
     result = await db.execute(query)
     items = result.scalars().all()
 
     pages = math.ceil(total / size) if total > 0 else 1
 
-    return {
+    return dump_json(PaginatedResponse[ProductResponse], {
         "items": items,
         "total": total,
         "page": page,
         "pages": pages,
-        "size": size
-    }
+        "size": size,
+        "total_is_exact": total_is_exact
+    })
+
+
+@router.get("/", response_model=Union[PaginatedResponse[ProductResponse], CursorPaginatedResponse[ProductResponse]])
+async def list_products(
+        request: Request,
+        page: int = Query(1, ge=1),
+        size: int = Query(12, ge=1, le=100),
+        category: Optional[str] = None,
+        cursor: Optional[str] = Query(None, description="传入即启用游标分页，首页传空字符串"),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    获取产品列表
+    务实逻辑：前台展示仅显示 active，后台分页支持；命中缓存时不查库
+    """
+    entry = await response_cache.get_or_render(
+        cache_key(request), "products",
+        lambda session: _render_product_list(session, page, size, category, cursor),
+        db
+    )
+    return conditional_json_response(request.headers, entry.body, entry.etag, entry.last_modified)
 
 
 # ==========================================
 # 3. 获取详情与管理
 # ==========================================
 
-@router.get("/{product_id}", response_model=ProductResponse)
-async def get_product(product_id: int, db: AsyncSession = Depends(get_db)):
-    """获取单个详情"""
+async def _render_product_detail(db: AsyncSession, product_id: int) -> bytes:
     result = await db.execute(select(DBProduct).where(DBProduct.id == product_id))
     product = result.scalar_one_or_none()
     if not product:
         raise HTTPException(status_code=404, detail="工艺产品未找到")
-    return product
+    return dump_json(ProductResponse, product)
+
+
+@router.get("/{product_id}", response_model=ProductResponse)
+async def get_product(product_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    """获取单个详情 (ETag 为序列化内容哈希，未变化时返回 304)"""
+    entry = await response_cache.get_or_render(
+        cache_key(request), "products", lambda session: _render_product_detail(session, product_id), db
+    )
+    return conditional_json_response(request.headers, entry.body, entry.etag, entry.last_modified)
 
 
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
@@ -94,6 +128,8 @@ async def create_product(
     try:
         await db.commit()
         await db.refresh(db_product)
+        count_cache.invalidate("products")
+        response_cache.invalidate("products")
         return db_product
     except Exception as e:
         await db.rollback()
@@ -114,4 +150,6 @@ async def delete_product(
 
     await db.delete(product)
     await db.commit()
+    count_cache.invalidate("products")
+    response_cache.invalidate("products")
     return None
\ No newline at end of file
@@ -1,5 +1,4 @@
 # BackEnd/src/routers/users.py
-from datetime import datetime, timezone, timedelta
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,7 +6,8 @@ from sqlalchemy.future import select
 from pydantic import BaseModel, Field
 
 from ..database import get_db, DBUser
-from ..auth import get_password_hash
+from ..auth import get_password_hash_async
+from ..services.principal_cache import admin_key, invalidate_principal
 from ..models import UserCreate, UserResponse, UserUpdate
 from ..dependencies.permissions import super_admin_required, admin_required
 
@@ -34,22 +34,10 @@ async def get_users_list(
 ):
     """
     获取所有管理员列表。
-    务实逻辑：动态判定在线状态，若 5 分钟内无活动则视为离线。
+    务实逻辑：is_online / last_active 由 presence 后台维护 (超过在线窗口无活动即置为离线)，直接读取。
     """
     result = await db.execute(select(DBUser).order_by(DBUser.id))
-    db_users = result.scalars().all()
-
-    now = datetime.now(timezone.utc)
-    for user in db_users:
-        # 如果 last_active 超过 5 分钟，强制在返回给前端的视图中显示为离线
-        if user.last_active:
-            # 确保 user.last_active 也是带时区的
-            last_active = user.last_active.replace(
-                tzinfo=timezone.utc) if not user.last_active.tzinfo else user.last_active
-            if now - last_active > timedelta(minutes=5):
-                user.is_online = False
-
-    return db_users
+    return result.scalars().all()
 
 
 # ==========================================
@@ -74,7 +62,7 @@ async def create_new_admin(
         username=user_in.username.lower().strip(),
         email=user_in.email.strip(),
         full_name=user_in.full_name,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
         role="admin",  # 默认新创建的都是普通管理员
         is_active=True
     )
@@ -98,8 +86,9 @@ async def reset_user_password(
     if not db_user:
         raise HTTPException(status_code=404, detail="用户不存在")
 
-    db_user.hashed_password = get_password_hash(data.new_password)
+    db_user.hashed_password = await get_password_hash_async(data.new_password)
     db_user.is_online = False  # 强制该用户下次访问时重新登录
+    await invalidate_principal(db, admin_key(db_user.username))
     await db.commit()
 
     return {"status": "success", "message": f"管理员 {db_user.username} 的密码已重置"}
@@ -128,5 +117,6 @@ async def delete_admin_account(
         raise HTTPException(status_code=403, detail="无权删除其他超级管理员")
 
     await db.delete(db_user)
+    await invalidate_principal(db, admin_key(db_user.username))
     await db.commit()
     return None
\ No newline at end of file
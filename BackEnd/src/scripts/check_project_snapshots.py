@@ -0,0 +1,98 @@
+# backend/src/scripts/check_project_snapshots.py
+"""
+项目详情快照一致性检查
+
+按源表 (projects / project_nodes / project_logs / project_resources) 重新生成每个项目的详情文档，
+与 project_snapshots 中的快照逐字节比对，报告缺失与不一致的项目。
+
+用法：
+    python src/scripts/check_project_snapshots.py                 # 检查全部项目
+    python src/scripts/check_project_snapshots.py --project 12    # 只检查指定项目
+    python src/scripts/check_project_snapshots.py --fix           # 重建缺失/不一致的快照
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# 1. 动态定位并添加项目根目录，确保导入不报错
+current_file = Path(__file__).resolve()
+backend_dir = current_file.parent.parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.append(str(backend_dir))
+
+from sqlalchemy import select
+
+from src.database import AsyncSessionLocal, DBProject, DBProjectSnapshot, engine
+from src.services.project_document import render_project_document
+from src.services.project_snapshot import rebuild_snapshot
+
+
+def first_difference(a: str, b: str) -> int:
+    for index, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return index
+    return min(len(a), len(b))
+
+
+async def check(project_ids: Optional[List[int]], fix: bool) -> int:
+    missing, drifted, ok = [], [], 0
+    async with AsyncSessionLocal() as db:
+        if project_ids is None:
+            project_ids = list((await db.execute(select(DBProject.id).order_by(DBProject.id))).scalars())
+
+        for project_id in project_ids:
+            # 每个项目单独一个事务。先锁住快照行再读源表：
+            # 写入方总是先写源表、再锁快照行，因此两次读取看到的是同一批已提交的写入
+            row = (await db.execute(
+                select(DBProjectSnapshot.document)
+                .where(DBProjectSnapshot.project_id == project_id)
+                .with_for_update()
+            )).first()
+            snapshot = row.document if row else None
+
+            expected = await render_project_document(db, project_id)
+            if expected is None:
+                print(f"  ⚠️  项目 #{project_id} 不存在")
+                await db.rollback()
+                continue
+
+            if snapshot is None:
+                missing.append(project_id)
+                print(f"  ➕ 项目 #{project_id} 缺少快照")
+            elif snapshot.encode("utf-8") != expected:
+                drifted.append(project_id)
+                index = first_difference(snapshot, expected.decode("utf-8"))
+                print(f"  ❌ 项目 #{project_id} 快照不一致 (首个差异位于字符 {index})")
+                print(f"     快照: {snapshot[max(index - 60, 0):index + 60]!r}")
+                print(f"     源表: {expected.decode('utf-8')[max(index - 60, 0):index + 60]!r}")
+            else:
+                ok += 1
+
+            if fix and (project_id in missing or project_id in drifted):
+                await rebuild_snapshot(db, project_id)
+                await db.commit()
+            else:
+                await db.rollback()
+
+    print(f"\n📊 一致 {ok} 个，缺失 {len(missing)} 个，不一致 {len(drifted)} 个")
+    if fix and (missing or drifted):
+        print(f"🔧 已重建 {len(missing) + len(drifted)} 个快照")
+    # 缺失的快照会在首次读取时自动生成，只有内容不一致才视为失败
+    return 1 if drifted and not fix else 0
+
+
+async def main(project_ids: Optional[List[int]], fix: bool) -> int:
+    try:
+        return await check(project_ids, fix)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="项目详情快照一致性检查")
+    parser.add_argument("--project", type=int, action="append", help="只检查指定项目 ID，可重复")
+    parser.add_argument("--fix", action="store_true", help="重建缺失或不一致的快照")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.project, args.fix)))
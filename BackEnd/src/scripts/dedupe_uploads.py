@@ -0,0 +1,173 @@
+# backend/src/scripts/dedupe_uploads.py
+"""
+一次性迁移：合并 public/uploads 中内容重复的图片
+
+旧版上传接口每次都生成新的 uuid 文件名，同一张原图会留下多份完全相同的 WebP。
+本脚本按高清图字节内容的 SHA-256 分组，每组保留最早的一份，
+把数据库中指向重复文件的引用改写为保留文件，最后删除多余文件 (含缩略图与衍生图)。
+
+说明：旧文件的原始字节已不可得，因此无法改名为新的内容寻址文件名；
+      之后重复上传同一原图时才会生成内容寻址文件。
+
+用法：
+    python src/scripts/dedupe_uploads.py          # 仅预览
+    python src/scripts/dedupe_uploads.py --apply  # 改写数据库并删除重复文件
+"""
+import argparse
+import asyncio
+import hashlib
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+# 1. 动态定位并添加项目根目录，确保导入不报错
+current_file = Path(__file__).resolve()
+backend_dir = current_file.parent.parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.append(str(backend_dir))
+
+from sqlalchemy import select
+from sqlalchemy.orm.attributes import flag_modified
+
+from src.database import AsyncSessionLocal, DBCase, DBProduct, DBProjectLog, DBProjectMedia
+from src.services.project_snapshot import rebuild_snapshot
+from src.services.project_version import touch_project
+
+UPLOAD_DIR = backend_dir / "public" / "uploads"
+VARIANT_DIR = UPLOAD_DIR / "variants"
+
+
+# ==========================================
+# 1. 扫描并分组
+# ==========================================
+
+def file_digest(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def build_url_mapping() -> Dict[str, str]:
+    """返回 {重复文件 URL: 保留文件 URL}，缩略图一并映射"""
+    groups: Dict[str, List[Path]] = defaultdict(list)
+    for path in UPLOAD_DIR.glob("*.webp"):
+        if path.stem.endswith("_thumb") or path.name.startswith("."):
+            continue
+        groups[file_digest(path)].append(path)
+
+    mapping: Dict[str, str] = {}
+    for paths in groups.values():
+        if len(paths) < 2:
+            continue
+        paths.sort(key=lambda p: (p.stat().st_mtime, p.name))
+        keeper = paths[0]
+        for dup in paths[1:]:
+            mapping[f"/uploads/{dup.name}"] = f"/uploads/{keeper.name}"
+            mapping[f"/uploads/{dup.stem}_thumb.webp"] = f"/uploads/{keeper.stem}_thumb.webp"
+    return mapping
+
+
+# ==========================================
+# 2. 改写数据库引用
+# ==========================================
+
+async def rewrite_references(mapping: Dict[str, str], apply: bool) -> int:
+    """改写所有可能引用上传文件的字段，返回受影响的行数"""
+    changed_rows = 0
+    async with AsyncSessionLocal() as db:
+        # 案例：结构化图片数组 (兼容旧数据中的纯字符串)
+        for case in (await db.execute(select(DBCase))).scalars():
+            changed = False
+            new_images = []
+            for image in case.images or []:
+                if isinstance(image, str):
+                    if image in mapping:
+                        image, changed = mapping[image], True
+                else:
+                    image = dict(image)
+                    for field in ("url", "thumbnail_url"):
+                        if image.get(field) in mapping:
+                            image[field], changed = mapping[image[field]], True
+                new_images.append(image)
+            if changed:
+                case.images = new_images
+                flag_modified(case, "images")
+                changed_rows += 1
+                print(f"  ✏️  案例 {case.slug}")
+
+        # 产品封面
+        for product in (await db.execute(select(DBProduct))).scalars():
+            if product.cover_image in mapping:
+                product.cover_image = mapping[product.cover_image]
+                changed_rows += 1
+                print(f"  ✏️  产品 #{product.id}")
+
+        # 项目日志图片与现场媒体
+        touched_projects = set()
+        for log in (await db.execute(select(DBProjectLog))).scalars():
+            if any(img in mapping for img in log.images or []):
+                log.images = [mapping.get(img, img) for img in log.images]
+                flag_modified(log, "images")
+                touched_projects.add(log.project_id)
+                changed_rows += 1
+        for media in (await db.execute(select(DBProjectMedia))).scalars():
+            if media.url in mapping:
+                media.url = mapping[media.url]
+                touched_projects.add(media.project_id)
+                changed_rows += 1
+        # 刷新项目版本并重建详情快照，业主端缓存的旧 URL 才会失效
+        for project_id in touched_projects:
+            await touch_project(db, project_id)
+            await rebuild_snapshot(db, project_id)
+
+        if apply:
+            await db.commit()
+        else:
+            await db.rollback()
+    return changed_rows
+
+
+# ==========================================
+# 3. 删除重复文件
+# ==========================================
+
+def remove_duplicates(mapping: Dict[str, str]) -> int:
+    freed = 0
+    for url in mapping:
+        path = UPLOAD_DIR / url.rsplit("/", 1)[-1]
+        if path.exists():
+            freed += path.stat().st_size
+            path.unlink()
+        # 对应的响应式衍生图也一并清理
+        if VARIANT_DIR.exists():
+            for variant in VARIANT_DIR.glob(f"*/{path.stem}.*"):
+                freed += variant.stat().st_size
+                variant.unlink()
+    return freed
+
+
+async def main(apply: bool):
+    print(f"🔍 扫描目录: {UPLOAD_DIR}")
+    mapping = build_url_mapping()
+    duplicates = [url for url in mapping if not url.endswith("_thumb.webp")]
+    print(f"📦 发现 {len(duplicates)} 个重复的高清图")
+    if not mapping:
+        return
+
+    rows = await rewrite_references(mapping, apply)
+    if not apply:
+        print(f"\n👀 预览模式：{rows} 行数据库记录将被改写，使用 --apply 执行")
+        return
+
+    freed = remove_duplicates(mapping)
+    print(f"\n🎉 已改写 {rows} 行记录，释放 {freed / 1024 / 1024:.1f}MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="合并 uploads 中的重复图片")
+    parser.add_argument("--apply", action="store_true", help="实际改写数据库并删除文件")
+    args = parser.parse_args()
+    asyncio.run(main(args.apply))
@@ -1,81 +1,319 @@
 # backend/scripts/insert_cases.py
+"""
+案例批量导入 (流式读取 + 分批 UPSERT + 断点续传)
+
+务实逻辑：
+1. 流式读取 JSON 数组或 NDJSON (每行一个案例)，内存占用与文件大小无关；
+2. 每批一条 INSERT ... ON CONFLICT (slug)：已存在的案例默认跳过 (与旧脚本一致，不覆盖后台编辑过的内容)，
+   --on-conflict update 时更新，内容完全相同的行不会被重写；同一批内重复的 slug 以后出现者为准；
+3. 字段缺失或类型不符的记录计为无效并跳过，不会中断整批导入；
+4. 每批提交后把已处理的记录数与这些记录内容的摘要写入检查点文件，失败后重跑会跳过已提交的批次；
+   只要已提交部分的内容不变，修改后面的记录 (例如修复出错的数据) 不影响续传
+   (批次提交与检查点写入之间中断时，重跑该批也只是一次幂等的 UPSERT)。
+
+用法：
+    python src/scripts/insert_cases.py                                   # 默认导入 data/sample_cases.json
+    python src/scripts/insert_cases.py cases.ndjson --batch-size 1000
+    python src/scripts/insert_cases.py cases.json --on-conflict update   # 已存在的案例以文件内容为准
+    python src/scripts/insert_cases.py cases.json --restart              # 忽略检查点，从头导入
+"""
+import argparse
 import asyncio
+import hashlib
 import json
 import os
 import sys
+import time
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
 
 # 1. 动态定位并添加项目根目录，确保导入不报错
 current_file = Path(__file__).resolve()
-backend_dir = current_file.parent.parent
+backend_dir = current_file.parent.parent.parent
 if str(backend_dir) not in sys.path:
     sys.path.append(str(backend_dir))
 
-# 2. 引入异步组件与模型
-from src.database import AsyncSessionLocal, DBCase
-from sqlalchemy import select
+from sqlalchemy import func, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.database import AsyncSessionLocal, DBCase, engine
+
+REQUIRED_FIELDS = ("slug", "title", "chinese_title")
+# 可选字段及缺省值 (与旧脚本一致，输入中的多余字段自动忽略)
+OPTIONAL_FIELDS: Dict[str, Any] = {
+    "description": None,
+    "detailed_description": None,
+    "location": None,
+    "area": 0,
+    "year": None,
+    "categories": [],
+    "styles": [],
+    "images": [],
+    "featured": False,
+    "status": "completed",
+}
+# 字段类型与长度上限 (与 DBCase 列定义一致)，不符的记录计为无效，避免一条坏数据让整批写入失败
+FIELD_TYPES: Dict[str, Tuple[Tuple[type, ...], Optional[int]]] = {
+    "slug": ((str,), 100),
+    "title": ((str,), 200),
+    "chinese_title": ((str,), 200),
+    "description": ((str,), None),
+    "detailed_description": ((str,), None),
+    "location": ((str,), 100),
+    "area": ((int, float), None),
+    "year": ((int,), None),
+    "categories": ((list,), None),
+    "styles": ((list,), None),
+    "images": ((list,), None),
+    "featured": ((bool,), None),
+    "status": ((str,), 20),
+}
+# asyncpg 单条语句最多 32767 个参数
+MAX_BATCH_SIZE = 32767 // (len(REQUIRED_FIELDS) + len(OPTIONAL_FIELDS))
+
 
-async def insert_real_cases():
-    """
-    异步插入真实案例数据
-    务实逻辑：避免同步锁死，确保数据结构对齐
-    """
-    async with AsyncSessionLocal() as db:
+# ==========================================
+# 2. 流式读取
+# ==========================================
+
+def _iter_json_array(f: TextIO, buffer: str, chunk_size: int) -> Iterator[Any]:
+    """逐个解析顶层数组中的元素，只在缓冲区不足时继续读取"""
+    decoder = json.JSONDecoder()
+    pos = 0
+    while True:
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer):
+                break
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise ValueError("JSON 数组未正常结束 (缺少 ])")
+            buffer, pos = chunk, 0
+
+        if buffer[pos] == "]":
+            return
         try:
-            print("🚀 [Database] 开始异步插入案例数据...")
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield item
+        pos = end
+        if pos > chunk_size:
+            buffer, pos = buffer[pos:], 0
 
-            # 定位 JSON 数据文件
-            data_file = backend_dir.parent / 'data' / 'sample_cases.json'
-            if not data_file.exists():
-                print(f"❌ 错误：找不到数据文件 {data_file}")
+
+def iter_records(path: Path, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """按首个非空白字符判断格式：[ 开头为 JSON 数组，否则为 NDJSON"""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        buffer = ""
+        while not buffer.strip():
+            chunk = f.read(chunk_size)
+            if not chunk:
                 return
+            buffer += chunk
+        buffer = buffer.lstrip()
+
+        if buffer[0] == "[":
+            yield from _iter_json_array(f, buffer[1:], chunk_size)
+            return
+
+        # NDJSON：先处理已读入的缓冲区，再逐行读取剩余部分
+        pending = buffer
+        for line in f:
+            pending += line
+            if pending.endswith("\n"):
+                for part in pending.splitlines():
+                    if part.strip():
+                        yield json.loads(part)
+                pending = ""
+        for part in pending.splitlines():
+            if part.strip():
+                yield json.loads(part)
+
+
+def normalize(record: Any) -> Dict[str, Any]:
+    """只保留数据库中存在的字段；缺少必填字段或类型不符时抛出 ValueError (说明原因)"""
+    if not isinstance(record, dict):
+        raise ValueError("不是 JSON 对象")
+    missing = [field for field in REQUIRED_FIELDS if not record.get(field)]
+    if missing:
+        raise ValueError(f"缺少必填字段 {missing}")
+    row = {field: record[field] for field in REQUIRED_FIELDS}
+    for field, default in OPTIONAL_FIELDS.items():
+        value = record.get(field)
+        row[field] = default if value is None else value
+
+    for field, value in row.items():
+        if value is None:
+            continue
+        types, max_length = FIELD_TYPES[field]
+        # bool 是 int 的子类，数值字段需单独排除
+        if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+            raise ValueError(f"字段 {field} 类型应为 {'/'.join(t.__name__ for t in types)}，实际为 {value!r:.50}")
+        if max_length is not None and len(value) > max_length:
+            raise ValueError(f"字段 {field} 超过 {max_length} 个字符")
+    return row
+
+
+# ==========================================
+# 3. 检查点
+# ==========================================
+
+# 检查点只校验已提交的前 N 条记录的内容摘要，而不是整个文件的大小/修改时间：
+# 修复后面出错的记录会改变文件，但不影响已提交部分，仍可续传
+
+def record_digest(digest, record: Any) -> None:
+    digest.update(json.dumps(record, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    digest.update(b"\n")
+
 
-            with open(data_file, 'r', encoding='utf-8') as f:
-                cases_data = json.load(f)
-
-            inserted_count = 0
-            for case_data in cases_data:
-                # 3. 使用异步语法检查是否已存在 (根据 slug 判定)
-                stmt = select(DBCase).where(DBCase.slug == case_data['slug'])
-                result = await db.execute(stmt)
-                existing = result.scalar_one_or_none()
-
-                if existing:
-                    print(f"  ⏩ 跳过已存在案例: {case_data.get('chinese_title')}")
-                    continue
-
-                # 4. 构造模型实例 (仅保留数据库中存在的字段)
-                # 注意：此处自动过滤了旧脚本中多余的字段
-                db_case = DBCase(
-                    slug=case_data['slug'],
-                    title=case_data['title'],
-                    chinese_title=case_data['chinese_title'],
-                    description=case_data.get('description'),
-                    detailed_description=case_data.get('detailed_description'),
-                    location=case_data.get('location'),
-                    area=case_data.get('area', 0),
-                    year=case_data.get('year'),
-                    categories=case_data.get('categories', []),
-                    styles=case_data.get('styles', []),
-                    images=case_data.get('images', []),
-                    featured=case_data.get('featured', False),
-                    status=case_data.get('status', 'completed')
-                )
-
-                db.add(db_case)
-                inserted_count += 1
-                print(f"  ✅ 预备添加: {case_data.get('chinese_title')}")
-
-            # 5. 执行异步提交
+def load_checkpoint(checkpoint: Path, path: Path) -> Tuple[int, Optional[str]]:
+    """返回 (已提交的记录数, 这些记录的摘要)"""
+    if not checkpoint.exists():
+        return 0, None
+    state = json.loads(checkpoint.read_text(encoding="utf-8"))
+    if state.get("input") != str(path.resolve()):
+        raise SystemExit(f"❌ 检查点 {checkpoint} 不属于输入文件 {path}，请确认后使用 --restart 重新导入")
+    return int(state["records"]), state["digest"]
+
+
+def save_checkpoint(checkpoint: Path, path: Path, records: int, digest: str) -> None:
+    tmp = checkpoint.with_name(checkpoint.name + ".tmp")
+    tmp.write_text(
+        json.dumps({"input": str(path.resolve()), "records": records, "digest": digest}), encoding="utf-8"
+    )
+    os.replace(tmp, checkpoint)  # 原子替换：中断时不会留下半截检查点
+
+
+def verify_prefix(checkpoint: Path, records: int, expected: Optional[str], actual: Optional[str]) -> None:
+    if actual != expected:
+        raise SystemExit(
+            f"❌ 输入文件前 {records} 条记录 (已提交部分) 与检查点 {checkpoint} 不一致，"
+            f"请确认后使用 --restart 重新导入"
+        )
+
+
+# ==========================================
+# 4. 分批 UPSERT
+# ==========================================
+
+def build_upsert(rows: List[Dict[str, Any]], on_conflict: str):
+    stmt = pg_insert(DBCase).values(rows)
+    if on_conflict == "skip":
+        stmt = stmt.on_conflict_do_nothing(index_elements=[DBCase.slug])
+    else:
+        columns = [c for c in rows[0] if c != "slug"]
+        table = DBCase.__table__
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DBCase.slug],
+            set_={**{c: stmt.excluded[c] for c in columns}, "updated_at": func.now()},
+            # 内容没有变化的行不重写 (不产生新版本行，也不刷新 updated_at)
+            where=tuple_(*(table.c[c] for c in columns)).is_distinct_from(
+                tuple_(*(stmt.excluded[c] for c in columns))
+            ),
+        )
+    # xmax = 0 表示本次新插入的行；被跳过的行不会出现在 RETURNING 中
+    return stmt.returning(literal_column("xmax = 0").label("inserted"))
+
+
+async def import_cases(path: Path, batch_size: int, on_conflict: str, restart: bool) -> int:
+    checkpoint = path.with_name(path.name + ".checkpoint.json")
+    if restart and checkpoint.exists():
+        checkpoint.unlink()
+    resume_from, expected_digest = load_checkpoint(checkpoint, path)
+    if resume_from:
+        print(f"⏯️  从检查点继续：跳过已提交的前 {resume_from} 条记录")
+
+    totals = {"inserted": 0, "updated": 0, "unchanged": 0, "invalid": 0}
+    started = time.perf_counter()
+    batch: Dict[str, Dict[str, Any]] = {}
+    digest = hashlib.sha256()
+    index = 0
+
+    async def flush() -> None:
+        rows = list(batch.values())
+        batch_started = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(build_upsert(rows, on_conflict))
+            flags = list(result.scalars())
             await db.commit()
-            print(f"\n🎉 成功异步插入 {inserted_count} 个案例！")
+        save_checkpoint(checkpoint, path, index, digest.hexdigest())
+
+        inserted = sum(1 for f in flags if f)
+        totals["inserted"] += inserted
+        totals["updated"] += len(flags) - inserted
+        totals["unchanged"] += len(rows) - len(flags)
+        elapsed = time.perf_counter() - started
+        print(f"  📦 已处理 {index:>8} 条 | 本批 {len(rows)} 行 "
+              f"({len(rows) / (time.perf_counter() - batch_started):,.0f} 行/秒) | "
+              f"累计 {(index - resume_from) / elapsed:,.0f} 条/秒")
+        batch.clear()
+
+    for record in iter_records(path):
+        index += 1
+        record_digest(digest, record)
+        if index < resume_from:
+            continue
+        if index == resume_from:
+            verify_prefix(checkpoint, resume_from, expected_digest, digest.hexdigest())
+            continue
+        try:
+            row = normalize(record)
+        except ValueError as e:
+            totals["invalid"] += 1
+            print(f"  ⚠️  第 {index} 条记录无效 ({e})，已跳过", file=sys.stderr)
+            continue
+        # 同一批内重复的 slug：ON CONFLICT 不允许同一语句两次更新同一行，以后出现者为准
+        batch.pop(row["slug"], None)
+        batch[row["slug"]] = row
+        if len(batch) >= batch_size:
+            await flush()
+    if index < resume_from:
+        verify_prefix(checkpoint, resume_from, expected_digest, None)
+    if batch:
+        await flush()
+
+    elapsed = time.perf_counter() - started
+    processed = index - resume_from
+    print(f"\n🎉 导入完成：共 {index} 条记录，本次处理 {processed} 条，用时 {elapsed:.1f}s "
+          f"({processed / elapsed if elapsed else 0:,.0f} 条/秒)")
+    print(f"   新增 {totals['inserted']}，更新 {totals['updated']}，未变化/跳过 {totals['unchanged']}，"
+          f"无效 {totals['invalid']}")
+    print("   提示：运行中的服务对案例列表有短时缓存 (RESPONSE_CACHE_TTL / COUNT_CACHE_TTL)，过期后即可看到新数据")
+    checkpoint.unlink(missing_ok=True)
+    return 0
+
+
+async def main(args) -> int:
+    try:
+        return await import_cases(args.input, args.batch_size, args.on_conflict, args.restart)
+    except Exception as e:
+        print(f"💥 导入中断: {e}\n   已提交的批次记录在检查点中，修复问题后重新运行同一命令即可继续")
+        import traceback
+        traceback.print_exc()
+        return 1
+    finally:
+        await engine.dispose()
 
-        except Exception as e:
-            await db.rollback()
-            print(f"💥 插入数据失败: {str(e)}")
-            import traceback
-            traceback.print_exc()
 
 if __name__ == "__main__":
-    # 使用 asyncio 运行异步入口
-    asyncio.run(insert_real_cases())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="案例批量导入 (JSON 数组 / NDJSON)")
+    parser.add_argument(
+        "input", nargs="?", type=Path,
+        default=backend_dir / "data" / "sample_cases.json",
+        help="输入文件，默认 data/sample_cases.json"
+    )
+    parser.add_argument("--batch-size", type=int, default=500, help=f"每批行数 (上限 {MAX_BATCH_SIZE})")
+    parser.add_argument("--on-conflict", choices=("skip", "update"), default="skip", help="slug 已存在时跳过 (默认) 或更新")
+    parser.add_argument("--restart", action="store_true", help="忽略检查点，从头导入")
+    args = parser.parse_args()
+    if not args.input.exists():
+        print(f"❌ 错误：找不到数据文件 {args.input}")
+        sys.exit(1)
+    args.batch_size = max(1, min(args.batch_size, MAX_BATCH_SIZE))
+    sys.exit(asyncio.run(main(args)))
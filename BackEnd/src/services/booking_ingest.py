@@ -0,0 +1,315 @@
+# BackEnd/src/services/booking_ingest.py
+"""
+预约缓冲写入 (BOOKING_INGEST_MODE=buffered)
+
+务实逻辑：
+1. 受理：提交内容追加到本机 SQLite 预写缓冲 (WAL + synchronous=FULL)，落盘后才返回 202；
+   同一时刻到达的提交合并为一个事务 (组提交)，一次 fsync 确认一批，受理过程不占用数据库连接；
+2. 入库：后台任务每 BOOKING_FLUSH_INTERVAL 秒领取一批 (带租约，多个 worker 不会同时领取同一行)，
+   一条 INSERT ... ON CONFLICT (ingest_id) DO NOTHING 写入 bookings 并同步未读计数与新预约提醒，提交后再从缓冲删除；
+3. 不丢失：进程退出时未入库的记录留在缓冲文件中，租约到期后由任一 worker 重新领取；
+   "入库已提交、缓冲未删除"时重启造成的重复写入由 ingest_id 唯一约束吸收。
+整批因个别记录违反约束而失败时逐条重试，无法入库的记录标记为失败并保留在缓冲中供人工处理。
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+from ..config import BASE_DIR, settings
+from ..database import AsyncSessionLocal, DBBooking
+from .booking_stats import adjust_unread
+from .notifications import notify_booking_created
+
+logger = logging.getLogger("BOOKING_INGEST")
+
+# 领取后超过该时间 (秒) 仍未确认，视为处理者已退出，可被重新领取
+_LEASE_SECONDS = 30
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS booking_buffer (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        ingest_id TEXT NOT NULL UNIQUE,
+        payload TEXT NOT NULL,
+        accepted_at REAL NOT NULL,
+        claimed_until REAL NOT NULL DEFAULT 0,
+        failed INTEGER NOT NULL DEFAULT 0
+    )
+"""
+
+BufferRow = Tuple[int, str, str, float]  # (seq, ingest_id, payload, accepted_at)
+
+
+class BookingBuffer:
+    def __init__(self, path: Path, flush_interval: float, batch_size: int, queue_max: int):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue_max = queue_max
+        self._conn: Optional[sqlite3.Connection] = None
+        # SQLite 连接只在这一个线程中使用；写入、领取、确认天然串行
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._waiting: List[Tuple[Tuple[str, str, float], asyncio.Future]] = []
+        self._writer: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+        self.accepted = 0
+        self.rejected = 0
+        self.group_commits = 0
+        self.flushed = 0
+        self.duplicates = 0
+        self.failed_rows = 0
+        self.flush_failures = 0
+        self.last_flush_ms = 0.0
+
+    # ==========================================
+    # 1. 缓冲文件操作 (在专用线程中同步执行)
+    # ==========================================
+
+    def _open_sync(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")  # 每次提交都 fsync：返回 202 时记录已经落盘
+        conn.execute(_SCHEMA)
+        self._conn = conn
+
+    def _transaction(self, statements: Sequence[Tuple[str, Sequence[Any]]]) -> None:
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, rows in statements:
+                conn.executemany(sql, rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _append_sync(self, rows: List[Tuple[str, str, float]]) -> None:
+        self._transaction([("INSERT INTO booking_buffer (ingest_id, payload, accepted_at) VALUES (?, ?, ?)", rows)])
+
+    def _claim_sync(self, limit: int) -> List[BufferRow]:
+        now = time.time()
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT seq, ingest_id, payload, accepted_at FROM booking_buffer "
+                "WHERE failed = 0 AND claimed_until < ? ORDER BY seq LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE booking_buffer SET claimed_until = ? WHERE seq = ?",
+                [(now + _LEASE_SECONDS, row[0]) for row in rows],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return rows
+
+    def _ack_sync(self, seqs: List[int]) -> None:
+        self._transaction([("DELETE FROM booking_buffer WHERE seq = ?", [(seq,) for seq in seqs])])
+
+    def _release_sync(self, seqs: List[int]) -> None:
+        self._transaction([("UPDATE booking_buffer SET claimed_until = 0 WHERE seq = ?", [(seq,) for seq in seqs])])
+
+    def _mark_failed_sync(self, seqs: List[int]) -> None:
+        self._transaction([("UPDATE booking_buffer SET failed = 1 WHERE seq = ?", [(seq,) for seq in seqs])])
+
+    def _backlog_sync(self) -> Tuple[int, int]:
+        pending, failed = self._conn.execute(
+            "SELECT count(*) - coalesce(sum(failed), 0), coalesce(sum(failed), 0) FROM booking_buffer"
+        ).fetchone()
+        return pending, failed
+
+    async def _run_sync(self, fn, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="booking-buffer")
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._open_sync)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # ==========================================
+    # 2. 受理 (组提交)
+    # ==========================================
+
+    async def submit(self, payload: Dict[str, Any]) -> str:
+        """追加一条预约，落盘后返回 ingest_id；缓冲写入失败时抛出原异常"""
+        if len(self._waiting) >= self.queue_max:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="提交人数较多，请稍后重试 / Booking buffer is busy",
+            )
+        ingest_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.append(((ingest_id, json.dumps(payload, ensure_ascii=False), time.time()), future))
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_waiting())
+        await future
+        self.accepted += 1
+        return ingest_id
+
+    async def _write_waiting(self) -> None:
+        # 上一批 fsync 期间到达的提交自然汇成下一批
+        while self._waiting:
+            batch, self._waiting = self._waiting, []
+            try:
+                await self._run_sync(self._append_sync, [row for row, _ in batch])
+            except Exception as e:
+                logger.error(f"❌ 预约缓冲写入失败 ({len(batch)} 条): {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.group_commits += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    # ==========================================
+    # 3. 批量入库
+    # ==========================================
+
+    async def _insert(self, rows: List[BufferRow]) -> int:
+        values = [
+            {
+                **json.loads(payload),
+                "status": "pending",
+                "is_read": False,
+                "created_at": datetime.fromtimestamp(accepted_at, timezone.utc),
+                "ingest_id": ingest_id,
+            }
+            for _, ingest_id, payload, accepted_at in rows
+        ]
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                pg_insert(DBBooking)
+                .values(values)
+                .on_conflict_do_nothing(index_elements=[DBBooking.ingest_id])
+                .returning(DBBooking.ingest_id)
+            )
+            inserted = list(result.scalars())
+            # 只为本次真正写入的预约发提醒 (重复入库被去重的不再重复提醒)
+            by_ingest_id = {value["ingest_id"]: value for value in values}
+            for ingest_id in inserted:
+                notify_booking_created(db, by_ingest_id[ingest_id])
+            await db.flush()
+            await adjust_unread(db, len(inserted))
+            await db.commit()
+        return len(inserted)
+
+    async def _insert_one_by_one(self, rows: List[BufferRow]) -> Tuple[int, List[int]]:
+        """整批被个别记录拖累时逐条入库；仍然失败的记录标记为失败，不再阻塞后续批次"""
+        inserted, failed = 0, []
+        for row in rows:
+            try:
+                inserted += await self._insert([row])
+            except (IntegrityError, DataError) as e:
+                logger.error(f"❌ 预约 {row[1]} 无法入库，已保留在缓冲中: {e}")
+                failed.append(row[0])
+        if failed:
+            await self._run_sync(self._mark_failed_sync, failed)
+            self.failed_rows += len(failed)
+        return inserted, failed
+
+    async def flush(self) -> int:
+        """领取并入库一批，返回领取的行数 (0 表示缓冲已空)"""
+        rows = await self._run_sync(self._claim_sync, self.batch_size)
+        if not rows:
+            return 0
+        started = time.perf_counter()
+        seqs = [row[0] for row in rows]
+        failed: List[int] = []
+        try:
+            try:
+                inserted = await self._insert(rows)
+            except (IntegrityError, DataError):
+                inserted, failed = await self._insert_one_by_one(rows)
+        except Exception:
+            # 数据库不可用等：立即释放租约，下个周期重试
+            self.flush_failures += 1
+            await self._run_sync(self._release_sync, seqs)
+            raise
+        await self._run_sync(self._ack_sync, [seq for seq in seqs if seq not in failed])
+
+        self.flushed += inserted
+        self.duplicates += len(rows) - inserted - len(failed)
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+        return len(rows)
+
+    async def drain(self) -> None:
+        """把缓冲中可入库的记录全部写入 (关闭前与基准脚本使用)"""
+        while await self.flush():
+            pass
+
+    async def backlog(self) -> Tuple[int, int]:
+        """(待入库行数, 失败行数)：读取共享的缓冲文件，包含其它 worker 受理的记录"""
+        return await self._run_sync(self._backlog_sync)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.flush()
+            except Exception as e:
+                logger.warning(f"⚠️ 预约批量入库失败，稍后重试: {e}")
+                claimed = 0
+            # 整批领满说明还有积压，立即继续
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.flush_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._writer is not None:
+            await asyncio.gather(self._writer, return_exceptions=True)
+        if self._executor is None:
+            return
+        try:
+            await self.drain()  # 退出前尽量入库；失败的留在缓冲文件中，下次启动继续
+        except Exception as e:
+            logger.warning(f"⚠️ 退出前入库未完成，剩余记录保留在 {self.path}: {e}")
+        await self._run_sync(self._conn.close)
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": settings.BOOKING_INGEST_MODE,
+            "waiting": len(self._waiting),
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "group_commits": self.group_commits,
+            "flushed": self.flushed,
+            "duplicates": self.duplicates,
+            "failed_rows": self.failed_rows,
+            "flush_failures": self.flush_failures,
+            "last_flush_ms": round(self.last_flush_ms, 1),
+        }
+
+
+# 全局单例：由 main.py 的 lifespan 启动与关闭
+booking_buffer = BookingBuffer(
+    path=Path(settings.BOOKING_BUFFER_PATH) if settings.BOOKING_BUFFER_PATH else BASE_DIR / "data" / "booking_buffer.db",
+    flush_interval=settings.BOOKING_FLUSH_INTERVAL,
+    batch_size=settings.BOOKING_FLUSH_BATCH,
+    queue_max=settings.BOOKING_BUFFER_QUEUE_MAX,
+)
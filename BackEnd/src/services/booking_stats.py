@@ -0,0 +1,56 @@
+# BackEnd/src/services/booking_stats.py
+import random
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import DBBooking, DBBookingStats
+
+# 计数分槽：每个事务随机增减其中一行，读取时求和。
+# 单行计数会让所有公开提交在同一把行锁上排队；分成多行后并发提交大多落在不同的行上
+_SLOTS = 8
+
+
+async def adjust_unread(db: AsyncSession, delta: int) -> None:
+    """
+    在调用方的事务中增减未读数 (随预约的写入一起提交或回滚)。
+    计数行会锁到事务结束，调用方应在提交前最后一步调用，缩短持锁时间。
+    计数行尚不完整时不做任何事：首次读取会按实际行数初始化。
+    """
+    if delta:
+        await db.execute(
+            update(DBBookingStats)
+            .where(DBBookingStats.id == random.randint(1, _SLOTS))
+            .values(unread_count=DBBookingStats.unread_count + delta)
+        )
+
+
+async def recount_unread(db: AsyncSession) -> int:
+    """按 bookings 表重新统计未读数并写入计数行 (初始化或人工校准时使用，由调用方提交)"""
+    # 先锁住全部计数行再统计：READ COMMITTED 下取锁之后的 COUNT 能看到持锁事务已提交的预约，
+    # 校准结果不会抵消它们的增减；尚未调整计数的事务在校准提交后照常增减
+    await db.execute(select(DBBookingStats.id).order_by(DBBookingStats.id).with_for_update())
+    count = await db.scalar(
+        select(func.count()).select_from(DBBooking).where(DBBooking.is_read == False)
+    )
+    stmt = pg_insert(DBBookingStats).values([
+        {"id": slot, "unread_count": count if slot == 1 else 0} for slot in range(1, _SLOTS + 1)
+    ])
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[DBBookingStats.id],
+        set_={"unread_count": stmt.excluded.unread_count},
+    ))
+    await db.execute(delete(DBBookingStats).where(DBBookingStats.id > _SLOTS))
+    return count
+
+
+async def get_unread_count(db: AsyncSession) -> int:
+    """读取并汇总计数行；计数行不完整 (例如由 create_all 建表的新库) 时统计一次并补建"""
+    total, slots = (await db.execute(
+        select(func.coalesce(func.sum(DBBookingStats.unread_count), 0), func.count())
+    )).one()
+    if slots != _SLOTS:
+        total = await recount_unread(db)
+        await db.commit()
+    return total
@@ -0,0 +1,67 @@
+# BackEnd/src/services/case_query.py
+from typing import Hashable, List, Optional, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import defer
+
+from ..database import DBCase
+from .category_service import CategoryService
+
+
+# 列表卡片 (CaseResponse) 不输出长文本描述：列表查询不取这两列。
+# raiseload：若有代码误访问，立即报错，而不是在异步会话里触发隐式懒加载
+CASE_LIST_OPTIONS = (
+    defer(DBCase.description, raiseload=True),
+    defer(DBCase.detailed_description, raiseload=True),
+)
+
+
+def case_list_query():
+    """列表查询基础语句 (只加载列表所需列)；详情接口仍取整行"""
+    return select(DBCase).options(*CASE_LIST_OPTIONS)
+
+
+def _containment_any(column, values: List[str]):
+    """
+    标签任选其一：多个 @> 条件用 OR 连接。
+    务实：jsonb_path_ops GIN 索引只支持 @>，不支持 ?| ；
+    PostgreSQL 会把多个 @> 组合成 BitmapOr，依旧走索引。
+    """
+    conditions = [column.contains([value]) for value in values]
+    return conditions[0] if len(conditions) == 1 else or_(*conditions)
+
+
+def apply_case_filters(
+        query,
+        categories: Optional[List[str]] = None,
+        styles: Optional[List[str]] = None,
+        year: Optional[int] = None,
+        featured: Optional[bool] = None
+) -> Tuple[object, Hashable]:
+    """
+    为案例查询附加公开筛选条件，返回 (查询, 条件键)。
+    条件键经过规范化 (转换、去重、排序)，供总数缓存使用。
+    """
+    backend_categories: Tuple[str, ...] = ()
+    if categories:
+        # 核心逻辑：自动将前端 Slug 转换为后端 Label (未知 Slug 原样使用)
+        backend_categories = tuple(sorted({
+            CategoryService.frontend_to_backend(slug) or slug
+            for slug in categories if slug
+        }))
+        if backend_categories:
+            query = query.where(_containment_any(DBCase.categories, list(backend_categories)))
+
+    style_values: Tuple[str, ...] = ()
+    if styles:
+        style_values = tuple(sorted({style for style in styles if style}))
+        if style_values:
+            query = query.where(_containment_any(DBCase.styles, list(style_values)))
+
+    if year is not None:
+        query = query.where(DBCase.year == year)
+
+    if featured is not None:
+        query = query.where(DBCase.featured == featured)
+
+    return query, (backend_categories, style_values, year, featured)
@@ -0,0 +1,92 @@
+# BackEnd/src/services/count_cache.py
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+
+
+class CountCache:
+    """
+    列表总数缓存
+    务实逻辑：
+    1. 精确总数按 (表, 过滤条件) 缓存，cases/products 写入时整表失效；
+    2. 开启估算模式时，无过滤条件的大表直接读取 pg_class.reltuples，不再全表 COUNT；
+    3. 失效计数 (generation) 防止"查询进行中被失效"后把旧值写回缓存。
+    多 worker 部署时只能失效本进程缓存，TTL 兜底其他进程的陈旧时间。
+    """
+
+    def __init__(self, ttl: int, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[int, bool, float]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.estimates = 0
+
+    def invalidate(self, table: str) -> None:
+        self._generations[table] = self._generations.get(table, 0) + 1
+        for key in [k for k in self._entries if k[0] == table]:
+            del self._entries[key]
+
+    async def _estimate(self, db: AsyncSession, table: str) -> int:
+        result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table},
+        )
+        # 从未 ANALYZE 的表 reltuples 为 -1
+        return result.scalar() or -1
+
+    async def count(
+            self,
+            db: AsyncSession,
+            table: str,
+            filters: Hashable,
+            query,
+            allow_estimate: bool = False
+    ) -> Tuple[int, bool]:
+        """返回 (总数, 是否精确)。allow_estimate 仅应在无过滤条件时传入 True"""
+        key = (table, filters)
+        now = time.monotonic()
+        cached = self._entries.get(key)
+        if cached is not None and cached[2] > now:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return cached[0], cached[1]
+
+        self.misses += 1
+        generation = self._generations.get(table, 0)
+        total, exact = None, True
+
+        if allow_estimate and settings.COUNT_STRATEGY == "estimate":
+            estimate = await self._estimate(db, table)
+            if estimate >= settings.COUNT_ESTIMATE_MIN_ROWS:
+                total, exact = estimate, False
+                self.estimates += 1
+
+        if total is None:
+            result = await db.execute(select(func.count()).select_from(query.subquery()))
+            total = result.scalar() or 0
+
+        if self._generations.get(table, 0) == generation:
+            self._entries[key] = (total, exact, now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return total, exact
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "estimates": self.estimates,
+            "strategy": settings.COUNT_STRATEGY,
+        }
+
+
+count_cache = CountCache(ttl=settings.COUNT_CACHE_TTL)
@@ -0,0 +1,178 @@
+# BackEnd/src/services/image_processor.py
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from PIL import Image
+
+from ..config import settings
+
+# 子进程同样需要像素上限防护 (spawn 模式下不会继承父进程的设置)
+Image.MAX_IMAGE_PIXELS = 100_000_000
+
+logger = logging.getLogger("IMAGE_PROCESSOR")
+
+
+# ==========================================
+# 1. 子进程任务 (必须是模块级函数，便于 pickle)
+# ==========================================
+
+def _save_atomic(img: "Image.Image", path: Path, **params: Any) -> None:
+    """先写临时文件再原子替换：相同内容的并发上传不会读到半截文件"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    img.save(tmp_path, "WEBP", **params)
+    os.replace(tmp_path, path)
+
+
+def process_case_image(source_path: str, upload_dir: str, file_key: str) -> Dict[str, str]:
+    """
+    案例图片处理：WebP 高清图 + 600px 缩略图
+    运行在进程池中，不占用事件循环；直接从临时文件路径读取，不经过内存拷贝。
+    """
+    target = Path(upload_dir)
+    img = Image.open(source_path)
+    if img.mode in ("RGBA", "P"):
+        img = img.convert("RGB")
+
+    # 先写缩略图：高清图存在即代表整组文件已就绪 (去重判断依赖这一点)
+    thumb_img = img.copy()
+    thumb_img.thumbnail((600, 600), Image.Resampling.LANCZOS)
+    thumb_filename = f"{file_key}_thumb.webp"
+    _save_atomic(thumb_img, target / thumb_filename, quality=75)
+
+    hd_filename = f"{file_key}.webp"
+    _save_atomic(img, target / hd_filename, quality=85, optimize=True)
+
+    return {"hd_filename": hd_filename, "thumb_filename": thumb_filename}
+
+
+def _timed_call(fn: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[Any, float]:
+    """在子进程内计时，区分真实处理耗时与排队耗时"""
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+# ==========================================
+# 2. 进程池调度器
+# ==========================================
+
+class ImageProcessor:
+    """
+    图片处理专用进程池
+    务实逻辑：
+    1. 子进程数默认等于 CPU 核数，Pillow 解码/编码不再阻塞 API 进程；
+    2. 排队上限 (max_pending) 之外的任务直接 503，由前端稍后重试；
+    3. 记录最近任务的排队/处理耗时，用于评估上传高峰下的池大小。
+    """
+
+    def __init__(self, max_workers: int = 0, max_pending: int = 16, history: int = 200):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max(max_pending, 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._run_times: Deque[float] = deque(maxlen=history)
+        self._wait_times: Deque[float] = deque(maxlen=history)
+
+    # --- 生命周期 ---
+    def start(self) -> None:
+        if self._executor is None:
+            # spawn：避免 fork 带走事件循环与数据库连接等状态
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def shutdown(self) -> None:
+        # 不等待运行中的任务：在 lifespan 中调用，wait=True 会阻塞事件循环直到 Pillow 任务结束；
+        # 排队中的任务取消，子进程在当前任务完成后退出
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # --- 任务提交 ---
+    async def submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """提交任务并等待结果；队列已满时抛出 503"""
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="图片处理繁忙，请稍后重试 / Image processor busy",
+                headers={"Retry-After": "5"},
+            )
+
+        self.start()
+        executor = self._executor
+        self._pending += 1
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, run_time = await loop.run_in_executor(executor, _timed_call, fn, args)
+        except BrokenProcessPool:
+            # 子进程异常退出 (如 OOM)：关闭并丢弃旧池，下次提交时重建；
+            # 只在当前池仍是出错的那个时才清除，避免旧池迟到的失败丢掉其它请求已重建的新池
+            self._failed += 1
+            if self._executor is executor:
+                self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        total = time.perf_counter() - submitted
+        self._completed += 1
+        self._run_times.append(run_time)
+        self._wait_times.append(max(total - run_time, 0.0))
+        logger.info(
+            f"🖼️ {fn.__name__} 完成: 处理 {run_time * 1000:.0f}ms, "
+            f"排队 {(total - run_time) * 1000:.0f}ms, 当前积压 {self._pending}"
+        )
+        return result
+
+    # --- 监控指标 ---
+    @staticmethod
+    def _summary(samples: Deque[float]) -> Dict[str, float]:
+        if not samples:
+            return {"avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(samples)
+        pick = lambda q: ordered[min(int(len(ordered) * q), len(ordered) - 1)] * 1000
+        return {
+            "avg_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+            "p50_ms": round(pick(0.50), 1),
+            "p95_ms": round(pick(0.95), 1),
+            "max_ms": round(ordered[-1] * 1000, 1),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._pending,
+            "queue_depth": max(self._pending - self.max_workers, 0),
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "run_time": self._summary(self._run_times),
+            "queue_wait": self._summary(self._wait_times),
+        }
+
+
+# 全局单例：由 main.py 的 lifespan 启动与关闭
+image_processor = ImageProcessor(
+    max_workers=settings.IMAGE_WORKERS,
+    max_pending=settings.IMAGE_QUEUE_MAX,
+)
@@ -0,0 +1,203 @@
+# BackEnd/src/services/image_variants.py
+import asyncio
+import os
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from PIL import Image
+
+from ..config import settings
+
+# 定位上传目录：衍生图缓存放在 uploads/variants 下，前置代理也可以直接当静态文件命中
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+UPLOAD_DIR = BASE_DIR / "public" / "uploads"
+VARIANT_DIR = UPLOAD_DIR / "variants"
+
+# 只接受上传接口生成的文件名，防止路径穿越
+_STEM_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+_UPLOAD_URL_PATTERN = re.compile(r"^/uploads/([A-Za-z0-9_-]+)\.webp$")
+
+
+# ==========================================
+# 1. 格式支持探测
+# ==========================================
+
+@lru_cache(maxsize=1)
+def supported_formats() -> Dict[str, str]:
+    """当前 Pillow 可编码的衍生图格式 -> MIME (AVIF 需要 Pillow 11.3+ 或 avif 插件)"""
+    Image.init()
+    formats = {"webp": "image/webp"}
+    if "AVIF" in Image.SAVE:
+        formats["avif"] = "image/avif"
+    return formats
+
+
+# ==========================================
+# 2. 子进程任务：生成单个衍生图
+# ==========================================
+
+def render_variant(source: str, target: str, width: int, fmt: str) -> int:
+    """按宽度等比缩放并编码，先写临时文件再原子替换，返回文件字节数"""
+    img = Image.open(source)
+    if img.mode in ("RGBA", "P"):
+        img = img.convert("RGB")
+    if img.width > width:
+        # 只缩不放：原图比目标还窄时直接转码
+        img.thumbnail((width, img.height), Image.Resampling.LANCZOS)
+
+    target_path = Path(target)
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target_path.with_name(f".{target_path.name}.{os.getpid()}.tmp")
+    if fmt == "avif":
+        img.save(tmp_path, "AVIF", quality=60)
+    else:
+        img.save(tmp_path, "WEBP", quality=80, method=4)
+    os.replace(tmp_path, target_path)
+    return target_path.stat().st_size
+
+
+# ==========================================
+# 3. 磁盘缓存 (按总字节数 LRU 淘汰)
+# ==========================================
+
+class VariantCache:
+    """
+    衍生图磁盘缓存
+    务实逻辑：
+    1. 命中时直接返回文件路径，不再解码；
+    2. 未命中时交给图片进程池生成，同一衍生图的并发请求只生成一次；
+    3. 总大小超过上限后按最近访问时间淘汰。
+    多 worker 共享同一目录，各自维护 LRU 视图，淘汰前后都以磁盘为准。
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _load(self) -> None:
+        """首次使用时扫描已有缓存，按访问时间排序重建 LRU"""
+        self._loaded = True
+        if not self.directory.exists():
+            return
+        files = []
+        for path in self.directory.rglob("*"):
+            if path.is_file() and not path.name.startswith("."):
+                st = path.stat()
+                files.append((st.st_atime, str(path.relative_to(self.directory)), st.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total += size
+
+    def _touch(self, key: str) -> None:
+        self._entries.move_to_end(key)
+
+    def _add(self, key: str, size: int) -> None:
+        self._total += size - self._entries.pop(key, 0)
+        self._entries[key] = size
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            old_key, old_size = self._entries.popitem(last=False)
+            self._total -= old_size
+            self.evictions += 1
+            try:
+                (self.directory / old_key).unlink()
+            except FileNotFoundError:
+                pass
+
+    async def get_or_create(self, stem: str, width: int, fmt: str, submit) -> Path:
+        """
+        获取衍生图路径。
+        submit: 图片进程池的提交函数 (ImageProcessor.submit)
+        """
+        if not self._loaded:
+            self._load()
+
+        key = f"{width}/{stem}.{fmt}"
+        path = self.directory / key
+        if key in self._entries:
+            if path.exists():
+                self.hits += 1
+                self._touch(key)
+                return path
+            # 被其他 worker 淘汰，按未命中处理
+            self._total -= self._entries.pop(key)
+        elif path.exists():
+            # 其他 worker 生成的文件：纳入本进程的 LRU 视图
+            self.hits += 1
+            self._add(key, path.stat().st_size)
+            return path
+
+        source = UPLOAD_DIR / f"{stem}.webp"
+        if not source.exists():
+            raise FileNotFoundError(key)
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            await asyncio.shield(pending)
+            return path
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            size = await submit(render_variant, str(source), str(path), width, fmt)
+            self._add(key, size)
+            future.set_result(path)
+            return path
+        except BaseException as exc:
+            future.set_exception(exc)
+            # 避免无人等待时出现 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+variant_cache = VariantCache(VARIANT_DIR, settings.IMAGE_VARIANT_CACHE_MAX_MB * 1024 * 1024)
+
+
+# ==========================================
+# 4. srcset 构造 (供 Pydantic 模型使用)
+# ==========================================
+
+def variant_url(stem: str, width: int, fmt: str = "webp") -> str:
+    return f"/uploads/variants/{width}/{stem}.{fmt}"
+
+
+def build_srcset(url: Optional[str], fmt: str = "webp") -> Optional[str]:
+    """
+    为本站上传的图片生成 srcset；外链或旧数据 (如 /images/...) 返回 None，
+    前端此时回退到 url/thumbnail_url。
+    """
+    if not url:
+        return None
+    match = _UPLOAD_URL_PATTERN.match(url)
+    if not match or fmt not in supported_formats():
+        return None
+    stem = match.group(1)
+    return ", ".join(
+        f"{variant_url(stem, width, fmt)} {width}w" for width in settings.IMAGE_VARIANT_WIDTHS
+    )
+
+
+def is_valid_stem(stem: str) -> bool:
+    return bool(_STEM_PATTERN.match(stem))
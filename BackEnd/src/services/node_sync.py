@@ -0,0 +1,79 @@
+# BackEnd/src/services/node_sync.py
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import DBNode
+
+_FIELDS = ("node_name", "target_percent", "status")
+
+
+async def sync_nodes(db: AsyncSession, project_id: int, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    按差异同步项目节点 (调用方负责事务与项目行锁)。
+    务实逻辑：
+    1. 先按 id、再按节点名称与现有节点配对 (每个现有节点只配对一次)；
+    2. 配对成功且字段有变化的批量 UPDATE，未配对的新节点批量 INSERT，未出现的旧节点批量 DELETE；
+    3. 保留节点 id：施工日志的 node_id 关联不受影响，只有被删除节点的日志按外键置空。
+    状态变为 completed 时补记完成时间，离开 completed 时清空。
+    """
+    result = await db.execute(
+        select(DBNode.id, DBNode.node_name, DBNode.target_percent, DBNode.status)
+        .where(DBNode.project_id == project_id)
+        .order_by(DBNode.id)
+    )
+    existing = {row.id: row for row in result}
+    unmatched = dict(existing)
+
+    def take(item: Dict[str, Any]) -> Optional[int]:
+        node_id = item.get("id")
+        if node_id in unmatched:
+            del unmatched[node_id]
+            return node_id
+        for candidate_id, row in unmatched.items():
+            if row.node_name == item["node_name"]:
+                del unmatched[candidate_id]
+                return candidate_id
+        return None
+
+    now = datetime.now(timezone.utc)
+    inserts: List[Dict[str, Any]] = []
+    updates: List[Dict[str, Any]] = []
+    for item in items:
+        node_id = take(item)
+        if node_id is None:
+            inserts.append({
+                "project_id": project_id,
+                **{field: item[field] for field in _FIELDS},
+                "completed_at": now if item["status"] == "completed" else None,
+            })
+            continue
+
+        row = existing[node_id]
+        changes = {field: item[field] for field in _FIELDS if getattr(row, field) != item[field]}
+        if not changes:
+            continue
+        if "status" in changes:
+            changes["completed_at"] = now if item["status"] == "completed" else None
+        updates.append({"id": node_id, **changes})
+
+    deleted = list(unmatched)
+    if deleted:
+        await db.execute(
+            delete(DBNode).where(DBNode.id.in_(deleted)).execution_options(synchronize_session=False)
+        )
+    if updates:
+        # ORM 按主键批量更新：字段集合相同的行合并为一次 executemany
+        await db.execute(update(DBNode), updates)
+    created: List[int] = []
+    if inserts:
+        created = list((await db.execute(insert(DBNode).returning(DBNode.id), inserts)).scalars())
+
+    return {
+        "created": created,
+        "updated": [row["id"] for row in updates],
+        "deleted": deleted,
+        "unchanged": len(existing) - len(deleted) - len(updates),
+    }
@@ -0,0 +1,241 @@
+# BackEnd/src/services/notifications.py
+"""
+通知发件箱 (transactional outbox)
+
+务实逻辑：
+1. 业务接口只在自身事务中写入 notification_outbox (与预约、日志等数据一起提交或回滚)，请求内不连接 SMTP；
+2. 后台投递任务每 MAIL_DISPATCH_INTERVAL 秒领取一批到期通知 (FOR UPDATE SKIP LOCKED，多 worker 互不重复)，
+   领取时顺延 next_attempt_at 作为租约并立即提交，发送期间不占用数据库连接；
+3. 通过 SMTPPool 复用连接并发发送，结果一次批量写回：成功标记 sent；临时失败按指数退避重试；
+   永久失败 (5xx) 或次数用尽标记 failed。
+投递语义为"至少一次"：发送成功后、写回结果前进程退出，租约到期后会重发。
+"""
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import AsyncSessionLocal, DBNotification, DBProject
+from ..utils.mailer import SMTPPool, build_message, is_permanent_failure
+
+logger = logging.getLogger("NOTIFICATIONS")
+
+# 领取后多久未写回结果视为投递进程已退出，可被重新领取 (秒)
+_LEASE_SECONDS = 300
+_MAX_BACKOFF = 3600
+
+_CLAIM_SQL = text("""
+    UPDATE notification_outbox
+    SET attempts = attempts + 1, next_attempt_at = now() + make_interval(secs => :lease)
+    WHERE id IN (
+        SELECT id FROM notification_outbox
+        WHERE status = 'pending' AND next_attempt_at <= now()
+        ORDER BY next_attempt_at, id
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, recipient, subject, body, attempts
+""")
+
+
+# ==========================================
+# 1. 写入发件箱 (调用方负责提交)
+# ==========================================
+
+def enqueue_email(db: AsyncSession, kind: str, recipients: Iterable[str], subject: str, body: str) -> int:
+    """为每个收件人加入一条待发送通知；未配置邮件服务时不写入。返回写入条数"""
+    if not settings.MAIL_ENABLED:
+        return 0
+    unique = list(dict.fromkeys(r.strip() for r in recipients if r and r.strip()))
+    db.add_all([
+        DBNotification(kind=kind, recipient=recipient, subject=subject[:255], body=body)
+        for recipient in unique
+    ])
+    return len(unique)
+
+
+def notify_booking_created(db: AsyncSession, booking: Dict[str, Any]) -> int:
+    """新预约提醒 (发给 MAIL_ADMIN_RECIPIENTS)"""
+    subject = f"【新预约】{booking['user_name']} · {booking.get('project_type') or '未填写类型'}"
+    body = "\n".join([
+        "收到新的客户预约：",
+        "",
+        f"姓名：{booking['user_name']}",
+        f"联系方式：{booking['contact_info']}",
+        f"项目类型：{booking.get('project_type') or '-'}",
+        f"预算：{booking.get('budget') or '-'}",
+        f"留言：{booking.get('message') or '-'}",
+        f"来源页面：{booking.get('source_url') or '-'}",
+        "",
+        "请登录管理后台处理。",
+    ])
+    return enqueue_email(db, "booking_created", settings.MAIL_ADMIN_RECIPIENTS, subject, body)
+
+
+async def notify_project_reply(db: AsyncSession, project_id: int, content: str, operator: str) -> int:
+    """施工日志 / 管理员回复：通知业主 (项目未填写邮箱时跳过)"""
+    if not settings.MAIL_ENABLED:
+        return 0
+    row = (await db.execute(
+        select(DBProject.project_no, DBProject.client_name, DBProject.client_email)
+        .where(DBProject.id == project_id)
+    )).one_or_none()
+    if row is None or not row.client_email:
+        return 0
+    subject = f"【项目进度】{row.project_no} 有新的施工动态"
+    body = "\n".join([
+        f"{row.client_name}，您好：",
+        "",
+        f"您的项目 {row.project_no} 有新的施工动态 ({operator})：",
+        "",
+        content,
+        "",
+        "可登录业主端查看完整进度与现场照片。",
+        f"—— {settings.MAIL_FROM_NAME}",
+    ])
+    return enqueue_email(db, "project_reply", [row.client_email], subject, body)
+
+
+def notify_node_confirmed(db: AsyncSession, project: DBProject, node_name: str, feedback: str) -> int:
+    """业主确认节点验收：提醒管理端"""
+    subject = f"【验收确认】{project.project_no} · {node_name}"
+    body = "\n".join([
+        f"业主 {project.client_name} 已确认项目 {project.project_no} 的节点【{node_name}】验收。",
+        f"当前总进度：{project.current_progress}%",
+        "",
+        f"业主反馈：{feedback}",
+    ])
+    return enqueue_email(db, "node_confirmed", settings.MAIL_ADMIN_RECIPIENTS, subject, body)
+
+
+# ==========================================
+# 2. 后台投递
+# ==========================================
+
+class NotificationDispatcher:
+    def __init__(self, pool: SMTPPool, interval: float, batch_size: int, max_attempts: int, retry_base: int):
+        self.pool = pool
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.dispatch_errors = 0
+        self.last_batch_ms = 0.0
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.retry_base * 2 ** (attempts - 1), _MAX_BACKOFF)
+        return delay * random.uniform(0.8, 1.2)  # 抖动：避免同一批失败的通知同时重试
+
+    async def _send(self, row) -> Optional[BaseException]:
+        message = build_message(settings.MAIL_FROM, settings.MAIL_FROM_NAME, row.recipient, row.subject, row.body)
+        try:
+            await self.pool.send(message)
+        except Exception as e:
+            return e
+        return None
+
+    async def dispatch_once(self) -> int:
+        """领取并发送一批，返回领取条数 (0 表示当前没有到期通知)"""
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(_CLAIM_SQL, {"lease": _LEASE_SECONDS, "limit": self.batch_size})).all()
+            await db.commit()
+        if not rows:
+            return 0
+
+        started = time.perf_counter()
+        # 并发度由连接池大小限制
+        errors = await asyncio.gather(*(self._send(row) for row in rows))
+
+        now = datetime.now(timezone.utc)
+        updates: List[Dict[str, Any]] = []
+        for row, error in zip(rows, errors):
+            if error is None:
+                self.sent += 1
+                updates.append({"id": row.id, "status": "sent", "sent_at": now, "last_error": None})
+            elif is_permanent_failure(error) or row.attempts >= self.max_attempts:
+                self.failed += 1
+                logger.error(f"❌ 通知 {row.id} 投递失败 ({row.recipient})，不再重试: {error}")
+                updates.append({"id": row.id, "status": "failed", "last_error": str(error)[:1000]})
+            else:
+                self.retried += 1
+                updates.append({
+                    "id": row.id,
+                    "next_attempt_at": now + timedelta(seconds=self._backoff(row.attempts)),
+                    "last_error": str(error)[:1000],
+                })
+
+        async with AsyncSessionLocal() as db:
+            # ORM 按主键批量更新：字段集合相同的行合并为一次 executemany
+            await db.execute(update(DBNotification), updates)
+            await db.commit()
+        self.batches += 1
+        self.last_batch_ms = (time.perf_counter() - started) * 1000
+        return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.dispatch_once()
+            except Exception as e:
+                self.dispatch_errors += 1
+                logger.warning(f"⚠️ 通知投递失败，稍后重试: {e}")
+                claimed = 0
+            # 整批领满说明还有积压，立即继续
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.pool.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.MAIL_ENABLED,
+            "batches": self.batches,
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "dispatch_errors": self.dispatch_errors,
+            "last_batch_ms": round(self.last_batch_ms, 1),
+            "smtp": self.pool.stats(),
+        }
+
+
+# 全局单例：由 main.py 的 lifespan 启动与关闭 (仅在配置了邮件服务时启动)
+notification_dispatcher = NotificationDispatcher(
+    pool=SMTPPool(
+        hostname=settings.MAIL_SERVER,
+        port=settings.MAIL_PORT,
+        username=settings.MAIL_USERNAME,
+        password=settings.MAIL_PASSWORD,
+        use_tls=settings.MAIL_SSL_TLS,
+        start_tls=settings.MAIL_STARTTLS,
+        size=settings.MAIL_POOL_SIZE,
+        idle_timeout=settings.MAIL_POOL_IDLE,
+    ),
+    interval=settings.MAIL_DISPATCH_INTERVAL,
+    batch_size=settings.MAIL_BATCH_SIZE,
+    max_attempts=settings.MAIL_MAX_ATTEMPTS,
+    retry_base=settings.MAIL_RETRY_BASE,
+)
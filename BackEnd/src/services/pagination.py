@@ -0,0 +1,69 @@
+# BackEnd/src/services/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import desc, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# ==========================================
+# 1. 游标编解码 (对前端不透明)
+# ==========================================
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """解析游标，格式不合法时返回 400"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="无效的分页游标 / Invalid cursor")
+
+
+# ==========================================
+# 2. Keyset 分页查询
+# ==========================================
+
+async def fetch_cursor_page(
+        db: AsyncSession,
+        query,
+        created_col,
+        id_col,
+        cursor: Optional[str],
+        size: int
+) -> Dict[str, Any]:
+    """
+    按 (created_at, id) 倒序的 keyset 分页。
+    务实：与 OFFSET 不同，翻到多深都只扫描 size + 1 行；
+    多取一行用于判断是否还有下一页。
+    cursor 为 None 或空字符串时从第一页开始。
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+
+    query = query.order_by(desc(created_col), desc(id_col)).limit(size + 1)
+    result = await db.execute(query)
+    rows = list(result.scalars().all())
+
+    has_more = len(rows) > size
+    items = rows[:size]
+    next_cursor = None
+    if has_more and items:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
+
+    return {
+        "items": items,
+        "size": size,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
@@ -0,0 +1,81 @@
+# BackEnd/src/services/password_hasher.py
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from ..config import settings
+
+
+class PasswordHasher:
+    """
+    bcrypt 专用线程池
+    务实逻辑：
+    1. bcrypt 计算期间释放 GIL，放到线程池即可不阻塞事件循环 (无需进程池的序列化开销)；
+    2. 线程数即并发上限：登录洪峰最多占用 max_workers 个核，其余请求照常调度；
+    3. 排队 + 计算中的任务超过 max_pending 时直接 503，避免请求在队列中无限堆积。
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32, history: int = 200):
+        self.max_workers = max(max_workers, 1)
+        self.max_pending = max(max_pending, 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_times: Deque[float] = deque(maxlen=history)
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="登录请求繁忙，请稍后重试 / Authentication busy",
+                headers={"Retry-After": "2"},
+            )
+        self.start()
+        self._pending += 1
+        submitted = time.perf_counter()
+
+        def timed():
+            # 线程内开始执行时记录排队耗时
+            self._wait_times.append(time.perf_counter() - submitted)
+            return fn(*args)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self._pending -= 1
+            self._completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        ordered = sorted(self._wait_times)
+        pick = lambda q: round(ordered[min(int(len(ordered) * q), len(ordered) - 1)] * 1000, 1) if ordered else 0.0
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "queue_wait_p50_ms": pick(0.50),
+            "queue_wait_p95_ms": pick(0.95),
+        }
+
+
+# 全局单例：由 main.py 的 lifespan 关闭 (首次使用时自动启动)
+password_hasher = PasswordHasher(
+    max_workers=settings.BCRYPT_WORKERS,
+    max_pending=settings.BCRYPT_QUEUE_MAX,
+)
@@ -0,0 +1,115 @@
+# BackEnd/src/services/presence.py
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from ..config import settings
+from ..database import AsyncSessionLocal
+
+logger = logging.getLogger("PRESENCE")
+
+# 一条语句写入整批活动时间：只前进不后退 (多个 worker 各自刷写，顺序不定)
+_TOUCH_SQL = text("""
+    UPDATE users AS u
+    SET last_active = v.ts, is_online = true
+    FROM unnest(CAST(:ids AS integer[]), CAST(:ts AS timestamptz[])) AS v(id, ts)
+    WHERE u.id = v.id AND (u.last_active IS NULL OR u.last_active < v.ts)
+""")
+
+# 超过在线窗口无活动的账号标记离线 (只影响状态发生变化的行)
+_SWEEP_SQL = text("""
+    UPDATE users SET is_online = false
+    WHERE is_online AND (last_active IS NULL OR last_active < now() - make_interval(secs => :window))
+""")
+
+
+class PresenceTracker:
+    """
+    管理员在线状态 (写回式)
+    务实逻辑：
+    1. 每个已认证的管理端请求只在内存字典里记录 user_id -> 最近活动时间 (同一用户反复覆盖)；
+    2. 后台任务每 flush_interval 秒用一条 UPDATE ... FROM unnest(...) 批量写入，
+       再用一条 UPDATE 把超过在线窗口的账号置为离线；
+    3. 写入量只与活跃管理员人数和刷写周期相关，与请求数无关。
+    users.is_online / last_active 因此始终可直接读取，最多滞后一个刷写周期。
+    """
+
+    def __init__(self, flush_interval: float, online_window: int):
+        self.flush_interval = flush_interval
+        self.online_window = online_window
+        self._pending: Dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.touches = 0
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.failures = 0
+        self.last_flush_ms = 0.0
+
+    def touch(self, user_id: int) -> None:
+        self.touches += 1
+        self._pending[user_id] = time.time()
+
+    async def flush(self) -> None:
+        batch, self._pending = self._pending, {}
+        started = time.perf_counter()
+        try:
+            async with AsyncSessionLocal() as db:
+                if batch:
+                    await db.execute(_TOUCH_SQL, {
+                        "ids": list(batch),
+                        "ts": [datetime.fromtimestamp(ts, timezone.utc) for ts in batch.values()],
+                    })
+                await db.execute(_SWEEP_SQL, {"window": self.online_window})
+                await db.commit()
+        except Exception as e:
+            # 写入失败：把本批并回待写队列 (保留较新的时间)，下个周期重试
+            self.failures += 1
+            for user_id, ts in batch.items():
+                if self._pending.get(user_id, 0) < ts:
+                    self._pending[user_id] = ts
+            logger.warning(f"⚠️ 在线状态刷写失败: {e}")
+            return
+        self.flushes += 1
+        self.rows_flushed += len(batch)
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pending:
+            await self.flush()  # 退出前写入最后一批
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "touches": self.touches,
+            "flushes": self.flushes,
+            "rows_flushed": self.rows_flushed,
+            "failures": self.failures,
+            "last_flush_ms": round(self.last_flush_ms, 1),
+        }
+
+
+# 全局单例：由 main.py 的 lifespan 启动与关闭
+presence = PresenceTracker(
+    flush_interval=settings.PRESENCE_FLUSH_INTERVAL,
+    online_window=settings.PRESENCE_ONLINE_WINDOW,
+)
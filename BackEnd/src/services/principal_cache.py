@@ -0,0 +1,129 @@
+# BackEnd/src/services/principal_cache.py
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from ..config import settings
+from .project_events import project_events
+
+CHANNEL = "principal_invalidate"
+_PENDING_KEY = "principal_invalidate"
+
+
+class PrincipalCache:
+    """
+    登录主体缓存 (get_current_user)
+    务实逻辑：
+    1. 按 Token 主体 (("admin", username) / ("client", project_id)) 缓存行的列值，TTL 很短；
+    2. 命中时用列值构造实例并 merge(load=False) 挂到当前会话：不发 SQL，
+       对它的修改 (如验收时推进 current_progress) 照常在提交时 UPDATE；
+    3. 改动主体的写入调用 invalidate_principal：本进程在事务提交后立即失效，
+       postgres 后端同时通过 NOTIFY 让其他 worker 失效 (断线重连后整体清空)；
+    4. 全局失效计数防止"查询进行中被失效"后把旧值写回缓存。
+    is_active 等校验仍由调用方在每次请求时对 (缓存的) 实例执行。
+    """
+
+    def __init__(self, ttl: int, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[type, Dict[str, Any], float]]" = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get(
+            self,
+            db: AsyncSession,
+            key: Hashable,
+            loader: Callable[[], Awaitable[Optional[Any]]]
+    ) -> Optional[Any]:
+        """命中返回挂在 db 上的实例；未命中调用 loader 查询并缓存 (None 不缓存)"""
+        if self.ttl <= 0:
+            return await loader()
+
+        cached = self._entries.get(key)
+        if cached is not None and cached[2] > time.monotonic():
+            self.hits += 1
+            self._entries.move_to_end(key)
+            model, values, _ = cached
+            instance = model(**values)
+            make_transient_to_detached(instance)
+            return await db.merge(instance, load=False)
+
+        self.misses += 1
+        generation = self._generation
+        instance = await loader()
+        if instance is not None and generation == self._generation:
+            values = {attr.key: getattr(instance, attr.key) for attr in inspect(instance).mapper.column_attrs}
+            self._entries[key] = (type(instance), values, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return instance
+
+    def invalidate(self, key: Hashable) -> None:
+        self._generation += 1
+        self.invalidations += 1
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    def _on_notify(self, payload: str) -> None:
+        try:
+            kind, subject = json.loads(payload)
+        except (ValueError, TypeError):
+            return
+        self.invalidate((kind, subject))
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+            # 每次命中省去一次主键/唯一索引查询
+            "queries_saved": self.hits,
+            "invalidations": self.invalidations,
+        }
+
+
+principal_cache = PrincipalCache(ttl=settings.PRINCIPAL_CACHE_TTL, max_entries=settings.PRINCIPAL_CACHE_MAX)
+project_events.register_channel(CHANNEL, principal_cache._on_notify, on_reconnect=principal_cache.clear)
+
+
+def admin_key(username: str) -> Tuple[str, str]:
+    return ("admin", username)
+
+
+def client_key(project_id: int) -> Tuple[str, int]:
+    return ("client", project_id)
+
+
+async def invalidate_principal(db: AsyncSession, key: Tuple[str, Any]) -> None:
+    """在改动主体的事务内调用，提交后生效；回滚则不失效"""
+    db.sync_session.info.setdefault(_PENDING_KEY, set()).add(key)
+    if project_events.backend == "postgres":
+        await db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": CHANNEL, "payload": json.dumps(list(key), ensure_ascii=False)}
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_pending(session: Session) -> None:
+    for key in session.info.pop(_PENDING_KEY, ()):
+        principal_cache.invalidate(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
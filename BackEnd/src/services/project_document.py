@@ -0,0 +1,199 @@
+# BackEnd/src/services/project_document.py
+"""
+业主端项目详情文档
+
+两条路径输出逐字节一致的 JSON：
+1. load_project_orm：selectinload 加载 + ProjectResponse 校验 (参考实现 / 回退路径)；
+2. render_project_document：一条 SQL 在 PostgreSQL 内拼出完整 JSON 文本，直接作为响应体。
+
+务实说明：
+- 不用 json_build_object / json_agg：它们输出 " : "、", \\n " 等空白，jsonb 还会重排键序，
+  与 FastAPI 的紧凑输出不一致；这里用 to_json()::text 转义标量 (与 Python json 的转义规则一致)，
+  再用 || 拼接对象和数组。
+- 键名与顺序直接取自 Pydantic 模型 (字段在前、computed_field 在后)，模型增删字段而 SQL
+  未同步时模块导入即报错，不会悄悄输出不一致的数据。
+- 列表统一按 id 升序 (ORM 关系同样配置了 order_by)。
+"""
+from typing import Any, Dict, Optional
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from ..database import DBNode, DBProject
+from ..models import ProjectLogResponse, ProjectNodeResponse, ProjectResourceResponse, ProjectResponse
+
+
+# ==========================================
+# 1. JSON 文本拼接片段
+# ==========================================
+
+def _scalar(expr: str) -> str:
+    """字符串/整数/布尔：to_json 负责转义，NULL 输出 null"""
+    return f"coalesce(to_json({expr})::text, 'null')"
+
+
+def _timestamp(expr: str) -> str:
+    """
+    与 Pydantic 的 datetime 序列化一致：UTC 输出 Z 后缀，微秒为 0 时省略小数部分。
+    asyncpg 返回的 timestamptz 均为 UTC，因此 ORM 路径同样是 Z 后缀。
+    """
+    utc = f"({expr} AT TIME ZONE 'UTC')"
+    return (
+        f"CASE WHEN {expr} IS NULL THEN 'null' ELSE "
+        f"'\"' || to_char({utc}, 'YYYY-MM-DD\"T\"HH24:MI:SS') || "
+        f"CASE WHEN extract(microseconds FROM {utc})::bigint % 1000000 <> 0 "
+        f"THEN '.' || to_char({utc}, 'US') ELSE '' END || 'Z\"' END"
+    )
+
+
+def _string_list(expr: str) -> str:
+    """JSONB 字符串数组 -> 紧凑 JSON 数组 (jsonb 自带的文本输出含空格)"""
+    return (
+        f"CASE WHEN jsonb_typeof({expr}) = 'array' THEN coalesce(("
+        f"SELECT '[' || string_agg(to_json(e.value)::text, ',' ORDER BY e.ord) || ']' "
+        f"FROM jsonb_array_elements_text({expr}) WITH ORDINALITY AS e(value, ord)"
+        f"), '[]') ELSE '[]' END"
+    )
+
+
+def _array(doc: str, source: str, order: str) -> str:
+    return f"coalesce((SELECT '[' || string_agg({doc}, ',' ORDER BY {order}) || ']' FROM {source}), '[]')"
+
+
+def _object(model, exprs: Dict[str, str]) -> str:
+    """按模型的输出键序拼接对象"""
+    keys = list(model.model_fields) + list(model.model_computed_fields)
+    if set(keys) != set(exprs):
+        raise RuntimeError(
+            f"{model.__name__} 字段与 SQL 文档不一致: {sorted(set(keys) ^ set(exprs))}"
+        )
+    parts = " || ',' || ".join(f"'\"{key}\":' || {exprs[key]}" for key in keys)
+    return f"'{{' || {parts} || '}}'"
+
+
+# ==========================================
+# 2. 文档 SQL (模块导入时生成一次)
+# ==========================================
+
+_LOG_DOC = _object(ProjectLogResponse, {
+    "id": _scalar("l.id"),
+    "node_id": _scalar("l.node_id"),
+    "content": _scalar("l.content"),
+    "images": _string_list("l.images"),
+    "sender_type": _scalar("l.sender_type"),
+    "operator": _scalar("l.operator"),
+    "created_at": _timestamp("l.created_at"),
+})
+
+_RESOURCE_DOC = _object(ProjectResourceResponse, {
+    "id": _scalar("r.id"),
+    "resource_type": _scalar("r.resource_type"),
+    "title": _scalar("r.title"),
+    "url": _scalar("r.url"),
+    "created_at": _timestamp("r.created_at"),
+})
+
+_NODE_DOC = _object(ProjectNodeResponse, {
+    "id": _scalar("n.id"),
+    "node_name": _scalar("n.node_name"),
+    "target_percent": _scalar("n.target_percent"),
+    "status": _scalar("n.status"),
+    "completed_at": _timestamp("n.completed_at"),
+    "logs": _array("ld.doc", "log_docs ld WHERE ld.node_id = n.id", "ld.id"),
+})
+
+
+def _latest_resource(resource_type: str) -> str:
+    # 与 sorted(..., reverse=True)[0] 一致：created_at 最新者，时间相同取原顺序 (id) 靠前者
+    return (
+        f"coalesce((SELECT rd.doc FROM resource_docs rd WHERE rd.resource_type = '{resource_type}' "
+        f"ORDER BY rd.created_at DESC, rd.id LIMIT 1), 'null')"
+    )
+
+
+_PROJECT_DOC = _object(ProjectResponse, {
+    "id": _scalar("p.id"),
+    "project_no": _scalar("p.project_no"),
+    "client_name": _scalar("p.client_name"),
+    "address": _scalar("p.address"),
+    "current_progress": _scalar("p.current_progress"),
+    "status": _scalar("p.status"),
+    "nodes": _array(_NODE_DOC, "project_nodes n WHERE n.project_id = p.id", "n.id"),
+    "resources": _array("rd.doc", "resource_docs rd", "rd.id"),
+    "logs": _array("ld.doc", "log_docs ld", "ld.id"),
+    "latest_vr": _latest_resource("vr"),
+    "latest_report": _latest_resource("report"),
+    "chat_logs": _array("ld.doc", "log_docs ld WHERE ld.node_id IS NULL", "ld.id"),
+})
+
+# 日志/资源文档各渲染一次，节点日志、全部日志、留言列表共用。
+# 拆成 CTE + 文档表达式两段，快照维护 (project_snapshot) 复用同一份 SQL
+DOCUMENT_CTES = f"""
+    WITH log_docs AS (
+        SELECT l.id, l.node_id, {_LOG_DOC} AS doc
+        FROM project_logs l
+        WHERE l.project_id = :project_id
+    ),
+    resource_docs AS (
+        SELECT r.id, r.resource_type, r.created_at, {_RESOURCE_DOC} AS doc
+        FROM project_resources r
+        WHERE r.project_id = :project_id
+    )
+"""
+# 依赖别名 p (projects) 与上面的 CTE
+PROJECT_DOCUMENT_EXPR = _PROJECT_DOC
+
+PROJECT_DOCUMENT_SQL = text(f"""
+    {DOCUMENT_CTES}
+    SELECT {PROJECT_DOCUMENT_EXPR}
+    FROM projects p
+    WHERE p.id = :project_id
+""")
+
+
+# ==========================================
+# 3. 对外接口
+# ==========================================
+
+async def render_project_document(db: AsyncSession, project_id: int) -> Optional[bytes]:
+    """一次往返生成完整 JSON；项目不存在时返回 None"""
+    result = await db.execute(PROJECT_DOCUMENT_SQL, {"project_id": project_id})
+    document = result.scalar()
+    return document.encode("utf-8") if document is not None else None
+
+
+async def load_project_orm(db: AsyncSession, project_id: int) -> Optional[DBProject]:
+    """ORM 参考路径：深度加载 ProjectResponse 需要的关联"""
+    result = await db.execute(
+        select(DBProject)
+        .options(
+            selectinload(DBProject.nodes).selectinload(DBNode.logs),
+            selectinload(DBProject.resources),
+            selectinload(DBProject.logs)
+        )
+        .where(DBProject.id == project_id)
+    )
+    return result.scalar_one_or_none()
+
+
+def render_project_orm(project: DBProject) -> bytes:
+    """ORM 对象 -> 与 FastAPI response_model 相同的 JSON 字节 (用于对比校验)"""
+    content = ProjectResponse.model_validate(project, from_attributes=True).model_dump(mode="json")
+    return JSONResponse(content).body
+
+
+def trim_document_logs(document: Dict[str, Any], limit: int) -> Dict[str, Any]:
+    """
+    只保留最近 limit 条日志 (全部日志、留言、各节点日志分别截取)。
+    文档内日志按 id 升序，取末尾即最新；完整历史通过日志流接口分页获取。
+    """
+    def recent(items):
+        return items[-limit:] if limit else []
+
+    document["logs"] = recent(document["logs"])
+    document["chat_logs"] = recent(document["chat_logs"])
+    for node in document["nodes"]:
+        node["logs"] = recent(node["logs"])
+    return document
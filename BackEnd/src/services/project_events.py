@@ -0,0 +1,293 @@
+# BackEnd/src/services/project_events.py
+"""
+项目动态推送 (Server-Sent Events)
+
+务实逻辑：
+1. 写入接口在业务事务内调用 publish_event：postgres 后端执行 pg_notify，随事务提交才投递、回滚即作废；
+   local 后端暂存在会话上，after_commit 时本进程直接分发；
+2. 每个 worker 只持有一条 LISTEN 连接，按项目 ID 扇出到本进程的订阅队列，
+   SSE 连接本身不占用数据库连接池；
+3. 事件只携带增量 (新日志/节点状态/进度/新资源)，前端据此更新界面；
+   收到 resync (监听断线重连、订阅者积压溢出) 时重新拉取一次详情 (带 If-None-Match，通常为 304)。
+"""
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Type
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import event, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..config import settings
+
+CHANNEL = "project_events"
+# NOTIFY 负载上限为 8000 字节，留出余量
+_NOTIFY_MAX_BYTES = 7500
+_PENDING_KEY = "project_events"
+_DATETIME = TypeAdapter(Optional[datetime])
+
+
+def format_sse(event_type: str, data: Dict[str, Any]) -> bytes:
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return f"event: {event_type}\ndata: {payload}\n\n".encode("utf-8")
+
+
+_RESYNC = format_sse("resync", {})
+
+
+class ProjectEventBroker:
+    """
+    进程内的订阅表：project_id -> 订阅队列集合。
+    同一事件只编码一次，同一份字节放入所有订阅队列。
+    """
+
+    def __init__(self, backend: str, queue_max: int, max_subscribers: int):
+        self.backend = backend
+        self.queue_max = queue_max
+        self.max_subscribers = max_subscribers
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._count = 0
+        self._listener: Optional[asyncio.Task] = None
+        # 复用同一条 LISTEN 连接的其他频道 (如登录主体缓存失效)
+        self._channels: Dict[str, Callable[[str], None]] = {CHANNEL: self._on_project_event}
+        self._reconnect_hooks: List[Callable[[], None]] = [self.broadcast_resync]
+        self._connected = False
+        self.published = 0
+        self.delivered = 0
+        self.overflows = 0
+        self.reconnects = 0
+
+    # ---------- 订阅管理 ----------
+
+    def check_capacity(self) -> None:
+        if self._count >= self.max_subscribers:
+            raise HTTPException(status_code=503, detail="推送连接数已满，请稍后重试 / Too many subscribers")
+
+    def subscribe(self, project_id: int) -> asyncio.Queue:
+        self.check_capacity()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_max)
+        self._subscribers.setdefault(project_id, set()).add(queue)
+        self._count += 1
+        return queue
+
+    def unsubscribe(self, project_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(project_id)
+        if queues is None or queue not in queues:
+            return
+        queues.discard(queue)
+        self._count -= 1
+        if not queues:
+            del self._subscribers[project_id]
+
+    def _put(self, queue: asyncio.Queue, message: Optional[bytes]) -> None:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # 慢速订阅者：丢弃积压，改为通知其重新拉取详情，避免内存无限增长
+            self.overflows += 1
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(_RESYNC)
+
+    def dispatch(self, project_id: int, event_type: str, data: Dict[str, Any]) -> None:
+        queues = self._subscribers.get(project_id)
+        if not queues:
+            return
+        message = format_sse(event_type, data)
+        for queue in queues:
+            self._put(queue, message)
+        self.delivered += len(queues)
+
+    def broadcast_resync(self) -> None:
+        for queues in self._subscribers.values():
+            for queue in queues:
+                self._put(queue, _RESYNC)
+
+    # ---------- LISTEN 连接 (postgres 后端) ----------
+
+    def register_channel(
+            self,
+            channel: str,
+            handler: Callable[[str], None],
+            on_reconnect: Optional[Callable[[], None]] = None
+    ) -> None:
+        """在启动前注册：handler 接收 NOTIFY 负载，on_reconnect 在断线重连后调用 (期间的通知已丢失)"""
+        self._channels[channel] = handler
+        if on_reconnect is not None:
+            self._reconnect_hooks.append(on_reconnect)
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        handler = self._channels.get(channel)
+        if handler is not None:
+            handler(payload)
+
+    def _on_project_event(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            self.dispatch(message["p"], message["e"], message["d"])
+        except (ValueError, KeyError, TypeError):
+            pass
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        dsn = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+        delay = 1.0
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(dsn)
+                lost = asyncio.get_running_loop().create_future()
+                conn.add_termination_listener(lambda _: lost.done() or lost.set_result(None))
+                for channel in self._channels:
+                    await conn.add_listener(channel, self._on_notify)
+                if self.reconnects:
+                    # 断线期间的通知已丢失：订阅者重新拉取，各缓存清空
+                    for hook in self._reconnect_hooks:
+                        hook()
+                self._connected = True
+                delay = 1.0
+                await lost
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ [ProjectEvents] LISTEN 连接失败: {e}")
+            finally:
+                self._connected = False
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    async def start(self) -> None:
+        if self.backend == "postgres" and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        # 结束所有 SSE 流，避免长连接拖住进程退出；
+        # 积压的事件已无意义，清空后直接放入结束标记 (不走 _put 的溢出分支，否则放入的是 resync)
+        for queues in self._subscribers.values():
+            for queue in queues:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "listening": self._connected if self.backend == "postgres" else None,
+            "subscribers": self._count,
+            "projects": len(self._subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+            "reconnects": self.reconnects,
+        }
+
+
+project_events = ProjectEventBroker(
+    backend=settings.PROJECT_EVENTS_BACKEND,
+    queue_max=settings.PROJECT_EVENTS_QUEUE_MAX,
+    max_subscribers=settings.PROJECT_EVENTS_MAX_SUBSCRIBERS,
+)
+
+
+# ==========================================
+# 1. 发布 (在业务事务内调用)
+# ==========================================
+
+async def dump_model(db: AsyncSession, model: Type[BaseModel], obj) -> Dict[str, Any]:
+    """ORM 对象 -> 事件数据；flush 后过期的列 (server_default 等) 先刷新，避免异步懒加载"""
+    if inspect(obj).expired_attributes:
+        await db.refresh(obj)
+    return model.model_validate(obj).model_dump(mode="json")
+
+
+async def dump_node_status(db: AsyncSession, node) -> Dict[str, Any]:
+    """节点事件只推送状态字段 (ProjectNodeResponse 会触发 logs 关系加载)"""
+    if inspect(node).expired_attributes:
+        await db.refresh(node, ["status", "completed_at"])
+    return {
+        "id": node.id,
+        "status": node.status,
+        "completed_at": _DATETIME.dump_python(node.completed_at, mode="json"),
+    }
+
+
+async def publish_event(db: AsyncSession, project_id: int, event_type: str, data: Dict[str, Any]) -> None:
+    project_events.published += 1
+    if project_events.backend != "postgres":
+        db.sync_session.info.setdefault(_PENDING_KEY, []).append((project_id, event_type, data))
+        return
+
+    payload = json.dumps({"p": project_id, "e": event_type, "d": data}, ensure_ascii=False, separators=(",", ":"))
+    if len(payload.encode("utf-8")) > _NOTIFY_MAX_BYTES:
+        # 超长内容 (如大段日志) 只推送 id，前端通过日志流接口 since_id 补取
+        payload = json.dumps(
+            {"p": project_id, "e": event_type, "d": {"id": data.get("id"), "truncated": True}},
+            separators=(",", ":")
+        )
+    await db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_pending(session: Session) -> None:
+    for project_id, event_type, data in session.info.pop(_PENDING_KEY, ()):
+        project_events.dispatch(project_id, event_type, data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# ==========================================
+# 2. SSE 响应
+# ==========================================
+
+def project_event_stream(project_id: int) -> StreamingResponse:
+    """
+    订阅指定项目的事件流。调用方负责鉴权；
+    返回响应前只检查连接数 (已满时直接 503)，订阅在开始输出时才建立：
+    响应体未被迭代 (例如客户端在首个数据块前断开) 时不会留下无人退订的队列。
+    """
+    project_events.check_capacity()
+
+    async def stream():
+        try:
+            queue = project_events.subscribe(project_id)
+        except HTTPException:
+            # 检查之后、开始输出之前连接数已被占满：直接结束，客户端稍后自动重连
+            return
+        try:
+            yield b"retry: 3000\n\n" + format_sse("ready", {"project_id": project_id, "ts": time.time()})
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=settings.PROJECT_EVENTS_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                if message is None:
+                    break
+                yield message
+        finally:
+            project_events.unsubscribe(project_id, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
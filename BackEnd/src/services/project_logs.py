@@ -0,0 +1,66 @@
+# BackEnd/src/services/project_logs.py
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import DBProjectLog
+from .pagination import fetch_cursor_page
+
+# 增量轮询的回看窗口：id 在事务开始时分配，提交顺序不一定与 id 顺序一致 (见 project_snapshot._insert_by_id)，
+# id 较小但提交较晚的日志只会出现在 since_id 之前，需要按创建时间回看一段
+_SINCE_OVERLAP = timedelta(seconds=30)
+
+
+async def fetch_log_feed(
+        db: AsyncSession,
+        project_id: int,
+        *,
+        cursor: Optional[str] = None,
+        since_id: Optional[int] = None,
+        node_id: Optional[int] = None,
+        sender_type: Optional[str] = None,
+        size: int = 20
+) -> Dict[str, Any]:
+    """
+    项目日志流 (业主端与管理端共用)
+    1. 默认按 (created_at, id) 倒序游标分页，走 ix_project_logs_project_created_at_id；
+    2. 传入 since_id 时为增量轮询：返回 id 更大的日志，以及创建时间在 since_id 那条日志之前
+       _SINCE_OVERLAP 以内的较小 id 日志 (迟提交的日志)，整体按 id 正序；
+       回看部分会在多次轮询中重复出现，前端按 id 去重，记住收到的最大 id 作为下次的 since_id；
+       has_more 只针对 id 更大的部分，为真时应立即再取一次；
+       回看部分最多 size 条 (取最接近 since_id 的)，不计入 has_more，超出部分需通过游标分页补齐。
+    """
+    query = select(DBProjectLog).where(DBProjectLog.project_id == project_id)
+    if node_id is not None:
+        query = query.where(DBProjectLog.node_id == node_id)
+    if sender_type:
+        query = query.where(DBProjectLog.sender_type == sender_type)
+
+    if since_id is not None:
+        result = await db.execute(
+            query.where(DBProjectLog.id > since_id).order_by(DBProjectLog.id).limit(size + 1)
+        )
+        rows = list(result.scalars().all())
+
+        late = []
+        anchor = await db.scalar(
+            select(DBProjectLog.created_at)
+            .where(DBProjectLog.id == since_id, DBProjectLog.project_id == project_id)
+        )
+        if anchor is not None:
+            late = list((await db.execute(
+                query.where(DBProjectLog.id < since_id, DBProjectLog.created_at >= anchor - _SINCE_OVERLAP)
+                .order_by(DBProjectLog.id.desc())
+                .limit(size)
+            )).scalars().all())
+            late.reverse()
+        return {
+            "items": late + rows[:size],
+            "size": size,
+            "next_cursor": None,
+            "has_more": len(rows) > size,
+        }
+
+    return await fetch_cursor_page(db, query, DBProjectLog.created_at, DBProjectLog.id, cursor, size)
@@ -0,0 +1,165 @@
+# BackEnd/src/services/project_snapshot.py
+"""
+业主端项目详情快照 (project_snapshots)
+
+务实逻辑：
+1. 快照是与 ProjectResponse 响应逐字节一致的 JSON 文本，读取只需一次主键查询；
+2. 追加日志、新增资源、节点验收等写入在同一事务内增量修改快照；
+3. 节点全量同步等结构性变化直接用 project_document 的 SQL 重建；
+   增量修改与重建都先取得同一把按项目的事务级咨询锁，保证二者串行：
+   重建在锁内才开始读取源表，不会用锁外的旧数据覆盖其它事务刚追加的日志；
+4. 快照缺失时 (新项目/历史数据) 读取方按需重建，一致性检查见 src/scripts/check_project_snapshots.py。
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import DBNode, DBProjectLog, DBProjectResource, DBProjectSnapshot
+from ..models import ProjectLogResponse, ProjectResourceResponse
+from .project_document import DOCUMENT_CTES, PROJECT_DOCUMENT_EXPR
+
+_DATETIME = TypeAdapter(Optional[datetime])
+
+# 咨询锁 (namespace, project_id) 的命名空间，避免与其它用途的咨询锁冲突
+_SNAPSHOT_LOCK_NAMESPACE = 0x534E4150
+
+REBUILD_SQL = text(f"""
+    {DOCUMENT_CTES}
+    INSERT INTO project_snapshots (project_id, document, version)
+    SELECT p.id, {PROJECT_DOCUMENT_EXPR}, clock_timestamp()
+    FROM projects p
+    WHERE p.id = :project_id
+    ON CONFLICT (project_id) DO UPDATE
+        SET document = EXCLUDED.document, version = EXCLUDED.version
+    RETURNING document, version
+""")
+
+
+def dump_document(document: Dict[str, Any]) -> str:
+    """与 FastAPI JSONResponse 相同的紧凑输出"""
+    return json.dumps(document, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+# ==========================================
+# 1. 读取与重建
+# ==========================================
+
+async def read_snapshot_version(db: AsyncSession, project_id: int) -> Optional[datetime]:
+    return await db.scalar(
+        select(DBProjectSnapshot.version).where(DBProjectSnapshot.project_id == project_id)
+    )
+
+
+async def read_snapshot(db: AsyncSession, project_id: int) -> Optional[Tuple[str, datetime]]:
+    row = (await db.execute(
+        select(DBProjectSnapshot.document, DBProjectSnapshot.version)
+        .where(DBProjectSnapshot.project_id == project_id)
+    )).first()
+    return (row.document, row.version) if row else None
+
+
+async def lock_snapshot(db: AsyncSession, project_id: int) -> None:
+    """取得项目快照的写锁，事务结束时自动释放 (同一事务内可重复获取)"""
+    await db.execute(
+        text("SELECT pg_advisory_xact_lock(:namespace, :project_id)"),
+        {"namespace": _SNAPSHOT_LOCK_NAMESPACE, "project_id": project_id},
+    )
+
+
+async def rebuild_snapshot(db: AsyncSession, project_id: int) -> Optional[Tuple[str, datetime]]:
+    """按源表重建快照 (与业务写入同一事务)；项目不存在时返回 None"""
+    await db.flush()  # 原生 SQL 不会触发 autoflush，先把本事务的 ORM 改动写入
+    # 先取锁再读取源表：READ COMMITTED 下，取锁之后的语句能看到先持锁事务已提交的日志
+    await lock_snapshot(db, project_id)
+    row = (await db.execute(REBUILD_SQL, {"project_id": project_id})).first()
+    return (row.document, row.version) if row else None
+
+
+# ==========================================
+# 2. 增量维护
+# ==========================================
+
+def _insert_by_id(items: List[Dict[str, Any]], item: Dict[str, Any]) -> None:
+    """按 id 升序插入 (并发事务的提交顺序不一定与 id 顺序一致)"""
+    index = len(items)
+    while index > 0 and items[index - 1]["id"] > item["id"]:
+        index -= 1
+    items.insert(index, item)
+
+
+def _latest(resources: List[Dict[str, Any]], resource_type: str) -> Optional[Dict[str, Any]]:
+    """与 ProjectResponse.latest_vr / latest_report 的计算规则一致"""
+    matches = [r for r in resources if r["resource_type"] == resource_type]
+    if not matches:
+        return None
+    return sorted(matches, key=lambda r: _DATETIME.validate_python(r["created_at"]), reverse=True)[0]
+
+
+async def update_snapshot(
+        db: AsyncSession,
+        project_id: int,
+        *,
+        log: Optional[DBProjectLog] = None,
+        resource: Optional[DBProjectResource] = None,
+        node: Optional[DBNode] = None,
+        current_progress: Optional[int] = None
+) -> None:
+    """
+    在当前事务内增量更新快照。调用前无需 flush；
+    快照尚不存在时直接重建 (重建结果已包含本次写入)。
+    """
+    await db.flush()
+    await lock_snapshot(db, project_id)
+    row = (await db.execute(
+        select(DBProjectSnapshot.document)
+        .where(DBProjectSnapshot.project_id == project_id)
+        .with_for_update()
+    )).first()
+    if row is None:
+        await rebuild_snapshot(db, project_id)
+        return
+
+    document = json.loads(row.document)
+
+    if log is not None:
+        # server_default / func.now() 赋值的列在 flush 后过期，刷新后再序列化
+        await db.refresh(log)
+        entry = ProjectLogResponse.model_validate(log).model_dump(mode="json")
+        _insert_by_id(document["logs"], entry)
+        if log.node_id is None:
+            _insert_by_id(document["chat_logs"], entry)
+        else:
+            for node_doc in document["nodes"]:
+                if node_doc["id"] == log.node_id:
+                    _insert_by_id(node_doc["logs"], entry)
+                    break
+
+    if resource is not None:
+        await db.refresh(resource)
+        _insert_by_id(
+            document["resources"],
+            ProjectResourceResponse.model_validate(resource).model_dump(mode="json")
+        )
+        document["latest_vr"] = _latest(document["resources"], "vr")
+        document["latest_report"] = _latest(document["resources"], "report")
+
+    if node is not None:
+        await db.refresh(node)
+        for node_doc in document["nodes"]:
+            if node_doc["id"] == node.id:
+                node_doc["status"] = node.status
+                node_doc["completed_at"] = _DATETIME.dump_python(node.completed_at, mode="json")
+                break
+
+    if current_progress is not None:
+        document["current_progress"] = current_progress
+
+    await db.execute(
+        text("UPDATE project_snapshots SET document = :document, version = clock_timestamp() "
+             "WHERE project_id = :project_id"),
+        {"document": dump_document(document), "project_id": project_id},
+    )
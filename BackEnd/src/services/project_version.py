@@ -0,0 +1,34 @@
+# BackEnd/src/services/project_version.py
+from datetime import datetime
+
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import DBProject
+from .principal_cache import client_key, invalidate_principal
+
+
+async def touch_project(db: AsyncSession, project_id: int) -> None:
+    """
+    刷新项目数据版本 (projects.updated_at)，与业务写入在同一事务中提交。
+    务实：节点、日志、资源、媒体都挂在项目下，任何一处写入都要调用，
+    业主端详情的 ETag/Last-Modified 依赖它判断是否需要重新下发。
+    使用 clock_timestamp() 而非 now()：now() 是事务开始时间，
+    等锁较久的事务可能写入比已提交版本更早的时间。
+    """
+    await db.execute(
+        update(DBProject)
+        .where(DBProject.id == project_id)
+        .values(updated_at=func.clock_timestamp())
+        .execution_options(synchronize_session=False)
+    )
+    # 业主端登录主体缓存的是项目行 (含 current_progress)，随数据版本一起失效
+    await invalidate_principal(db, client_key(project_id))
+
+
+def project_etag(project_id: int, version: datetime, variant: str = "") -> str:
+    """
+    由项目版本推导的弱 ETag (同一版本的 JSON 语义相同，但不保证逐字节一致)。
+    variant 区分同一版本的不同表示 (如只含最近 N 条日志)。
+    """
+    return f'W/"project-{project_id}-{int(version.timestamp() * 1_000_000):x}{variant}"'
@@ -0,0 +1,273 @@
+# BackEnd/src/services/rate_limit.py
+"""
+接口限频 (滑动窗口计数)
+
+务实逻辑：
+1. 算法：每个键保存"当前窗口计数 + 上一窗口计数"，估算值 = 上一窗口 × 剩余比例 + 当前窗口，
+   每次检查只需一次原子自增，存储量与请求数无关 (与 slowapi 默认的固定窗口一样，超限的请求也计数)；
+2. 存储可插拔 (RATE_LIMIT_STORAGE)：
+   - sqlite:///path/to/file.db 默认，同机多 worker 共享 (默认放在 /dev/shm 内存盘)，重启不清零；
+   - memory://                 仅本进程 (开发 / 单 worker)；
+   - postgresql                复用业务库的 rate_limit_counters 表 (UNLOGGED)，多机部署共享；
+                               每次检查从连接池额外取一个连接，登录高峰时连接池压力翻倍；
+3. 存储不可用时按 fail_open 处理：放行 (普通接口默认，限频不应成为新的故障点) 或返回 503
+   (登录等防爆破接口默认，RATE_LIMIT_LOGIN_FAIL_OPEN)，两种情况都记录错误计数。
+"""
+import functools
+import logging
+import math
+import os
+import re
+import sqlite3
+import tempfile
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import text
+
+from ..config import settings
+
+logger = logging.getLogger("RATE_LIMIT")
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+# 每隔多少次检查清理一次过期计数
+_PRUNE_EVERY = 1000
+
+
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """'5/minute'、'20 per hour'、'100/10 seconds' -> (次数, 窗口秒数)"""
+    match = re.fullmatch(r"\s*(\d+)\s*(?:/|per)\s*(\d+)?\s*(second|minute|hour|day)s?\s*", rate)
+    if not match:
+        raise ValueError(f"无法解析的限频规则: {rate!r}")
+    return int(match.group(1)), int(match.group(2) or 1) * _PERIODS[match.group(3)]
+
+
+def get_remote_address(request: Request) -> str:
+    return request.client.host if request.client else "127.0.0.1"
+
+
+# ==========================================
+# 1. 存储后端：原子地"记一次"并返回 (窗口起点, 上一窗口计数, 当前窗口计数)
+# ==========================================
+
+# SQLite 与 PostgreSQL 共用的 UPSERT：
+# 同一窗口 -> 当前计数 +1；进入下一窗口 -> 当前计数滚动为上一窗口；相隔更久 -> 清零。
+# 窗口起点只前进不后退 (多机时钟略有偏差时，落后的请求计入较新的窗口)
+_UPSERT = """
+    INSERT INTO rate_limit_counters AS c (key, window_start, prev_count, curr_count, expires_at)
+    VALUES (:key, :window_start, 0, 1, :expires_at)
+    ON CONFLICT (key) DO UPDATE SET
+        prev_count = CASE
+            WHEN c.window_start >= EXCLUDED.window_start THEN c.prev_count
+            WHEN c.window_start = EXCLUDED.window_start - :window THEN c.curr_count
+            ELSE 0 END,
+        curr_count = CASE
+            WHEN c.window_start >= EXCLUDED.window_start THEN c.curr_count + 1
+            ELSE 1 END,
+        window_start = {greatest}(c.window_start, EXCLUDED.window_start),
+        expires_at = {greatest}(c.expires_at, EXCLUDED.expires_at)
+    RETURNING window_start, prev_count, curr_count
+"""
+_PRUNE = "DELETE FROM rate_limit_counters WHERE expires_at < :now"
+
+
+class MemoryBackend:
+    name = "memory"
+
+    def __init__(self):
+        self._counters: Dict[str, Tuple[int, int, int, int]] = {}
+
+    async def incr(self, key: str, window_start: int, window: int, expires_at: int) -> Tuple[int, int, int]:
+        stored = self._counters.get(key)
+        if stored is None:
+            entry = (window_start, 0, 1, expires_at)
+        elif stored[0] >= window_start:
+            entry = (stored[0], stored[1], stored[2] + 1, stored[3])
+        elif stored[0] == window_start - window:
+            entry = (window_start, stored[2], 1, expires_at)
+        else:
+            entry = (window_start, 0, 1, expires_at)
+        self._counters[key] = entry
+        return entry[0], entry[1], entry[2]
+
+    async def prune(self, now: int) -> None:
+        for key in [k for k, v in self._counters.items() if v[3] < now]:
+            del self._counters[key]
+
+
+class SQLiteBackend:
+    """
+    同机多进程共享。每次检查是一条自动提交的 UPSERT (WAL 模式，写锁只持有几十微秒)，
+    直接在事件循环中同步执行，比切换到线程池更省。
+    """
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, timeout=1.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")  # 计数丢失只会让限频略微放宽，不值得每次 fsync
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_limit_counters (
+                key TEXT PRIMARY KEY,
+                window_start INTEGER NOT NULL,
+                prev_count INTEGER NOT NULL,
+                curr_count INTEGER NOT NULL,
+                expires_at INTEGER NOT NULL
+            )
+        """)
+        self._upsert = _UPSERT.format(greatest="max")
+
+    async def incr(self, key: str, window_start: int, window: int, expires_at: int) -> Tuple[int, int, int]:
+        row = self._conn.execute(self._upsert, {
+            "key": key, "window_start": window_start, "window": window, "expires_at": expires_at,
+        }).fetchone()
+        return row[0], row[1], row[2]
+
+    async def prune(self, now: int) -> None:
+        self._conn.execute(_PRUNE, {"now": now})
+
+
+class PostgresBackend:
+    """多机共享：复用业务连接池，一次往返完成自增与读取"""
+    name = "postgresql"
+
+    def __init__(self):
+        self._upsert = text(_UPSERT.format(greatest="GREATEST"))
+        self._prune = text(_PRUNE)
+
+    async def incr(self, key: str, window_start: int, window: int, expires_at: int) -> Tuple[int, int, int]:
+        from ..database import engine
+
+        async with engine.begin() as conn:
+            row = (await conn.execute(self._upsert, {
+                "key": key, "window_start": window_start, "window": window, "expires_at": expires_at,
+            })).one()
+        return row.window_start, row.prev_count, row.curr_count
+
+    async def prune(self, now: int) -> None:
+        from ..database import engine
+
+        async with engine.begin() as conn:
+            await conn.execute(self._prune, {"now": now})
+
+
+def create_backend(storage_uri: str):
+    if storage_uri.startswith("memory://"):
+        return MemoryBackend()
+    if storage_uri.startswith("sqlite:///"):
+        path = storage_uri[len("sqlite:///"):]
+        if not os.path.isdir(os.path.dirname(path) or "."):
+            # 没有 /dev/shm 的系统 (如 macOS / Windows 开发机)：退回系统临时目录
+            fallback = os.path.join(tempfile.gettempdir(), os.path.basename(path))
+            logger.warning(f"⚠️ 限频存储目录不存在，改用 {fallback}")
+            path = fallback
+        return SQLiteBackend(path)
+    if storage_uri.startswith("postgresql"):
+        return PostgresBackend()
+    raise ValueError(f"不支持的限频存储: {storage_uri!r}")
+
+
+# ==========================================
+# 2. 限频器 (装饰器用法与 slowapi 一致)
+# ==========================================
+
+class RateLimiter:
+    def __init__(self, storage_uri: str, key_func: Callable[[Request], str] = get_remote_address):
+        self.storage_uri = storage_uri
+        self.key_func = key_func
+        self._backend = None
+        self.checks = 0
+        self.rejected = 0
+        self.errors = 0
+
+    @property
+    def backend(self):
+        # 首次使用时创建：模块导入阶段不触碰文件或数据库
+        if self._backend is None:
+            self._backend = create_backend(self.storage_uri)
+        return self._backend
+
+    async def hit(self, key: str, limit: int, window: int, fail_open: bool = True) -> Tuple[bool, int]:
+        """记一次访问，返回 (是否放行, 建议重试秒数)；存储不可用且 fail_open 为假时抛出 503"""
+        now = time.time()
+        window_start = int(now // window) * window
+        self.checks += 1
+        try:
+            start, prev_count, curr_count = await self.backend.incr(
+                key, window_start, window, window_start + 2 * window
+            )
+            if self.checks % _PRUNE_EVERY == 0:
+                await self.backend.prune(int(now))
+        except Exception as e:
+            self.errors += 1
+            if not fail_open:
+                logger.error(f"❌ 限频存储不可用，本次拒绝: {e}")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="服务暂时不可用，请稍后重试 / Rate limit storage unavailable",
+                    headers={"Retry-After": "5"},
+                )
+            logger.warning(f"⚠️ 限频存储不可用，本次放行: {e}")
+            return True, 0
+
+        elapsed = max(now - start, 0.0)
+        estimate = prev_count * max(1 - elapsed / window, 0.0) + curr_count
+        if estimate <= limit:
+            return True, 0
+
+        self.rejected += 1
+        # 上一窗口的权重随时间线性衰减：估算回落到 limit 以内所需的时间
+        if curr_count > limit or prev_count == 0:
+            retry_after = start + window - now
+        else:
+            retry_after = (1 - (limit - curr_count) / prev_count) * window - elapsed
+        return False, max(int(math.ceil(retry_after)), 1)
+
+    def limit(self, rate: str, fail_open: Optional[bool] = None):
+        """
+        @limiter.limit("5/minute")：按 (接口, 客户端 IP) 计数。
+        被装饰的接口需声明 request: Request 参数。
+        fail_open 未指定时取 RATE_LIMIT_FAIL_OPEN。
+        """
+        limit, window = parse_rate(rate)
+        if fail_open is None:
+            fail_open = settings.RATE_LIMIT_FAIL_OPEN
+
+        def decorator(func):
+            scope = f"{func.__module__}.{func.__name__}"
+
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any):
+                request: Optional[Request] = kwargs.get("request")
+                if request is None:
+                    request = next((a for a in args if isinstance(a, Request)), None)
+                if request is None:
+                    raise RuntimeError(f"{scope} 使用了限频装饰器，但未声明 request: Request 参数")
+
+                allowed, retry_after = await self.hit(
+                    f"{scope}:{self.key_func(request)}", limit, window, fail_open=fail_open
+                )
+                if not allowed:
+                    raise HTTPException(
+                        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                        detail=f"请求过于频繁，请 {retry_after} 秒后重试 / Rate limit exceeded: {rate}",
+                        headers={"Retry-After": str(retry_after)},
+                    )
+                return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "storage": self.backend.name,
+            "checks": self.checks,
+            "rejected": self.rejected,
+            "errors": self.errors,
+        }
+
+
+# 全局单例：路由中通过 @limiter.limit(...) 使用 (main.py 重新导出)
+limiter = RateLimiter(storage_uri=settings.RATE_LIMIT_STORAGE)
@@ -0,0 +1,192 @@
+# BackEnd/src/services/response_cache.py
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import AsyncSessionLocal
+
+logger = logging.getLogger("RESPONSE_CACHE")
+
+Renderer = Callable[[AsyncSession], Awaitable[bytes]]
+
+
+@dataclass
+class CacheEntry:
+    body: bytes
+    etag: str
+    tag: str
+    # 首次渲染出当前内容的时间，作为 Last-Modified (内容未变的后台刷新不改变它)
+    last_modified: datetime
+    fresh_until: float
+    stale_until: float
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+
+def cache_key(request: Request) -> str:
+    """路由路径 + 排序后的查询参数 (参数顺序不同视为同一请求)"""
+    params = sorted(request.query_params.multi_items())
+    query = "&".join(f"{k}={v}" for k, v in params)
+    return f"{request.url.path}?{query}"
+
+
+def dump_json(model_type: Any, data: Any) -> bytes:
+    """按 response_model 校验并序列化，输出与 FastAPI 默认响应一致的 JSON"""
+    return model_type.model_validate(data, from_attributes=True).model_dump_json().encode("utf-8")
+
+
+class ResponseCache:
+    """
+    公开接口的响应缓存 (缓存序列化后的字节)
+    务实逻辑：
+    1. TTL 内直接返回字节，不查库、不走 Pydantic；
+    2. 过期但仍在 stale 窗口内：先返回旧内容，后台用独立会话重新渲染；
+    3. 同一 key 的并发未命中只渲染一次；
+    4. 按总字节数 LRU 淘汰；写接口按标签 (cases/products) 主动失效。
+    多 worker 部署时失效只作用于本进程，TTL 兜底其他进程。
+    """
+
+    def __init__(self, ttl: int, stale_ttl: int, max_bytes: int):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    # --- 内部存取 ---
+    def _store(self, key: str, tag: str, body: bytes, generation: int) -> CacheEntry:
+        now = time.monotonic()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        previous = self._entries.get(key)
+        if previous is not None and previous.etag == etag:
+            last_modified = previous.last_modified
+        else:
+            last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        entry = CacheEntry(
+            body=body,
+            etag=etag,
+            tag=tag,
+            last_modified=last_modified,
+            fresh_until=now + self.ttl,
+            stale_until=now + self.ttl + self.stale_ttl,
+        )
+        # 渲染期间发生过失效：结果可能已过时，只返回不入缓存
+        if self._generations.get(tag, 0) != generation:
+            return entry
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+        return entry
+
+    async def _revalidate(self, key: str, tag: str, render: Renderer) -> None:
+        generation = self._generations.get(tag, 0)
+        try:
+            async with AsyncSessionLocal() as session:
+                body = await render(session)
+            self._store(key, tag, body, generation)
+            self.revalidations += 1
+        except Exception:
+            logger.exception(f"后台刷新缓存失败: {key}")
+        finally:
+            self._refreshing.discard(key)
+
+    # --- 对外接口 ---
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """只读查看 (不计入命中统计)，用于条件请求等场景"""
+        entry = self._entries.get(key)
+        if entry is not None and entry.stale_until > time.monotonic():
+            return entry
+        return None
+
+    async def get_or_render(self, key: str, tag: str, render: Renderer, db: AsyncSession) -> CacheEntry:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.fresh_until > now:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry
+            if entry.stale_until > now:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._refreshing:
+                    # 后台刷新必须使用独立会话：请求会话会随响应结束而关闭
+                    self._refreshing.add(key)
+                    task = asyncio.create_task(self._revalidate(key, tag, render))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                return entry
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        generation = self._generations.get(tag, 0)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            body = await render(db)
+            entry = self._store(key, tag, body, generation)
+            future.set_result(entry)
+            return entry
+        except BaseException as exc:
+            # 404 等异常不缓存，原样抛给等待中的并发请求
+            future.set_exception(exc)
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, tag: str) -> None:
+        self._generations[tag] = self._generations.get(tag, 0) + 1
+        for key in [k for k, e in self._entries.items() if e.tag == tag]:
+            self._bytes -= self._entries.pop(key).size
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+        }
+
+
+response_cache = ResponseCache(
+    ttl=settings.RESPONSE_CACHE_TTL,
+    stale_ttl=settings.RESPONSE_CACHE_STALE_TTL,
+    max_bytes=settings.RESPONSE_CACHE_MAX_MB * 1024 * 1024,
+)
@@ -0,0 +1,72 @@
+# BackEnd/src/utils/http_cache.py
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+# 接口数据可能随时变化：允许浏览器保存，但每次使用前必须用 ETag 复验
+REVALIDATE_CACHE = "no-cache"
+PRIVATE_REVALIDATE_CACHE = "private, no-cache"
+
+
+def http_date(value: datetime) -> str:
+    """datetime -> RFC 7231 日期 (秒级精度，naive 时间按 UTC 处理)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime], cache_control: str) -> Dict[str, str]:
+    headers = {"etag": etag, "cache-control": cache_control}
+    if last_modified is not None:
+        headers["last-modified"] = http_date(last_modified)
+    return headers
+
+
+def is_not_modified(request_headers: Headers, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    条件请求判断 (RFC 7232)
+    1. 带 If-None-Match 时只比较 ETag (弱比较，忽略 W/ 前缀)，忽略 If-Modified-Since；
+    2. 否则用 If-Modified-Since 与秒级 Last-Modified 比较。
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        target = etag.removeprefix("W/")
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or target in tags
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime], cache_control: str) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified, cache_control))
+
+
+def conditional_json_response(
+        request_headers: Headers,
+        body: bytes,
+        etag: str,
+        last_modified: Optional[datetime] = None,
+        cache_control: str = REVALIDATE_CACHE
+) -> Response:
+    """已序列化的 JSON 字节：客户端版本一致时返回 304，否则返回完整响应"""
+    if is_not_modified(request_headers, etag, last_modified):
+        return not_modified_response(etag, last_modified, cache_control)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers=validator_headers(etag, last_modified, cache_control),
+    )
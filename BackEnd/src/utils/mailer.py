@@ -1,54 +1,153 @@
-# backend/src/services/category_service.py
-from typing import Dict, List, Optional
-
-class CategoryService:
-    """
-    分类映射服务
-    解耦前端展示层 Slug 与后端存储层 Label。
-    """
-
-    # 前端 Slug 到后端数据库 Label 的映射
-    # 前端需要 SEO 友好的长路径，后端数据库倾向于简洁的枚举值
-    _MAP: Dict[str, str] = {
-        "office-public": "office",
-        "residential": "residential",
-        "commercial": "commercial",
-        "old-building-renovation": "renovation", # 对应 database 中的标签
-        "hotel-vacation": "hospitality",
-        "exhibition-hall": "cultural",
-    }
-
-    # 中文名称映射，用于 UI 渲染
-    _DISPLAY_NAMES: Dict[str, str] = {
-        "office-public": "办公公共",
-        "residential": "住宅人居",
-        "commercial": "商业零售",
-        "old-building-renovation": "旧建筑改造",
-        "hotel-vacation": "酒店度假",
-        "exhibition-hall": "展会展厅",
-    }
-
-    @classmethod
-    def frontend_to_backend(cls, frontend_slug: str) -> Optional[str]:
-        """将前端路径参数转换为数据库查询参数"""
-        return cls._MAP.get(frontend_slug)
-
-    @classmethod
-    def get_all_categories(cls) -> List[Dict[str, str]]:
-        """
-        获取全部分类元数据
-        适配前端：CasesPage.tsx 的 FilterBar
-        """
-        return [
-            {
-                "slug": slug,
-                "label": cls._DISPLAY_NAMES.get(slug, slug),
-                "backend_value": backend
-            }
-            for slug, backend in cls._MAP.items()
-        ]
+# BackEnd/src/utils/mailer.py
+"""
+SMTP 发送 (连接复用)
+
+务实逻辑：
+1. 连接池保留至多 size 条已登录的 SMTP 连接，连续发送时省去 TCP/TLS 握手与 AUTH (每封邮件只需 MAIL/RCPT/DATA)；
+2. 空闲超过 idle_timeout 的连接在下次使用前关闭重建；复用的连接被服务器断开时自动重连并重试一次；
+3. 发送失败按 SMTP 响应码区分：5xx (地址无效、内容被拒) 为永久失败，其余 (4xx、网络错误、认证失败) 可重试。
+直接使用 aiosmtplib (fastapi-mail 的底层依赖)：fastapi-mail 每封邮件新建一条连接，无法复用。
+"""
+import asyncio
+import time
+from email.message import EmailMessage
+from email.utils import formataddr, make_msgid
+from typing import Dict, List, Optional, Tuple
+
+import aiosmtplib
+
+
+def build_message(sender: str, sender_name: str, recipient: str, subject: str, body: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = formataddr((sender_name, sender))
+    message["To"] = recipient
+    message["Subject"] = subject
+    message["Message-ID"] = make_msgid(domain=sender.rpartition("@")[2] or None)
+    message.set_content(body)
+    return message
+
+
+def is_permanent_failure(error: BaseException) -> bool:
+    """5xx 响应视为永久失败 (重试也不会成功)；认证失败属于配置问题，修复后可重试"""
+    if isinstance(error, aiosmtplib.SMTPAuthenticationError):
+        return False
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return all(e.code >= 500 for e in error.recipients)
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        return error.code >= 500
+    return False
+
+
+class SMTPPool:
+    def __init__(
+            self,
+            hostname: str,
+            port: int,
+            username: str = "",
+            password: str = "",
+            use_tls: bool = False,
+            start_tls: bool = False,
+            size: int = 2,
+            idle_timeout: float = 60,
+            timeout: float = 30,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.start_tls = start_tls
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle: List[Tuple[aiosmtplib.SMTP, float]] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.connects = 0
+        self.reuses = 0
+        self.sent = 0
+        self.errors = 0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        conn = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await conn.connect()
+        if self.username:
+            try:
+                await conn.login(self.username, self.password)
+            except BaseException:
+                conn.close()
+                raise
+        self.connects += 1
+        return conn
 
     @staticmethod
-    def get_chinese_name(slug: str) -> str:
-        """获取前端 Slug 对应的中文名"""
-        return CategoryService._DISPLAY_NAMES.get(slug, slug)
+    async def _close(conn: aiosmtplib.SMTP) -> None:
+        try:
+            if conn.is_connected:
+                await conn.quit()
+        except Exception:
+            conn.close()
+
+    async def _acquire(self) -> Tuple[aiosmtplib.SMTP, bool]:
+        """返回 (连接, 是否为复用的连接)；优先取最近使用的连接"""
+        while self._idle:
+            conn, last_used = self._idle.pop()
+            if conn.is_connected and time.monotonic() - last_used < self.idle_timeout:
+                self.reuses += 1
+                return conn, True
+            await self._close(conn)
+        return await self._connect(), False
+
+    async def send(self, message: EmailMessage) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.size)
+        async with self._semaphore:
+            conn = None
+            try:
+                conn, reused = await self._acquire()
+                try:
+                    await conn.send_message(message)
+                except aiosmtplib.SMTPServerDisconnected:
+                    if not reused:
+                        raise
+                    # 复用的连接已被服务器关闭：重建后重试一次
+                    conn.close()
+                    conn = None
+                    conn = await self._connect()
+                    await conn.send_message(message)
+            except (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused):
+                # 服务器拒收本封邮件，连接本身仍可用：复位会话后放回池中
+                self.errors += 1
+                if conn is not None:
+                    try:
+                        await conn.rset()
+                        self._idle.append((conn, time.monotonic()))
+                    except Exception:
+                        conn.close()
+                raise
+            except BaseException:
+                self.errors += 1
+                if conn is not None:
+                    conn.close()
+                raise
+            self.sent += 1
+            self._idle.append((conn, time.monotonic()))
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            await self._close(conn)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "idle_connections": len(self._idle),
+            "connects": self.connects,
+            "reuses": self.reuses,
+            "sent": self.sent,
+            "errors": self.errors,
+        }
@@ -0,0 +1,219 @@
+# BackEnd/src/utils/static_files.py
+import mimetypes
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, Tuple
+
+import anyio
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+# 上传接口生成的文件名 (uuid / 内容哈希) 永不改写内容，可以长期缓存
+_IMMUTABLE_NAME = re.compile(r"^[0-9a-f]{32}(_thumb)?\.[a-z0-9]+$")
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# 仅对可压缩的文本类资源查找预压缩副本 (图片/视频本身已压缩)
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+_PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+CHUNK_SIZE = 64 * 1024
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+DEFAULT_CACHE = "public, max-age=86400"
+
+
+class UploadFileResponse(Response):
+    """
+    上传文件响应
+    务实逻辑：
+    1. 强 ETag + Last-Modified，命中 If-None-Match / If-Modified-Since 返回 304；
+    2. 支持单段 Range (项目视频拖动进度条)，不满足时返回 416；
+    3. 有 .br/.gz 预压缩副本且客户端支持时直接返回副本；
+    4. ASGI 服务器支持 pathsend / zerocopysend 扩展时交给服务器用 sendfile 发送。
+    """
+
+    def __init__(
+            self,
+            path: str,
+            stat_result: os.stat_result,
+            request_headers: Headers,
+            media_type: Optional[str] = None,
+            method: str = "GET",
+    ):
+        self.path = path
+        self.send_header_only = method.upper() == "HEAD"
+        self.media_type = media_type or mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.background = None
+        self.body = b""
+
+        # 预压缩副本 (与 Range 互斥，避免按压缩后偏移切片)
+        encoding = self._pick_precompressed(request_headers)
+        name = os.path.basename(path)
+        self.etag = self._make_etag(name, stat_result, encoding[0] if encoding else None)
+        self.last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+        size = stat_result.st_size
+
+        headers = {
+            "etag": self.etag,
+            "last-modified": self.last_modified,
+            "cache-control": IMMUTABLE_CACHE if self._is_immutable(path) else DEFAULT_CACHE,
+            "accept-ranges": "bytes",
+        }
+        if self.media_type.startswith(_COMPRESSIBLE_TYPES):
+            headers["vary"] = "Accept-Encoding"
+
+        # 1. 条件请求
+        if self._is_not_modified(request_headers, stat_result.st_mtime):
+            self.status_code = 304
+            self.offset, self.length = 0, 0
+            self.init_headers(headers)
+            return
+
+        if encoding is not None:
+            # 2. 直接发送预压缩副本
+            encoding_name, compressed_path, compressed_size = encoding
+            self.path = compressed_path
+            headers["content-encoding"] = encoding_name
+            self.status_code, self.offset, self.length = 200, 0, compressed_size
+        else:
+            # 3. Range 请求
+            byte_range = self._parse_range(request_headers, size)
+            if byte_range == "unsatisfiable":
+                self.status_code, self.offset, self.length = 416, 0, 0
+                headers["content-range"] = f"bytes */{size}"
+            elif byte_range is not None:
+                start, end = byte_range
+                self.status_code, self.offset, self.length = 206, start, end - start + 1
+                headers["content-range"] = f"bytes {start}-{end}/{size}"
+            else:
+                self.status_code, self.offset, self.length = 200, 0, size
+
+        headers["content-length"] = str(self.length)
+        self.init_headers(headers)
+
+    # --- 缓存策略 ---
+    @staticmethod
+    def _is_immutable(path: str) -> bool:
+        normalized = path.replace(os.sep, "/")
+        return bool(_IMMUTABLE_NAME.match(os.path.basename(path))) or "/variants/" in normalized
+
+    @staticmethod
+    def _make_etag(name: str, stat_result: os.stat_result, encoding: Optional[str] = None) -> str:
+        stem = name.split(".", 1)[0]
+        if re.fullmatch(r"[0-9a-f]{32}(_thumb)?", stem):
+            # 内容寻址文件名本身就是内容指纹
+            tag = name
+        else:
+            tag = f"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"
+        # 不同编码的表示必须使用不同的强 ETag
+        return f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+    def _is_not_modified(self, request_headers: Headers, mtime: float) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or self.etag in tags
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    # --- 预压缩 ---
+    def _pick_precompressed(self, request_headers: Headers) -> Optional[Tuple[str, str, int]]:
+        if not self.media_type.startswith(_COMPRESSIBLE_TYPES):
+            return None
+        accepted = request_headers.get("accept-encoding", "")
+        for encoding, suffix in _PRECOMPRESSED:
+            if encoding in accepted:
+                try:
+                    compressed = os.stat(self.path + suffix)
+                except OSError:
+                    continue
+                return encoding, self.path + suffix, compressed.st_size
+        return None
+
+    # --- Range 解析 (仅支持单段，多段时按 RFC 允许的方式退回完整响应) ---
+    def _parse_range(self, request_headers: Headers, size: int):
+        range_header = request_headers.get("range")
+        if not range_header or "," in range_header:
+            return None
+        if_range = request_headers.get("if-range")
+        if if_range and if_range not in (self.etag, self.last_modified):
+            return None
+
+        match = _RANGE_PATTERN.match(range_header.strip())
+        if not match:
+            return None
+        first, last = match.groups()
+        if first == "" and last == "":
+            return None
+        if first == "":
+            # bytes=-500：最后 500 字节
+            suffix = int(last)
+            if suffix == 0:
+                return "unsatisfiable"
+            return max(size - suffix, 0), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or start > end:
+            return "unsatisfiable"
+        return start, end
+
+    # --- 发送 ---
+    async def __call__(self, scope, receive, send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        if self.send_header_only or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        extensions = scope.get("extensions") or {}
+        if "http.response.pathsend" in extensions and self.offset == 0 and self.status_code == 200:
+            await send({"type": "http.response.pathsend", "path": self.path})
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            if "http.response.zerocopysend" in extensions:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file.wrapped.fileno(),
+                    "offset": self.offset,
+                    "count": self.length,
+                    "more_body": False,
+                })
+                return
+
+            await file.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await file.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0,
+                })
+            if remaining > 0:
+                # 文件在发送过程中被截断：结束响应，避免连接挂起
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class UploadFiles(StaticFiles):
+    """/uploads 挂载：沿用 StaticFiles 的路径查找与安全检查，替换响应实现"""
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        return UploadFileResponse(
+            str(full_path),
+            stat_result,
+            Headers(scope=scope),
+            method=scope.get("method", "GET"),
+        )
@@ -0,0 +1,52 @@
+# BackEnd/src/utils/upload_stream.py
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Tuple
+
+from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+
+# 每次读取 1MB：内存占用与文件大小无关
+CHUNK_SIZE = 1024 * 1024
+
+
+async def spool_upload_to_disk(
+        upload: UploadFile,
+        directory: Path,
+        max_bytes: int,
+        chunk_size: int = CHUNK_SIZE
+) -> Tuple[Path, int, str]:
+    """
+    将上传文件分块落盘到临时文件，返回 (路径, 字节数, SHA-256)。
+    务实：边写边算内容哈希，供去重使用；超过 max_bytes 立即中止并删除临时文件；
+    调用方负责处理完成后删除文件。
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix="upload-", suffix=".part", dir=directory)
+    tmp_path = Path(tmp_name)
+    size = 0
+    hasher = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as out:
+
+            def write_chunk(data: bytes) -> None:
+                out.write(data)
+                hasher.update(data)
+
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"文件过大，最大允许 {max_bytes // (1024 * 1024)}MB / Payload too large",
+                    )
+                await run_in_threadpool(write_chunk, chunk)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path, size, hasher.hexdigest()